@@ -0,0 +1,6 @@
+"""
+Ravanan Benchmarks
+Performance suite for parsing, rendering, search and fetching
+
+Run with `python -m benchmarks --help`.
+"""
@@ -0,0 +1,86 @@
+"""
+Benchmark command line
+
+Usage:
+    python -m benchmarks run [--output results.json] [--repeat N] [--only parse]
+    python -m benchmarks compare baseline.json results.json [--threshold 10]
+    python -m benchmarks corpus
+
+Created by: Krishna D
+"""
+import argparse
+import json
+import os
+import sys
+
+from .generators import GENERATORS
+from .suite import CORPUS_DIR, compare_results, run_suite, save_results
+
+
+def cmd_run(args):
+    """Run the suite and optionally store results"""
+    results = run_suite(repeat=args.repeat, only=args.only, include_fetch=not args.no_fetch)
+    if args.output:
+        save_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+def cmd_compare(args):
+    """Compare two result files, exiting non-zero on regressions"""
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+
+    rows, regressions = compare_results(baseline, current, args.threshold)
+    print(f"{'case':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, before, after, change in rows:
+        flag = '  ❌' if change > args.threshold else ''
+        print(f"{name:<40} {before:>8.2f}ms {after:>8.2f}ms {change:>+7.1f}%{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0f}%")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0f}%")
+    return 0
+
+
+def cmd_corpus(args):
+    """Regenerate the checked-in corpus from the generators"""
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for name, generator in GENERATORS.items():
+        path = os.path.join(CORPUS_DIR, f"{name}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generator())
+        print(f"Wrote {path}")
+    return 0
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Ravanan benchmark suite")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run benchmarks')
+    run.add_argument('--output', '-o', help='Write results to this JSON file')
+    run.add_argument('--repeat', type=int, default=5, help='Timed runs per case (default: 5)')
+    run.add_argument('--only', help='Only run cases whose name contains this string')
+    run.add_argument('--no-fetch', action='store_true', help='Skip fetch cases')
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser('compare', help='Compare two result files')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=10.0, help='Allowed slowdown in percent (default: 10)')
+    compare.set_defaults(func=cmd_compare)
+
+    corpus = sub.add_parser('corpus', help='Regenerate the checked-in corpus')
+    corpus.set_defaults(func=cmd_corpus)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
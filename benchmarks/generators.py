@@ -0,0 +1,149 @@
+"""
+Synthetic HTML Generators
+Builds benchmark documents whose size scales with a single parameter
+
+Every generator is deterministic for a given size and seed so results are
+comparable between runs and machines. The checked-in corpus under
+benchmarks/corpus was produced with `python -m benchmarks corpus`.
+
+Created by: Krishna D
+"""
+import random
+from typing import Callable, Dict
+
+WORDS = (
+    "ravana lanka scholar king veena music ayurveda astrology kingdom ocean "
+    "bridge island palace garden city wisdom knowledge terminal browser text "
+    "parser render link table heading paragraph list quote code python data "
+    "network socket request response header footer sidebar article content"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    """Build a pseudo-random sentence"""
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + '.'
+
+
+def _page(title: str, body: str) -> str:
+    """Wrap body markup in a full document"""
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n"
+        f"<title>{title}</title>\n"
+        "<style>body { font-family: serif; }</style>\n"
+        "<script>var analytics = {track: function() {}};</script>\n"
+        "</head>\n<body>\n"
+        f"{body}\n"
+        "</body>\n</html>\n"
+    )
+
+
+def long_article(size: int = 150, seed: int = 1) -> str:
+    """
+    Long article with headings, paragraphs, quotes, lists and code
+
+    Args:
+        size: Number of sections
+        seed: Random seed
+
+    Returns:
+        HTML document
+    """
+    rng = random.Random(seed)
+    parts = ["<header><nav><a href='/'>Home</a> <a href='/docs'>Docs</a></nav></header>",
+             "<article>", "<h1>The Long Article</h1>"]
+    for section in range(size):
+        parts.append(f"<h2>Section {section + 1}</h2>")
+        for _ in range(3):
+            parts.append(f"<p>{_sentence(rng, 40)} <a href='/ref/{rng.randint(1, 500)}'>{rng.choice(WORDS)}</a> {_sentence(rng, 20)}</p>")
+        if section % 5 == 0:
+            parts.append(f"<blockquote>{_sentence(rng, 25)}</blockquote>")
+        if section % 4 == 0:
+            items = ''.join(f"<li>{_sentence(rng, 6)}</li>" for _ in range(5))
+            parts.append(f"<ul>{items}</ul>")
+        if section % 7 == 0:
+            code = '\n'.join(f"    value_{i} = compute({i})" for i in range(8))
+            parts.append(f"<pre>def section_{section}():\n{code}\n</pre>")
+    parts.append("</article>")
+    parts.append("<footer><p>Copyright Ravanan</p></footer>")
+    return _page("The Long Article", '\n'.join(parts))
+
+
+def link_index(size: int = 2000, seed: int = 2) -> str:
+    """
+    Index page made almost entirely of links
+
+    Args:
+        size: Number of links
+        seed: Random seed
+
+    Returns:
+        HTML document
+    """
+    rng = random.Random(seed)
+    parts = ["<h1>Index</h1>"]
+    for group in range(0, size, 50):
+        parts.append(f"<h3>Group {group // 50 + 1}</h3><ul>")
+        for i in range(group, min(group + 50, size)):
+            target = rng.choice(["/page/", "https://example.org/doc/", "../up/", "#frag", "javascript:void"])
+            parts.append(f"<li><a href='{target}{i}'>{rng.choice(WORDS)} {i}</a></li>")
+        parts.append("</ul>")
+    return _page("Link Index", '\n'.join(parts))
+
+
+def nested_tables(size: int = 20, seed: int = 3) -> str:
+    """
+    Tables nested inside tables and divs
+
+    Args:
+        size: Nesting depth; each level also adds a handful of rows
+        seed: Random seed
+
+    Returns:
+        HTML document
+    """
+    rng = random.Random(seed)
+    inner = f"<p>{_sentence(rng)}</p>"
+    for level in range(size):
+        rows = ''.join(
+            f"<tr><th>{level}.{r}</th><td>{_sentence(rng, 5)}</td><td><a href='/cell/{level}/{r}'>cell</a></td></tr>"
+            for r in range(4)
+        )
+        inner = f"<div><table>{rows}<tr><td colspan='3'>{inner}</td></tr></table></div>"
+    return _page("Nested Tables", f"<h1>Nested Tables</h1>\n{inner}")
+
+
+def malformed(size: int = 1500, seed: int = 4) -> str:
+    """
+    Tag soup: unclosed tags, stray closers, bad attributes and entities
+
+    Args:
+        size: Number of fragments
+        seed: Random seed
+
+    Returns:
+        HTML document (deliberately invalid)
+    """
+    rng = random.Random(seed)
+    fragments = [
+        lambda: f"<p>{_sentence(rng)}",
+        lambda: f"<div><span>{_sentence(rng, 6)}</div></span>",
+        lambda: f"<a href=/x?{rng.randint(1, 99)}&y=1>{rng.choice(WORDS)}",
+        lambda: f"</li><li>{_sentence(rng, 4)}",
+        lambda: f"<b><i>{_sentence(rng, 5)}</b></i>",
+        lambda: "&nbsp;&amp &lt;tag&gt; &#x263A; &bogus;",
+        lambda: f"<table><tr><td>{rng.choice(WORDS)}<td>{rng.choice(WORDS)}</table>",
+        lambda: "<!-- unterminated comment -- > text",
+        lambda: f"<h2 class='x' class=\"y\">{_sentence(rng, 3)}",
+        lambda: "<br/><br><hr",
+    ]
+    body = ''.join(rng.choice(fragments)() for _ in range(size))
+    return "<html><head><title>Malformed</title><body>" + body
+
+
+GENERATORS: Dict[str, Callable[..., str]] = {
+    'long_article': long_article,
+    'link_index': link_index,
+    'nested_tables': nested_tables,
+    'malformed': malformed,
+}
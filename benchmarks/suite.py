@@ -0,0 +1,196 @@
+"""
+Benchmark Suite
+Times parsing, rendering, search and fetching over the corpus
+
+Each case is run `repeat` times after a warm-up and summarised by its
+median, which is what `compare` uses to flag regressions.
+
+Created by: Krishna D
+"""
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from .generators import GENERATORS
+from .server import LocalServer
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+# Synthetic documents are generated at these multiples of the default size
+SCALES = (1, 3)
+
+
+def load_corpus() -> Dict[str, str]:
+    """
+    Load the checked-in corpus
+
+    Returns:
+        Mapping of document name (file stem) to HTML
+    """
+    corpus = {}
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(CORPUS_DIR, name), encoding='utf-8') as f:
+                corpus[name[:-5]] = f.read()
+    return corpus
+
+
+def synthetic_documents() -> Dict[str, str]:
+    """
+    Generate scaled synthetic documents
+
+    Returns:
+        Mapping of 'name@xN' to HTML
+    """
+    documents = {}
+    for name, generator in GENERATORS.items():
+        default_size = generator.__defaults__[0]
+        for scale in SCALES:
+            documents[f"{name}@x{scale}"] = generator(default_size * scale)
+    return documents
+
+
+def time_case(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Time a callable
+
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of timed runs (after one warm-up)
+
+    Returns:
+        Summary statistics in milliseconds
+    """
+    func()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'mean_ms': statistics.fmean(samples),
+        'stdev_ms': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'runs': repeat,
+    }
+
+
+def _null_renderer():
+    """TextRenderer writing escape sequences into a discarded buffer"""
+    from rich.console import Console
+    from ravanan.browser.renderer import TextRenderer
+
+    console = Console(file=io.StringIO(), width=100, force_terminal=True, color_system='truecolor')
+    return TextRenderer(console=console)
+
+
+def run_suite(repeat: int = 5, only: str = None, include_fetch: bool = True, verbose: bool = True) -> Dict:
+    """
+    Run all benchmark cases
+
+    Args:
+        repeat: Timed runs per case
+        only: Substring filter on case names
+        include_fetch: Whether to run fetch cases against the local server
+        verbose: Print each result as it completes
+
+    Returns:
+        Result document suitable for JSON serialisation
+    """
+    from ravanan import __version__
+    from ravanan.browser.fetcher import WebFetcher
+    from ravanan.browser.parser import HTMLParser
+    from ravanan.main import Ravanan
+
+    documents = load_corpus()
+    documents.update(synthetic_documents())
+
+    cases: Dict[str, Callable[[], object]] = {}
+    base_url = 'http://bench.local/'
+
+    for name, html in documents.items():
+        parser = HTMLParser()
+        cases[f"parse/{name}"] = lambda p=parser, h=html: p.parse(h, base_url)
+
+        links, content = HTMLParser().parse(html, base_url)
+        renderer = _null_renderer()
+        cases[f"render_content/{name}"] = lambda r=renderer, c=content: r._render_content(c)
+
+        browser = Ravanan()
+        browser.renderer = _null_renderer()
+        browser.current_content = content
+        cases[f"search/{name}"] = lambda b=browser: b.search('wisdom')
+
+    server = None
+    if include_fetch:
+        server = LocalServer({f"/{name}.html": html for name, html in documents.items()}).start()
+        fetcher = WebFetcher()
+        for name in documents:
+            url = server.url(f"/{name}.html")
+            cases[f"fetch/{name}"] = lambda f=fetcher, u=url: f.fetch(u)
+
+    results = {}
+    try:
+        for name, func in cases.items():
+            if only and only not in name:
+                continue
+            results[name] = time_case(func, repeat)
+            if verbose:
+                stats = results[name]
+                print(f"{name:<40} {stats['median_ms']:>10.2f} ms  (min {stats['min_ms']:.2f}, sd {stats['stdev_ms']:.2f})")
+    finally:
+        if server:
+            server.stop()
+
+    return {
+        'meta': {
+            'ravanan_version': __version__,
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def save_results(results: Dict, path: str):
+    """Write results as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 10.0):
+    """
+    Compare two result documents
+
+    Args:
+        baseline: Earlier result document
+        current: New result document
+        threshold: Allowed slowdown in percent before a case is flagged
+
+    Returns:
+        Tuple of (rows, regressions) where rows are
+        (name, baseline_ms, current_ms, change_percent) tuples
+    """
+    rows = []
+    regressions = []
+    for name, stats in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if not base:
+            continue
+        before = base['median_ms']
+        after = stats['median_ms']
+        change = ((after - before) / before * 100) if before else 0.0
+        rows.append((name, before, after, change))
+        if change > threshold:
+            regressions.append((name, before, after, change))
+    return rows, regressions
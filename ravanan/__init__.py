@@ -11,5 +11,6 @@ __author__ = 'Krishna D'
 __email__ = 'your.email@example.com'
 
 from .main import main
+from .api import Browser, Page
 
-__all__ = ['main']
+__all__ = ['main', 'Browser', 'Page']
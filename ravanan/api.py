@@ -0,0 +1,285 @@
+"""
+Library API
+Headless access to Ravanan's fetch and extraction pipeline
+
+Example:
+    from ravanan import Browser
+    
+    with Browser() as browser:
+        page = browser.get("https://example.com")
+        print(page.title)
+        for link in page.links:
+            print(link['index'], link['url'])
+        
+        for page in browser.stream(["https://a.example", "https://b.example"]):
+            print(page.url, page.ok, page.timing['total'])
+
+Nothing here prints or touches the terminal.
+
+Created by: Krishna D
+"""
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .browser.fetcher import WebFetcher
+from .browser.parser import HTMLParser, ParseLimits, partial_reason, reader_view
+from .utils.cache import LRUCache
+from .utils.urls import canonical_url
+
+
+def parse_document(content: str, url: str, limits: ParseLimits = None) -> Tuple[str, List[Dict], List[Tuple]]:
+    """
+    Parse an HTML document (module-level so parse worker processes can run it)
+    
+    Args:
+        content: HTML text
+        url: Base URL for links
+        limits: Parser resource limits
+    
+    Returns:
+        Tuple of (title, links, blocks)
+    """
+    parser = HTMLParser(limits)
+    links, blocks = parser.parse(content, url)
+    return parser.get_page_title(), links, blocks
+
+
+class Page:
+    """A fetched and parsed page"""
+    
+    __slots__ = ('url', 'final_url', 'status_code', 'title', 'blocks', 'links', 'timing', 'error')
+    
+    def __init__(self, url: str, final_url: str = None, status_code: int = 0, title: str = "",
+                 blocks: List[Tuple] = None, links: List[Dict] = None,
+                 timing: Dict[str, float] = None, error: Optional[str] = None):
+        """
+        Args:
+            url: Requested URL
+            final_url: URL after redirects
+            status_code: HTTP status code (0 if the request failed)
+            title: Page title
+            blocks: Parsed content as (type, text, level) tuples
+            links: Links as dicts with 'index', 'url' and 'text'
+            timing: Seconds spent per stage ('fetch', 'parse', 'total')
+            error: Error message if the page could not be loaded
+        """
+        self.url = url
+        self.final_url = final_url or url
+        self.status_code = status_code
+        self.title = title
+        self.blocks = blocks or []
+        self.links = links or []
+        self.timing = timing or {}
+        self.error = error
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the page loaded successfully"""
+        return self.error is None
+    
+    @property
+    def partial(self) -> Optional[str]:
+        """Why parsing stopped early (a ParseLimits limit), or None if the page is complete"""
+        return partial_reason(self.blocks)
+    
+    @property
+    def reader(self) -> Optional[List[Tuple]]:
+        """Blocks of the page's main content (reader mode), or None if none was found"""
+        return reader_view(self.blocks)
+    
+    @property
+    def text(self) -> str:
+        """Plain text of the page, one block per line"""
+        return '\n'.join(text for item_type, text, level in self.blocks if text)
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable representation"""
+        return {
+            'url': self.url,
+            'final_url': self.final_url,
+            'status_code': self.status_code,
+            'title': self.title,
+            'blocks': [list(block) for block in self.blocks],
+            'links': self.links,
+            'timing': self.timing,
+            'error': self.error,
+            'partial': self.partial,
+        }
+    
+    def __repr__(self) -> str:
+        state = f"error={self.error!r}" if self.error else f"title={self.title!r}"
+        return f"<Page {self.final_url} {state}>"
+
+
+class Browser:
+    """
+    Headless browser for use from Python
+    
+    One HTTP session (and its connection pool) and one page cache are shared
+    by every call, including concurrent calls from map() and stream() or
+    from the caller's own threads.
+    
+    Parsing holds the GIL, so concurrent calls only overlap their fetches.
+    With parse_workers set, documents are parsed in that many worker
+    processes instead and parsing scales across cores too.
+    """
+    
+    def __init__(self, timeout: int = 10, user_agent: str = None, max_workers: int = 8,
+                 cache_size: int = 256, cache_ttl: Optional[float] = 300, parse_limits: ParseLimits = None,
+                 parse_workers: int = 0):
+        """
+        Args:
+            timeout: Per-request timeout in seconds
+            user_agent: User-Agent header (defaults to Ravanan's)
+            max_workers: Default concurrency for map() and stream()
+            cache_size: Parsed pages kept in memory (0 disables the cache)
+            cache_ttl: Seconds a cached page stays fresh (None = no expiry)
+            parse_limits: Parser resource limits (default: parser.DEFAULT_LIMITS)
+            parse_workers: Worker processes for parsing (0 parses in the calling thread)
+        """
+        self.max_workers = max_workers
+        self.parse_limits = parse_limits
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        self._pool_lock = threading.Lock()
+        self.fetcher = WebFetcher(timeout=timeout, user_agent=user_agent, pool_size=max(10, max_workers))
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size else None
+    
+    def get(self, url: str, use_cache: bool = True) -> Page:
+        """
+        Fetch and parse a page
+        
+        Args:
+            url: URL to load (https:// is assumed when no scheme is given)
+            use_cache: Serve a fresh cached copy if one exists
+        
+        Returns:
+            Page (check page.ok / page.error)
+        """
+        url = self.fetcher.normalize_url(url)
+        key = canonical_url(url)
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        started = time.perf_counter()
+        success, content, final_url, status_code = self.fetcher.fetch(url)
+        fetched = time.perf_counter()
+        if not success:
+            return Page(url, final_url, status_code, error=content,
+                        timing={'fetch': fetched - started, 'parse': 0.0, 'total': fetched - started})
+        
+        # Pages parsed under custom limits are kept out of the shared cache
+        shared = self.fetcher.shared_cache if self.parse_limits is None else None
+        parsed = shared.get_page(final_url, content) if shared else None
+        if parsed:
+            title, links, blocks = parsed
+        else:
+            try:
+                if self.parse_workers:
+                    title, links, blocks = self._get_parse_pool().submit(
+                        parse_document, content, final_url, self.parse_limits).result()
+                else:
+                    title, links, blocks = parse_document(content, final_url, self.parse_limits)
+            except Exception as e:
+                return Page(url, final_url, status_code, error=f"Failed to parse page: {str(e)}")
+            if shared:
+                shared.put_page(final_url, content, title, links, blocks)
+        finished = time.perf_counter()
+        
+        page = Page(
+            url,
+            final_url,
+            status_code,
+            title,
+            blocks,
+            links,
+            {'fetch': fetched - started, 'parse': finished - fetched, 'total': finished - started}
+        )
+        if self.cache is not None:
+            self.cache.put(key, page)
+        return page
+    
+    def map(self, urls: Iterable[str], max_workers: int = None) -> List[Page]:
+        """
+        Load many pages concurrently
+        
+        Args:
+            urls: URLs to load
+            max_workers: Concurrency (defaults to the browser's max_workers)
+        
+        Returns:
+            Pages in the same order as urls
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        urls = list(urls)
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as pool:
+            return list(pool.map(self.get, urls))
+    
+    def stream(self, urls: Iterable[str], max_workers: int = None) -> Iterator[Page]:
+        """
+        Load many pages concurrently, yielding each as soon as it is ready
+        
+        At most a few times max_workers URLs are pulled from urls ahead of
+        the consumer, so urls may be a long or lazy iterable.
+        
+        Args:
+            urls: URLs to load
+            max_workers: Concurrency (defaults to the browser's max_workers)
+        
+        Yields:
+            Pages in completion order
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        workers = max_workers or self.max_workers
+        url_iter = iter(urls)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < workers * 2:
+                    try:
+                        pending.add(pool.submit(self.get, next(url_iter)))
+                    except StopIteration:
+                        exhausted = True
+                if not pending:
+                    return
+                done = next(as_completed(pending))
+                pending.discard(done)
+                yield done.result()
+    
+    def _get_parse_pool(self):
+        """Start the parse worker processes on first use"""
+        with self._pool_lock:
+            if self._parse_pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                
+                # Forking a process that already runs threads can copy held
+                # locks into the child, so workers start fresh
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._parse_pool
+    
+    def close(self):
+        """Close pooled connections, stop parse workers and drop cached pages"""
+        self.fetcher.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
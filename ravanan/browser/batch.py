@@ -0,0 +1,219 @@
+"""
+Batch Mode Module
+Runs browser commands without a terminal (`ravanan -c "go URL; 3; save"`,
+`ravanan --script FILE`)
+
+Pages are not drawn unless asked for, and then only as plain text or
+JSON that doesn't follow the interactive layout. The screen is never
+cleared and nothing waits for a key. Errors go to stderr and set the
+exit status. Several scripts can run side by side in separate processes.
+
+Created by: Krishna D
+"""
+import io
+import json
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .renderer import TextRenderer
+from ..utils.export import page_to_dict
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # A command or download failed
+EXIT_USAGE = 2  # Bad arguments or an unreadable script
+
+
+def split_commands(text: str) -> List[str]:
+    """
+    Commands from -c text or a script: split on ';' and newlines
+    
+    Blank entries and lines starting with '#' are skipped.
+    """
+    commands = []
+    for line in text.splitlines():
+        if line.lstrip().startswith('#'):
+            continue
+        commands.extend(part.strip() for part in line.split(';') if part.strip())
+    return commands
+
+
+def read_script(path: str) -> List[str]:
+    """
+    Commands in a script file ('-' reads stdin)
+    
+    Raises:
+        OSError: If the file can't be read
+    """
+    if path == '-':
+        return split_commands(sys.stdin.read())
+    with open(path, encoding='utf-8') as f:
+        return split_commands(f.read())
+
+
+class BatchRenderer(TextRenderer):
+    """
+    Renderer for scripts: pages only on request, errors counted and sent to stderr
+    
+    Everything else (search results, source, diffs) is drawn as usual.
+    """
+    
+    def __init__(self, page_format: Optional[str] = None):
+        """
+        Args:
+            page_format: None to draw no pages, 'text' for plain lines, 'json' for one object per line
+        """
+        super().__init__()
+        self.page_format = page_format
+        self.show_banner_on_first_page = False
+        self.errors = 0
+    
+    def render_page(self, title: str, content: List[Tuple], links: List[Dict], url: str):
+        """Write the page in the requested format, or nothing"""
+        if self.page_format is None:
+            self.page_bytes = 0
+            return
+        started = self.output.bytes_written
+        if self.page_format == 'json':
+            page = page_to_dict(title, url, content, links)
+            del page['saved']  # Same page, same output
+            self.output.write(json.dumps(page, ensure_ascii=False) + '\n')
+        else:
+            from .lowbw import AnsiWriter, page_lines
+            writer = AnsiWriter(self.output, color=False)
+            for line in page_lines(title, content, links, url)[:-1]:  # Without the key hints
+                writer.line(line)
+            writer.flush()
+        self.page_bytes = self.output.bytes_written - started
+    
+    def render_error(self, error_message: str):
+        """Count the failure and report it on stderr"""
+        self.errors += 1
+        print(f"Error: {error_message}", file=sys.stderr)
+    
+    def render_warning(self, message: str):
+        """A command that couldn't run fails the script like any other error"""
+        self.render_error(message)
+    
+    def render_loading(self, url: str):
+        """Nothing: scripts only see results"""
+
+
+def run_commands(commands: List[str], url: str = None, page_format: str = None, keep_going: bool = False,
+                 **options) -> int:
+    """
+    Run commands through a fresh browser
+    
+    A command fails when it reports an error. The run stops at the first
+    failure unless keep_going is set; 'q' ends it early. Downloads started
+    by the script are waited for and count as failures if they fail.
+    
+    Args:
+        commands: Commands, as typed at the prompt
+        url: Page to open before the first command
+        page_format: How to write pages (see BatchRenderer)
+        keep_going: Carry on after a failed command
+        options: Passed on to Ravanan (home_url, reader, tracer)
+    
+    Returns:
+        EXIT_OK or EXIT_FAILED
+    """
+    from ..main import Ravanan
+    
+    renderer = BatchRenderer(page_format)
+    browser = Ravanan(renderer=renderer, interactive=False, **options)
+    if url:
+        commands = [f"go {url}"] + list(commands)
+    status = EXIT_OK
+    for command in commands:
+        errors = renderer.errors
+        try:
+            browser.handle_command(command)
+        except SystemExit:
+            break  # q
+        except Exception as e:
+            renderer.render_error(f"Unexpected error in '{command}': {str(e)}")
+        if renderer.errors > errors:
+            status = EXIT_FAILED
+            if not keep_going:
+                print(f"Stopped at '{command}'", file=sys.stderr)
+                break
+    
+    if browser.downloader is not None:
+        while any(download.state in ('starting', 'running') for download in browser.downloader.downloads):
+            time.sleep(0.1)
+        if any(download.state == 'failed' for download in browser.downloader.downloads):
+            status = EXIT_FAILED
+        browser.report_downloads()
+    try:
+        browser.quit()
+    except SystemExit:
+        pass
+    return status
+
+
+def _run_script_captured(path: str, options: Dict) -> Tuple[int, str, str]:
+    """Run one script in a worker process, returning (status, stdout, stderr)"""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        status = run_script(path, **options)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        status = EXIT_FAILED
+    finally:
+        sys.stdout, sys.stderr = saved
+    return status, stdout.getvalue(), stderr.getvalue()
+
+
+def run_script(path: str, **options) -> int:
+    """Run one script file (see run_commands for options); EXIT_USAGE if it can't be read"""
+    try:
+        commands = read_script(path)
+    except OSError as e:
+        print(f"Error: cannot read script {path}: {e.strerror or e}", file=sys.stderr)
+        return EXIT_USAGE
+    return run_commands(commands, **options)
+
+
+def run_scripts(paths: List[str], jobs: int = 1, **options) -> int:
+    """
+    Run independent scripts, each with its own browser
+    
+    With jobs > 1 the scripts run in that many worker processes at once.
+    Each script's output is held back and printed whole, under a
+    '==> path <==' header, as soon as the script ends.
+    
+    Returns:
+        The highest exit status of any script
+    """
+    if len(paths) == 1:
+        return run_script(paths[0], **options)
+    
+    status = EXIT_OK
+    if jobs <= 1:
+        for path in paths:
+            print(f"==> {path} <==")
+            sys.stdout.flush()
+            status = max(status, run_script(path, **options))
+        return status
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    if '-' in paths:
+        print("Error: stdin ('-') can't be one of several parallel scripts", file=sys.stderr)
+        return EXIT_USAGE
+    # Workers start fresh rather than forking a process that may run threads
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {pool.submit(_run_script_captured, path, options): path for path in paths}
+        for future in as_completed(futures):
+            code, out, err = future.result()
+            print(f"==> {futures[future]} <==")
+            sys.stdout.write(out)
+            sys.stdout.flush()
+            sys.stderr.write(err)
+            sys.stderr.flush()
+            status = max(status, code)
+    return status
@@ -0,0 +1,568 @@
+"""
+Shared Cache Module
+`ravanan-cached`: one HTTP cache, parsed-page cache and connection pool
+shared by every Ravanan process on a machine
+
+The daemon listens on a Unix socket or a 127.0.0.1 port. WebFetcher finds
+it through RAVANAN_CACHED or the default socket path and falls back to
+direct fetches when it isn't running.
+
+Messages in both directions are one JSON header line followed by
+`length` bytes of body.
+
+Created by: Krishna D
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .fetcher import is_binary_response
+from ..utils.cache import LRUCache
+from ..utils.memory import format_bytes
+from ..utils.urls import canonical_url
+
+MAX_HEADER = 64 * 1024
+
+# Bump when HTMLParser output changes so stale parsed pages are never served
+PARSER_VERSION = 3
+
+Address = Union[str, Tuple[str, int]]
+
+# Response headers passed on to clients
+_REPLY_HEADERS = ('Content-Type', 'Content-Disposition', 'ETag', 'Last-Modified')
+
+
+def _drop_body(url: str, chunks, headers):
+    """WebFetcher.on_binary for the daemon: close a file response instead of reading it"""
+    for _ in chunks:
+        break  # Starting the generator lets close() release the response
+    chunks.close()
+
+
+def _cache_directives(cache_control: str) -> Dict[str, str]:
+    """Cache-Control directives as {lowercase name: value ('' if none)}"""
+    directives = {}
+    for part in cache_control.split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+    return directives
+
+
+def default_address() -> Optional[Address]:
+    """
+    Where the cache daemon listens
+    
+    RAVANAN_CACHED may hold a socket path, 'host:port', or 'off'. Platforms
+    without Unix sockets have no default and need RAVANAN_CACHED set.
+    
+    Returns:
+        Socket path, (host, port) tuple, or None if the shared cache is disabled
+    """
+    value = os.environ.get('RAVANAN_CACHED', '').strip()
+    if value.lower() in ('0', 'off', 'no', 'false'):
+        return None
+    if value:
+        host, sep, port = value.rpartition(':')
+        if sep and port.isdigit() and '/' not in value and '\\' not in value:
+            return (host or '127.0.0.1', int(port))
+        return value
+    if hasattr(socket, 'AF_UNIX'):
+        return os.path.join(os.path.expanduser('~'), '.cache', 'ravanan', 'cached.sock')
+    # Without Unix sockets, probing a TCP port on every start isn't free;
+    # the daemon is used only when RAVANAN_CACHED names it
+    return None
+
+
+def send_message(wfile, header: Dict, body: bytes = b''):
+    """Write one message (JSON header line + body)"""
+    header = dict(header, length=len(body))
+    wfile.write(json.dumps(header).encode('utf-8') + b'\n')
+    if body:
+        wfile.write(body)
+    wfile.flush()
+
+
+def recv_message(rfile) -> Tuple[Optional[Dict], bytes]:
+    """
+    Read one message
+    
+    Returns:
+        Tuple of (header, body); header is None when the peer closed the connection
+    """
+    line = rfile.readline(MAX_HEADER)
+    if not line:
+        return None, b''
+    if not line.endswith(b'\n'):
+        raise ValueError("Message header too long")
+    header = json.loads(line)
+    length = header.get('length', 0)
+    body = rfile.read(length) if length else b''
+    if len(body) != length:
+        raise ValueError("Connection closed mid-message")
+    return header, body
+
+
+def page_key(url: str, content: str) -> str:
+    """Parsed-page cache key: parser version, page URL and exact source"""
+    digest = hashlib.sha1(f"{PARSER_VERSION}\n{canonical_url(url)}\n".encode('utf-8'))
+    digest.update(content.encode('utf-8', errors='surrogatepass'))
+    return digest.hexdigest()
+
+
+class CacheDaemon:
+    """Shared HTTP response and parsed-page cache"""
+    
+    def __init__(self, ttl: float = 60, max_entries: int = 2048, max_body: int = 8 * 1024 * 1024,
+                 max_pages: int = 1024, timeout: int = 10, pool_size: int = 32):
+        """
+        Args:
+            ttl: Seconds a response is served without contacting the origin, unless
+                its Cache-Control max-age or Expires header says otherwise
+            max_entries: HTTP responses kept
+            max_body: Larger responses are passed through but not cached
+            max_pages: Parsed pages kept
+            timeout: Origin request timeout in seconds
+            pool_size: Keep-alive connections kept per host
+        """
+        from .fetcher import WebFetcher
+        
+        self.ttl = ttl
+        self.max_body = max_body
+        self.fetcher = WebFetcher(timeout=timeout, pool_size=pool_size, shared_cache=False)
+        # Files are downloaded by the client itself; don't read them here
+        self.fetcher.on_binary = _drop_body
+        self.responses = LRUCache(max_entries)
+        self.pages = LRUCache(max_pages)
+        self.started = time.time()
+        self.counters = {
+            'requests': 0, 'hits': 0, 'revalidated': 0, 'misses': 0, 'uncacheable': 0,
+            'bytes_fetched': 0, 'bytes_saved': 0, 'page_hits': 0, 'page_misses': 0, 'clients': 0,
+        }
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+    
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+    
+    def fetch(self, url: str) -> Tuple[Dict, bytes]:
+        """
+        Serve a URL from the cache or the origin
+        
+        Concurrent requests for the same URL share one origin fetch. Only
+        http and https URLs are fetched, so a client can never read the
+        daemon owner's local files.
+        
+        Returns:
+            Tuple of (reply header, body)
+        """
+        scheme = urlsplit(url).scheme.lower()
+        if scheme not in ('http', 'https'):
+            return {'error': f"Unsupported URL scheme: {scheme or 'none'}"}, b''
+        key = canonical_url(url)
+        self._count('requests')
+        while True:
+            entry = self.responses.get(key)
+            if entry is not None and time.monotonic() - entry['stored'] < entry['ttl']:
+                self._count('hits')
+                self._count('bytes_saved', len(entry['body']))
+                return dict(entry['reply'], cached=True), entry['body']
+            
+            with self._lock:
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+            if not leader:
+                event.wait(self.fetcher.timeout * 2)
+                continue
+            try:
+                return self._fetch_origin(key, url, entry)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+                event.set()
+    
+    def _fetch_origin(self, key: str, url: str, entry: Optional[Dict]) -> Tuple[Dict, bytes]:
+        """Fetch from the origin, revalidating a stale entry when it has validators"""
+        etag = entry['etag'] if entry else None
+        last_modified = entry['last_modified'] if entry else None
+        success, content, final_url, status_code, headers = self.fetcher.fetch_conditional(
+            url, etag, last_modified
+        )
+        if status_code == 304 and entry is not None:
+            entry['stored'] = time.monotonic()
+            if 'Cache-Control' in headers or 'Expires' in headers:
+                entry['ttl'] = self._freshness(headers)
+            self.responses.put(key, entry)
+            self._count('revalidated')
+            self._count('bytes_saved', len(entry['body']))
+            return dict(entry['reply'], cached=True), entry['body']
+        
+        if status_code == 200 and is_binary_response(headers):
+            # Left unread by _drop_body; the client fetches it directly, once
+            self._count('uncacheable')
+            reply = {'binary': True, 'final_url': final_url, 'status': status_code,
+                     'headers': {name: headers[name] for name in _REPLY_HEADERS if name in headers}}
+            return reply, b''
+        
+        body = content.encode('utf-8', errors='surrogatepass')
+        reply = {
+            'success': success,
+            'final_url': final_url,
+            'status': status_code,
+            'headers': {name: headers[name] for name in _REPLY_HEADERS if name in headers},
+        }
+        self._count('misses')
+        self._count('bytes_fetched', len(body))
+        
+        # Private responses are for one user; this cache is shared by all of them
+        directives = _cache_directives(headers.get('Cache-Control', ''))
+        storable = 'no-store' not in directives and 'private' not in directives
+        if status_code == 200 and len(body) <= self.max_body and storable:
+            self.responses.put(key, {
+                'reply': reply,
+                'body': body,
+                'stored': time.monotonic(),
+                'ttl': self._freshness(headers),
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+            })
+        else:
+            self._count('uncacheable')
+        return dict(reply, cached=False), body
+    
+    def _freshness(self, headers: Dict) -> float:
+        """
+        Seconds a response may be served without revalidation
+        
+        s-maxage or max-age wins, then Expires (relative to the response's
+        Date), then the daemon's ttl. no-cache means revalidate every time.
+        """
+        directives = _cache_directives(headers.get('Cache-Control', ''))
+        if 'no-cache' in directives:
+            return 0.0
+        for name in ('s-maxage', 'max-age'):
+            if name in directives:
+                try:
+                    return max(0.0, float(int(directives[name])))
+                except ValueError:
+                    return 0.0
+        if 'Expires' in headers:
+            from email.utils import parsedate_to_datetime
+            try:
+                expires = parsedate_to_datetime(headers['Expires']).timestamp()
+                date = parsedate_to_datetime(headers['Date']).timestamp() if 'Date' in headers else time.time()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return 0.0  # An invalid Expires means already expired
+            return max(0.0, expires - date)
+        return self.ttl
+    
+    def stats(self) -> Dict:
+        """Counters plus derived hit rates"""
+        with self._lock:
+            stats = dict(self.counters)
+        served = stats['hits'] + stats['revalidated']
+        stats['hit_rate'] = served / stats['requests'] if stats['requests'] else 0.0
+        looked_up = stats['page_hits'] + stats['page_misses']
+        stats['page_hit_rate'] = stats['page_hits'] / looked_up if looked_up else 0.0
+        stats['responses_cached'] = len(self.responses)
+        stats['pages_cached'] = len(self.pages)
+        stats['uptime'] = time.time() - self.started
+        return stats
+    
+    def handle(self, header: Dict, body: bytes) -> Tuple[Dict, bytes]:
+        """Dispatch one request message"""
+        op = header.get('op')
+        if op == 'fetch':
+            return self.fetch(header['url'])
+        if op == 'page_get':
+            page = self.pages.get(header['key'])
+            self._count('page_hits' if page is not None else 'page_misses')
+            return {'found': page is not None}, page or b''
+        if op == 'page_put':
+            self.pages.put(header['key'], body)
+            return {'ok': True}, b''
+        if op == 'stats':
+            return {'stats': self.stats()}, b''
+        return {'error': f"unknown op {op!r}"}, b''
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection; serves requests until the client disconnects"""
+    
+    def handle(self):
+        daemon = self.server.cache_daemon
+        daemon._count('clients')
+        while True:
+            try:
+                header, body = recv_message(self.rfile)
+                if header is None:
+                    return
+                reply, reply_body = daemon.handle(header, body)
+                send_message(self.wfile, reply, reply_body)
+            except (OSError, ValueError, KeyError):
+                return
+
+
+# A full Unix socket backlog refuses connects immediately, and a refused
+# client stops using the daemon for a while, so allow plenty of pending ones
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+
+def serve(daemon: CacheDaemon, address: Address, on_ready: Callable[[], None] = None):
+    """
+    Run the daemon until interrupted
+    
+    Args:
+        daemon: Cache to serve
+        address: Socket path or (host, port)
+        on_ready: Called once the socket is listening
+    """
+    if isinstance(address, str):
+        if os.path.exists(address):
+            if CacheClient(address).stats() is not None:
+                raise OSError(f"ravanan-cached is already running on {address}")
+            os.remove(address)
+        os.makedirs(os.path.dirname(address) or '.', exist_ok=True)
+        old_umask = os.umask(0o077)  # Socket readable by this user only
+        try:
+            server = _UnixServer(address, _Handler)
+        finally:
+            os.umask(old_umask)
+    else:
+        server = _TCPServer(address, _Handler)
+    server.cache_daemon = daemon
+    if on_ready:
+        on_ready()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if isinstance(address, str) and os.path.exists(address):
+            os.remove(address)
+
+
+class CacheClient:
+    """
+    Connection to a running ravanan-cached
+    
+    Every method returns None when the daemon can't be reached, so callers
+    fall back to doing the work themselves. After a failure the daemon is
+    not tried again for RETRY_INTERVAL seconds.
+    """
+    
+    RETRY_INTERVAL = 30.0
+    
+    def __init__(self, address: Address, timeout: float = 60.0):
+        """
+        Args:
+            address: Socket path or (host, port)
+            timeout: Seconds to wait for a reply
+        """
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+        self._retry_at = 0.0
+    
+    @property
+    def available(self) -> bool:
+        """Whether the daemon is worth trying right now"""
+        if time.monotonic() < self._retry_at:
+            return False
+        if isinstance(self.address, str):
+            return os.path.exists(self.address)
+        return True
+    
+    def _connection(self):
+        """Per-thread connection (opened on first use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if isinstance(self.address, str):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(0.5)
+            try:
+                sock.connect(self.address)
+            except OSError:
+                sock.close()
+                raise
+            sock.settimeout(self.timeout)
+            conn = self._local.conn = (sock, sock.makefile('rb'), sock.makefile('wb'))
+        return conn
+    
+    def _close(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            for part in reversed(conn):
+                try:
+                    part.close()
+                except OSError:
+                    pass
+    
+    def request(self, header: Dict, body: bytes = b'') -> Optional[Tuple[Dict, bytes]]:
+        """
+        Send one request and wait for the reply
+        
+        Returns:
+            Tuple of (header, body), or None if the daemon is unavailable
+        """
+        if not self.available:
+            return None
+        try:
+            sock, rfile, wfile = self._connection()
+            send_message(wfile, header, body)
+            reply, reply_body = recv_message(rfile)
+            if reply is None:
+                raise OSError("ravanan-cached closed the connection")
+            return reply, reply_body
+        except (OSError, ValueError):
+            self._close()
+            self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+            return None
+    
+    def fetch(self, url: str) -> Optional[Tuple[bool, str, str, int, Dict]]:
+        """
+        Fetch through the shared HTTP cache
+        
+        Returns:
+            Same tuple as WebFetcher.fetch_with_headers, or None if unavailable
+            or the response is a file (see is_binary_response)
+        """
+        result = self.request({'op': 'fetch', 'url': url})
+        if result is None:
+            return None
+        from requests.structures import CaseInsensitiveDict
+        
+        reply, body = result
+        if 'error' in reply:
+            return None
+        if reply.get('binary') or is_binary_response(reply['headers']):
+            return None  # A file: fetch it directly so it can be handed to the downloader
+        return (
+            reply['success'],
+            body.decode('utf-8', errors='surrogatepass'),
+            reply['final_url'],
+            reply['status'],
+            CaseInsensitiveDict(reply['headers'])
+        )
+    
+    def get_page(self, url: str, content: str) -> Optional[Tuple[str, List[Dict], List[Tuple]]]:
+        """
+        Look up a parsed page
+        
+        Args:
+            url: Final page URL
+            content: Page source the parse came from
+        
+        Returns:
+            Tuple of (title, links, text_content), or None on a miss
+        """
+        if not self.available:
+            return None
+        result = self.request({'op': 'page_get', 'key': page_key(url, content)})
+        if result is None or not result[0].get('found'):
+            return None
+        page = json.loads(result[1])
+        return page['title'], page['links'], [tuple(block) for block in page['blocks']]
+    
+    def put_page(self, url: str, content: str, title: str, links: List[Dict], text_content: List[Tuple]):
+        """Share a parsed page with other processes"""
+        if not self.available:
+            return
+        body = json.dumps({'title': title, 'links': links, 'blocks': text_content}).encode('utf-8')
+        self.request({'op': 'page_put', 'key': page_key(url, content)}, body)
+    
+    def stats(self) -> Optional[Dict]:
+        """Daemon counters, or None if it isn't running"""
+        result = self.request({'op': 'stats'})
+        return result[0].get('stats') if result else None
+
+
+def format_stats(stats: Dict) -> List[str]:
+    """Daemon counters as printable lines"""
+    return [
+        f"Requests: {stats['requests']} ({stats['hits']} hits, {stats['revalidated']} revalidated, "
+        f"{stats['misses']} misses)",
+        f"Shared hit rate: {stats['hit_rate']:.1%}",
+        f"Bytes saved: {format_bytes(stats['bytes_saved'])} (fetched {format_bytes(stats['bytes_fetched'])})",
+        f"Parsed pages: {stats['page_hits']} hits, {stats['page_misses']} misses "
+        f"({stats['page_hit_rate']:.1%})",
+        f"Cached: {stats['responses_cached']} responses, {stats['pages_cached']} parsed pages",
+        f"Uptime: {stats['uptime'] / 60:.1f} min, {stats['clients']} client connections",
+    ]
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point for `ravanan-cached` (also `ravanan cached`)
+    
+    Args:
+        argv: Command-line arguments
+    
+    Returns:
+        Process exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog='ravanan-cached',
+        description='Shared HTTP and parsed-page cache for Ravanan processes on this machine'
+    )
+    parser.add_argument('--socket', help='Unix socket path (default: ~/.cache/ravanan/cached.sock or $RAVANAN_CACHED)')
+    parser.add_argument('--port', type=int, help='Listen on 127.0.0.1:PORT instead of a Unix socket')
+    parser.add_argument('--ttl', type=float, default=60, help='Seconds responses without max-age or Expires are served without revalidation (default: 60)')
+    parser.add_argument('--max-entries', type=int, default=2048, help='HTTP responses kept (default: 2048)')
+    parser.add_argument('--max-pages', type=int, default=1024, help='Parsed pages kept (default: 1024)')
+    parser.add_argument('--stats', action='store_true', help='Print statistics of the running daemon and exit')
+    args = parser.parse_args(argv)
+    
+    if args.port:
+        address = ('127.0.0.1', args.port)
+    else:
+        address = args.socket or default_address()
+    if address is None:
+        print("❌ Shared cache disabled by RAVANAN_CACHED")
+        return 1
+    where = address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+    
+    if args.stats:
+        stats = CacheClient(address).stats()
+        if stats is None:
+            print(f"❌ ravanan-cached is not running on {where}")
+            return 1
+        print("\n".join(format_stats(stats)))
+        return 0
+    
+    daemon = CacheDaemon(ttl=args.ttl, max_entries=args.max_entries, max_pages=args.max_pages)
+    try:
+        serve(daemon, address, lambda: print(f"🗄️  ravanan-cached listening on {where} (Ctrl+C to stop)"))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"❌ {e}")
+        return 1
+    print("\n".join(format_stats(daemon.stats())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+Crawler Module
+Mirrors a site into Ravanan's text form for offline reading
+
+The frontier and the set of seen URLs are saved to a state file in the
+output directory, so an interrupted crawl resumes where it stopped.
+
+Created by: Krishna D
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .fetcher import WebFetcher
+from .parser import HTMLParser
+from ..utils.export import format_page_text, page_to_dict
+from ..utils.urls import canonical_url, url_host
+
+STATE_FILE = '.ravanan-crawl.json'
+
+
+class CrawlScope:
+    """Decides which discovered URLs a crawl may follow"""
+    
+    def __init__(self, seeds: List[str], mode: str = 'host', path_prefix: str = None):
+        """
+        Args:
+            seeds: Seed URLs (canonical form)
+            mode: 'host' (same hosts as the seeds), 'prefix' (same host and
+                  under the seed's directory), 'domain' (seed hosts and their
+                  subdomains) or 'any'
+            path_prefix: Extra path prefix every URL must start with
+        """
+        self.mode = mode
+        self.path_prefix = path_prefix
+        self.hosts = {url_host(seed) for seed in seeds}
+        self.prefixes = []
+        for seed in seeds:
+            parts = urlsplit(seed)
+            directory = parts.path[:parts.path.rfind('/') + 1] or '/'
+            self.prefixes.append(f"{parts.scheme}://{parts.netloc}{directory}")
+    
+    def allows(self, url: str) -> bool:
+        """Check whether a canonical URL is in scope"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            return False
+        if self.path_prefix and not parts.path.startswith(self.path_prefix):
+            return False
+        
+        host = (parts.hostname or '').lower()
+        if self.mode == 'any':
+            return True
+        if self.mode == 'domain':
+            return any(host == seed or host.endswith('.' + seed) for seed in self.hosts)
+        if self.mode == 'prefix':
+            return any(url.startswith(prefix) for prefix in self.prefixes)
+        return host in self.hosts
+
+
+class Crawler:
+    """Concurrent, resumable crawler built on WebFetcher and HTMLParser"""
+    
+    def __init__(self, seeds: List[str], out_dir: str, scope: CrawlScope = None,
+                 max_depth: int = 2, workers: int = 8, output_format: str = 'text',
+                 max_pages: int = None, stats_interval: float = 5.0,
+                 checkpoint_every: int = 25, fetcher_factory=WebFetcher):
+        self.seeds = [canonical_url(WebFetcher().normalize_url(seed)) for seed in seeds]
+        self.out_dir = out_dir
+        self.scope = scope or CrawlScope(self.seeds)
+        self.max_depth = max_depth
+        self.workers = workers
+        self.output_format = output_format
+        self.max_pages = max_pages
+        self.stats_interval = stats_interval
+        self.checkpoint_every = checkpoint_every
+        self.fetcher_factory = fetcher_factory
+        
+        self.state_path = os.path.join(out_dir, STATE_FILE)
+        self.frontier = deque()
+        self.seen = set()
+        self.in_flight: Dict[str, int] = {}
+        self.pages_done = 0
+        self.pages_failed = 0
+        self.bytes_fetched = 0
+        self._local = threading.local()
+        self._started = None
+        self._last_stats = 0.0
+        self._baseline = (0, 0)
+    
+    def load_state(self) -> bool:
+        """
+        Restore frontier and seen set from a previous run
+        
+        Returns:
+            True if a saved state was found
+        """
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        self.frontier = deque((url, depth) for url, depth in state['frontier'])
+        self.seen = set(state['seen'])
+        self.pages_done = state.get('pages_done', 0)
+        self.pages_failed = state.get('pages_failed', 0)
+        self.bytes_fetched = state.get('bytes_fetched', 0)
+        return True
+    
+    def save_state(self):
+        """Write the frontier (including in-flight URLs) and seen set atomically"""
+        pending = [[url, depth] for url, depth in self.in_flight.items()]
+        pending.extend([url, depth] for url, depth in self.frontier)
+        state = {
+            'seeds': self.seeds,
+            'frontier': pending,
+            'seen': sorted(self.seen),
+            'pages_done': self.pages_done,
+            'pages_failed': self.pages_failed,
+            'bytes_fetched': self.bytes_fetched,
+        }
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+    
+    def _fetcher(self) -> WebFetcher:
+        """Per-thread fetcher (requests sessions are not shared across threads)"""
+        fetcher = getattr(self._local, 'fetcher', None)
+        if fetcher is None:
+            fetcher = self._local.fetcher = self.fetcher_factory()
+        return fetcher
+    
+    def _visit(self, url: str) -> Tuple[bool, str, Optional[Tuple], int]:
+        """
+        Fetch and parse one page (runs on a worker thread)
+        
+        Returns:
+            Tuple of (success, final_url or error, (title, content, links), size)
+        """
+        success, content, final_url, status_code = self._fetcher().fetch(url)
+        if not success:
+            return False, content, None, 0
+        parser = HTMLParser()
+        links, text_content = parser.parse(content, final_url)
+        return True, final_url, (parser.get_page_title(), text_content, links), len(content)
+    
+    def _enqueue(self, url: str, depth: int):
+        """Add a URL to the frontier if it is new and in scope"""
+        url = canonical_url(url)
+        if url in self.seen or not self.scope.allows(url):
+            return
+        self.seen.add(url)
+        self.frontier.append((url, depth))
+    
+    def output_path(self, url: str) -> str:
+        """
+        Map a URL to a file under the output directory
+        
+        Args:
+            url: Canonical page URL
+        
+        Returns:
+            Path ending in .txt or .json
+        """
+        parts = urlsplit(url)
+        path = parts.path
+        if path.endswith('/'):
+            path += 'index'
+        segments = [
+            re.sub(r'[^\w.-]', '_', segment).replace('..', '__')
+            for segment in path.split('/') if segment
+        ]
+        name = segments.pop() if segments else 'index'
+        if parts.query:
+            name += '__' + hashlib.sha1(parts.query.encode('utf-8')).hexdigest()[:10]
+        extension = '.json' if self.output_format == 'json' else '.txt'
+        host = re.sub(r'[^\w.-]', '_', parts.netloc)
+        return os.path.join(self.out_dir, host, *segments, name + extension)
+    
+    def _write_page(self, url: str, page: Tuple):
+        """Write a parsed page to disk"""
+        title, content, links = page
+        path = self.output_path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            if self.output_format == 'json':
+                json.dump(page_to_dict(title, url, content, links), f, ensure_ascii=False)
+            else:
+                f.write(format_page_text(title, url, content, links))
+    
+    def _print_stats(self, final: bool = False):
+        """Print throughput and queue statistics"""
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        pages = self.pages_done - self._baseline[0]
+        size = self.bytes_fetched - self._baseline[1]
+        label = "Done" if final else "Crawling"
+        print(
+            f"🕸️  {label}: {self.pages_done} pages, {self.pages_failed} failed | "
+            f"queue {len(self.frontier)}, in flight {len(self.in_flight)}, seen {len(self.seen)} | "
+            f"{pages / elapsed:.1f} pages/s, {size / 1024 / elapsed:.0f} KB/s"
+        )
+    
+    def run(self, resume: bool = True) -> int:
+        """
+        Crawl until the frontier is empty or the page limit is reached
+        
+        Args:
+            resume: Continue from a saved state file if one exists
+        
+        Returns:
+            Number of pages written in this run
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        if resume and self.load_state():
+            print(f"♻️  Resuming crawl: {len(self.frontier)} pending, {len(self.seen)} seen")
+        else:
+            for seed in self.seeds:
+                if seed not in self.seen:
+                    self.seen.add(seed)
+                    self.frontier.append((seed, 0))
+        
+        self._started = time.monotonic()
+        self._last_stats = self._started
+        self._baseline = (self.pages_done, self.bytes_fetched)
+        futures = {}
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while self.frontier or futures:
+                    while self.frontier and len(futures) < self.workers * 2:
+                        if self.max_pages and self.pages_done + len(futures) >= self.max_pages:
+                            break
+                        url, depth = self.frontier.popleft()
+                        self.in_flight[url] = depth
+                        futures[pool.submit(self._visit, url)] = (url, depth)
+                    if not futures:
+                        break
+                    
+                    done, _ = wait(futures, timeout=self.stats_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, depth = futures.pop(future)
+                        del self.in_flight[url]
+                        self._handle_result(url, depth, future)
+                        if (self.pages_done + self.pages_failed) % self.checkpoint_every == 0:
+                            self.save_state()
+                    
+                    now = time.monotonic()
+                    if now - self._last_stats >= self.stats_interval:
+                        self._last_stats = now
+                        self._print_stats()
+        except KeyboardInterrupt:
+            # Anything still in flight is saved back into the frontier
+            for future in futures:
+                future.cancel()
+            print("\n⏸️  Crawl interrupted; state saved. Run the same command again to resume.")
+        finally:
+            self.save_state()
+        
+        self._print_stats(final=True)
+        return self.pages_done - self._baseline[0]
+    
+    def _handle_result(self, url: str, depth: int, future):
+        """Record a finished page and queue its links"""
+        try:
+            success, detail, page, size = future.result()
+        except Exception as e:
+            success, detail, page, size = False, str(e), None, 0
+        
+        if not success:
+            self.pages_failed += 1
+            print(f"  ❌ {url}: {detail}")
+            return
+        
+        self.pages_done += 1
+        self.bytes_fetched += size
+        final_url = canonical_url(detail)
+        self.seen.add(final_url)
+        try:
+            self._write_page(final_url, page)
+        except OSError as e:
+            print(f"  ❌ {url}: could not write page: {e}")
+        
+        if depth < self.max_depth:
+            for link in page[2]:
+                self._enqueue(link['url'], depth + 1)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point for `ravanan crawl`
+    
+    Args:
+        argv: Arguments after 'crawl'
+    
+    Returns:
+        Process exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog='ravanan crawl',
+        description="Mirror a site into Ravanan's text form for offline reading"
+    )
+    parser.add_argument('seeds', nargs='+', help='Seed URLs')
+    parser.add_argument('-o', '--out', default='ravanan-mirror', help='Output directory (default: ravanan-mirror)')
+    parser.add_argument('--depth', type=int, default=2, help='Maximum link depth from the seeds (default: 2)')
+    parser.add_argument('--scope', choices=['host', 'prefix', 'domain', 'any'], default='host',
+                        help='Which links to follow (default: host)')
+    parser.add_argument('--path-prefix', help='Only follow URLs whose path starts with this')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent fetches (default: 8)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Page output format')
+    parser.add_argument('--max-pages', type=int, help='Stop after this many pages')
+    parser.add_argument('--stats-interval', type=float, default=5.0, help='Seconds between progress lines')
+    parser.add_argument('--fresh', action='store_true', help='Ignore saved state and start over')
+    args = parser.parse_args(argv)
+    
+    fetcher = WebFetcher()
+    seeds = [canonical_url(fetcher.normalize_url(seed)) for seed in args.seeds]
+    crawler = Crawler(
+        seeds,
+        args.out,
+        scope=CrawlScope(seeds, args.scope, args.path_prefix),
+        max_depth=args.depth,
+        workers=args.workers,
+        output_format=args.format,
+        max_pages=args.max_pages,
+        stats_interval=args.stats_interval
+    )
+    crawler.run(resume=not args.fresh)
+    return 0 if crawler.pages_done else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Deep Search Module
+Searches every page linked from the current one (`deep /query`)
+
+Linked pages are loaded concurrently through an api.Browser, so its page
+cache and the shared cache daemon are reused across searches and
+documents are parsed in worker processes. Each page is searched the
+moment it arrives and reported straight away; the ranked list follows
+once every page is in or the time budget runs out.
+
+Created by: Krishna D
+"""
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from .fetcher import is_binary_type
+from .parser import reader_range
+from ..utils.urls import canonical_url
+
+DEFAULT_WORKERS = 8
+DEFAULT_BUDGET = 20.0
+MAX_PAGES = 200
+
+SNIPPET_WIDTH = 120
+SNIPPETS_PER_PAGE = 3
+
+# Score of one match by block type (anything else scores 1); the title scores TITLE_WEIGHT
+_WEIGHTS = {'heading': 3}
+TITLE_WEIGHT = 5
+
+
+class DeepMatch:
+    """Where a query matched on one linked page"""
+    
+    def __init__(self, link_index: int, url: str, title: str, score: int, count: int, snippets: List[str]):
+        self.link_index = link_index
+        self.url = url
+        self.title = title
+        self.score = score
+        self.count = count
+        self.snippets = snippets
+
+
+def _snippet(text: str, position: int, length: int) -> str:
+    """About SNIPPET_WIDTH characters of text centred on a match"""
+    start = max(0, position - (SNIPPET_WIDTH - length) // 2)
+    end = min(len(text), start + SNIPPET_WIDTH)
+    start = max(0, end - SNIPPET_WIDTH)
+    snippet = ' '.join(text[start:end].split())
+    return f"{'…' if start else ''}{snippet}{'…' if end < len(text) else ''}"
+
+
+def match_page(title: str, blocks: List[Tuple], query: str) -> Tuple[int, int, List[str]]:
+    """
+    Score a page against a case-insensitive query
+    
+    Matches in headings and the title weigh more, and matches inside the
+    page's main content (see parser.reader_range) count double, so a term
+    that only turns up in site navigation ranks below one in an article.
+    
+    Args:
+        title: Page title
+        blocks: Parsed content list
+        query: Text to look for
+    
+    Returns:
+        Tuple of (score, number of matches, snippets of the first matches)
+    """
+    needle = query.lower()
+    count = title.lower().count(needle)
+    score = count * TITLE_WEIGHT
+    snippets = []
+    main = reader_range(blocks)
+    for index, (item_type, text, _) in enumerate(blocks):
+        if not text:
+            continue
+        lowered = text.lower()
+        found = lowered.count(needle)
+        if not found:
+            continue
+        count += found
+        weight = _WEIGHTS.get(item_type, 1)
+        if main and main[0] <= index < main[1]:
+            weight *= 2
+        score += found * weight
+        if len(snippets) < SNIPPETS_PER_PAGE:
+            snippets.append(_snippet(text, lowered.index(needle), len(needle)))
+    return score, count, snippets
+
+
+def _host_matches(url: str, host: str) -> bool:
+    name = (urlsplit(url).hostname or '').lower()
+    return name == host or name.endswith('.' + host)
+
+
+def deep_targets(links: List[Dict], page_url: str, host: str = None,
+                 limit: int = MAX_PAGES) -> List[Tuple[int, str]]:
+    """
+    Linked pages worth searching
+    
+    Each distinct page is taken once, under its first link number; the
+    current page, non-web links and links to files (by extension) are left out.
+    
+    Args:
+        links: Navigator.current_links
+        page_url: URL of the current page
+        host: Only links to this host or its subdomains
+        limit: Most pages taken
+    
+    Returns:
+        (link number, URL) pairs in page order
+    """
+    import mimetypes
+    
+    seen = {canonical_url(page_url)}
+    targets = []
+    for link in links:
+        url = link['url']
+        if urlsplit(url).scheme not in ('http', 'https'):
+            continue
+        if host and not _host_matches(url, host):
+            continue
+        key = canonical_url(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        guessed, encoding = mimetypes.guess_type(urlsplit(url).path)
+        if encoding is not None or (guessed is not None and is_binary_type(guessed)):
+            continue
+        targets.append((link['index'], url))
+        if len(targets) >= limit:
+            break
+    return targets
+
+
+def _discard_body(url: str, chunks, headers):
+    """WebFetcher.on_binary: a linked file isn't searched; drop the response"""
+    for _ in chunks:
+        break
+    chunks.close()
+
+
+class DeepSearch:
+    """
+    Concurrent search of linked pages, with a browser kept between searches
+    
+    The browser's page cache means a second query over the same links
+    fetches nothing that is still fresh.
+    """
+    
+    def __init__(self, workers: int = DEFAULT_WORKERS, parse_workers: int = None, timeout: int = 10):
+        """
+        Args:
+            workers: Pages fetched at once
+            parse_workers: Parser processes (default: up to 4, by CPU count; 0 parses in threads)
+            timeout: Per-request timeout ceiling in seconds
+        """
+        self.workers = workers
+        if parse_workers is None:
+            cpus = os.cpu_count() or 1
+            parse_workers = min(4, cpus) if cpus > 1 else 0
+        self.parse_workers = parse_workers
+        self.timeout = timeout
+        self._browser = None
+    
+    @property
+    def browser(self):
+        """api.Browser used for every search, created on first use"""
+        if self._browser is None:
+            from ..api import Browser
+            self._browser = Browser(timeout=self.timeout, max_workers=self.workers,
+                                    parse_workers=self.parse_workers)
+            self._browser.fetcher.on_binary = _discard_body
+        return self._browser
+    
+    def run(self, targets: List[Tuple[int, str]], query: str, budget: float = DEFAULT_BUDGET,
+            on_match: Callable[[DeepMatch], None] = None) -> Dict:
+        """
+        Load and search pages until all are done or the budget is spent
+        
+        Args:
+            targets: (link number, URL) pairs from deep_targets()
+            query: Case-insensitive text to look for
+            budget: Seconds the whole search may take
+            on_match: Called from the calling thread with each matching page as it is found
+        
+        Returns:
+            Dict with 'matches' (DeepMatch list, best first), 'searched',
+            'failed', 'cached', 'unfinished' and 'seconds'
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        
+        browser = self.browser
+        cache_hits = browser.cache.hits if browser.cache is not None else 0
+        started = time.monotonic()
+        deadline = started + budget
+        matches = []
+        searched = failed = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        futures = {pool.submit(browser.get, url): (index, url) for index, url in targets}
+        pending = set(futures)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, url = futures[future]
+                    try:
+                        page = future.result()
+                    except Exception:
+                        page = None
+                    if page is None or not page.ok:
+                        failed += 1
+                        continue
+                    searched += 1
+                    score, count, snippets = match_page(page.title, page.blocks, query)
+                    if score:
+                        match = DeepMatch(index, page.final_url, page.title, score, count, snippets)
+                        matches.append(match)
+                        if on_match is not None:
+                            on_match(match)
+        finally:
+            # Past the budget (or on Ctrl+C) queued pages are dropped and
+            # requests in flight finish in the background, unread
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+        
+        matches.sort(key=lambda match: (-match.score, match.link_index))
+        return {
+            'matches': matches,
+            'searched': searched,
+            'failed': failed,
+            'cached': (browser.cache.hits - cache_hits) if browser.cache is not None else 0,
+            'unfinished': len(pending),
+            'seconds': time.monotonic() - started,
+        }
+    
+    def close(self):
+        """Stop parser processes and close connections"""
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
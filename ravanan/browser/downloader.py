@@ -0,0 +1,365 @@
+"""
+Downloader Module
+Streams files to disk in the background, in parallel Range segments when possible
+
+Progress is kept next to the file (NAME.part plus NAME.part.json), so an
+interrupted download picks up where it stopped the next time the same
+URL is downloaded to the same place.
+
+Created by: Krishna D
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import unquote, urlsplit
+
+from .fetcher import WebFetcher
+from ..utils.memory import format_bytes
+
+PART_SUFFIX = '.part'
+
+_FILENAME_RE = re.compile(r'filename\*?\s*=\s*(?:UTF-8\'\')?"?([^";]+)"?', re.IGNORECASE)
+
+
+def default_directory() -> str:
+    """$RAVANAN_DOWNLOADS, else ~/Downloads if it exists, else the working directory"""
+    configured = os.environ.get('RAVANAN_DOWNLOADS')
+    if configured:
+        return os.path.expanduser(configured)
+    downloads = os.path.join(os.path.expanduser('~'), 'Downloads')
+    return downloads if os.path.isdir(downloads) else os.getcwd()
+
+
+def filename_for(url: str, headers: Dict) -> str:
+    """
+    File name for a download: Content-Disposition, else the last URL path segment
+    
+    Args:
+        url: Final URL
+        headers: Response headers
+    
+    Returns:
+        A bare file name (never a path)
+    """
+    match = _FILENAME_RE.search(headers.get('Content-Disposition', ''))
+    name = unquote(match.group(1)) if match else unquote(urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1])
+    name = os.path.basename(name.replace('\\', '/')).strip()
+    return name if name not in ('', '.', '..') else 'download'
+
+
+def target_path(url: str, headers: Dict, path: str = None) -> str:
+    """
+    Where to save a download
+    
+    An unfinished download of the same name is reused (and resumed); a
+    finished file of the same name is never overwritten unless `path`
+    names it explicitly.
+    
+    Args:
+        url: Final URL
+        headers: Response headers
+        path: File or directory requested by the user (default: default_directory())
+    
+    Returns:
+        File path
+    """
+    if path and not os.path.isdir(path) and not path.endswith(('/', os.sep)):
+        return os.path.expanduser(path)
+    directory = os.path.expanduser(path) if path else default_directory()
+    os.makedirs(directory, exist_ok=True)
+    name = filename_for(url, headers)
+    stem, ext = os.path.splitext(name)
+    candidate = os.path.join(directory, name)
+    copy = 1
+    while os.path.exists(candidate) and not os.path.exists(candidate + PART_SUFFIX):
+        candidate = os.path.join(directory, f"{stem} ({copy}){ext}")
+        copy += 1
+    return candidate
+
+
+class Download:
+    """One file transfer; worker threads update its segments and counters"""
+    
+    def __init__(self, number: int, url: str, path: str = None):
+        """
+        Args:
+            number: Position in the downloader's list (1-based)
+            url: Requested URL
+            path: Requested file or directory (resolved once headers arrive)
+        """
+        self.number = number
+        self.url = url
+        self.requested_path = path
+        self.path = None
+        self.total: Optional[int] = None  # Content-Length, if known
+        self.segments: List[List[int]] = []  # [start, end (inclusive), next offset]
+        self.validator = None  # ETag or Last-Modified, for If-Range on resume
+        self.resumed_from = 0
+        self.received = 0  # Bytes transferred in this run
+        self.state = 'starting'  # running, done, failed, cancelled
+        self.error = None
+        self.started = time.monotonic()
+        self.finished = None
+        self.reported = False
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+    
+    @property
+    def done_bytes(self) -> int:
+        """Bytes on disk so far, including any resumed part"""
+        with self._lock:
+            return sum(next_offset - start for start, end, next_offset in self.segments)
+    
+    @property
+    def throughput(self) -> float:
+        """Average bytes per second in this run"""
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.received / elapsed if elapsed > 0 else 0.0
+    
+    def cancel(self):
+        """Stop after the current chunk; progress is kept for resuming"""
+        self._cancel.set()
+    
+    def _advance(self, segment: List[int], size: int):
+        with self._lock:
+            segment[2] += size
+            self.received += size
+    
+    def status_line(self) -> str:
+        """One line of progress for `downloads`"""
+        name = os.path.basename(self.path) if self.path else self.url
+        done = self.done_bytes
+        if self.total:
+            progress = f"{format_bytes(done)}/{format_bytes(self.total)} ({done * 100 // self.total}%)"
+        else:
+            progress = format_bytes(done)
+        details = f"{format_bytes(self.throughput)}/s"
+        if len(self.segments) > 1:
+            details += f", {len(self.segments)} segments"
+        if self.resumed_from:
+            details += f", resumed at {format_bytes(self.resumed_from)}"
+        line = f"[{self.number}] {self.state:<9} {name}  {progress}  {details}"
+        return line + (f"\n      {self.error}" if self.error else "")
+
+
+class Downloader:
+    """Runs downloads on background threads"""
+    
+    SEGMENT_MIN = 1024 * 1024  # Files smaller than two segments download in one stream
+    SAVE_INTERVAL = 1.0  # Seconds between progress checkpoints
+    CHUNK_SIZE = 256 * 1024
+    SEGMENT_RETRIES = 3
+    
+    def __init__(self, fetcher: WebFetcher = None, segments: int = 4):
+        """
+        Args:
+            fetcher: Fetcher to use (default: a pooled one of its own)
+            segments: Parallel Range requests per download
+        """
+        self.fetcher = fetcher or WebFetcher(pool_size=segments * 2)
+        self.segments = segments
+        self.downloads: List[Download] = []
+        self._lock = threading.Lock()
+    
+    def start(self, url: str, path: str = None, chunks: Iterator[bytes] = None,
+              headers: Dict = None) -> Download:
+        """
+        Begin a download in the background
+        
+        Args:
+            url: URL to download
+            path: File or directory to save to (default: default_directory())
+            chunks: Body of a response already in flight (hand-off from WebFetcher)
+            headers: Headers of that response
+        
+        Returns:
+            The Download, for progress reporting
+        """
+        with self._lock:
+            download = Download(len(self.downloads) + 1, url, path)
+            self.downloads.append(download)
+        thread = threading.Thread(target=self._run, args=(download, chunks, headers),
+                                  name=f'ravanan-download-{download.number}', daemon=True)
+        thread.start()
+        return download
+    
+    def finished(self) -> List[Download]:
+        """Downloads that ended since the last call"""
+        ended = []
+        for download in list(self.downloads):
+            if download.state in ('done', 'failed', 'cancelled') and not download.reported:
+                download.reported = True
+                ended.append(download)
+        return ended
+    
+    def shutdown(self, timeout: float = 2.0):
+        """Cancel running downloads and wait briefly for their progress to be saved"""
+        running = [download for download in self.downloads if download.state in ('starting', 'running')]
+        for download in running:
+            download.cancel()
+        deadline = time.monotonic() + timeout
+        for download in running:
+            while download.state in ('starting', 'running') and time.monotonic() < deadline:
+                time.sleep(0.05)
+    
+    def _run(self, download: Download, chunks: Optional[Iterator[bytes]], headers: Optional[Dict]):
+        """Coordinate one download (runs on its own thread)"""
+        try:
+            self._transfer(download, chunks, headers)
+        except Exception as e:
+            download.state = 'failed'
+            download.error = f"Error: {str(e)}"
+        finally:
+            if chunks is not None and hasattr(chunks, 'close'):
+                chunks.close()
+            download.finished = time.monotonic()
+    
+    def _transfer(self, download: Download, chunks: Optional[Iterator[bytes]], headers: Optional[Dict]):
+        url = download.url
+        if chunks is None:
+            success, body, url, status_code, headers = self.fetcher.fetch_stream(
+                url, {'Accept-Encoding': 'identity'}, self.CHUNK_SIZE
+            )
+            if not success:
+                download.state = 'failed'
+                download.error = body
+                return
+            chunks = body
+        download.url = url
+        download.path = target_path(url, headers, download.requested_path)
+        part_path = download.path + PART_SUFFIX
+        state_path = part_path + '.json'
+        
+        encoded = headers.get('Content-Encoding', 'identity').lower() != 'identity'
+        length = headers.get('Content-Length')
+        download.total = int(length) if length and length.isdigit() and not encoded else None
+        download.validator = headers.get('ETag') or headers.get('Last-Modified')
+        ranged = download.total is not None and headers.get('Accept-Ranges', '').lower() == 'bytes'
+        
+        saved = self._load_state(state_path, download) if ranged and os.path.exists(part_path) else None
+        if saved is not None:
+            download.segments = saved
+            download.resumed_from = download.done_bytes
+        elif ranged and download.total >= 2 * self.SEGMENT_MIN:
+            count = min(self.segments, download.total // self.SEGMENT_MIN)
+            size = -(-download.total // count)
+            download.segments = [[start, min(start + size, download.total) - 1, start]
+                                 for start in range(0, download.total, size)]
+        else:
+            download.segments = [[0, (download.total or 0) - 1, 0]]
+        
+        mode = 'r+b' if saved is not None else 'wb'
+        with open(part_path, mode) as f:
+            if download.total is not None and saved is None:
+                f.truncate(download.total)
+        
+        download.state = 'running'
+        if saved is None and len(download.segments) == 1:
+            # Keep the response already in flight instead of asking again
+            self._write_stream(download, download.segments[0], chunks, part_path, bounded=download.total is not None)
+        else:
+            chunks.close()
+            workers = [
+                threading.Thread(target=self._fetch_segment, args=(download, segment, part_path), daemon=True)
+                for segment in download.segments if segment[2] <= segment[1]
+            ]
+            for worker in workers:
+                worker.start()
+            while any(worker.is_alive() for worker in workers):
+                for worker in workers:
+                    worker.join(self.SAVE_INTERVAL / len(workers))
+                if ranged:
+                    self._save_state(state_path, download)
+        
+        if download._cancel.is_set() or download.error:
+            if ranged:
+                self._save_state(state_path, download)
+            download.state = 'failed' if download.error else 'cancelled'
+            return
+        
+        size = os.path.getsize(part_path)
+        if download.total is not None and (size != download.total or download.done_bytes != download.total):
+            download.state = 'failed'
+            download.error = (f"Error: size mismatch: got {download.done_bytes} bytes, "
+                              f"Content-Length says {download.total}")
+            if ranged:
+                self._save_state(state_path, download)
+            return
+        os.replace(part_path, download.path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        download.state = 'done'
+    
+    def _fetch_segment(self, download: Download, segment: List[int], part_path: str):
+        """Download one byte range, retrying from where it stopped"""
+        error = None
+        for attempt in range(self.SEGMENT_RETRIES):
+            if download._cancel.is_set() or segment[2] > segment[1]:
+                return
+            request_headers = {'Range': f"bytes={segment[2]}-{segment[1]}", 'Accept-Encoding': 'identity'}
+            if download.validator:
+                request_headers['If-Range'] = download.validator
+            success, body, final_url, status_code, headers = self.fetcher.fetch_stream(
+                download.url, request_headers, self.CHUNK_SIZE
+            )
+            if success and status_code != 206:
+                body.close()
+                download.error = "Error: the file changed on the server or Range was refused; download it again"
+                download.cancel()
+                return
+            if not success:
+                error = body
+                continue
+            try:
+                self._write_stream(download, segment, body, part_path, bounded=True)
+                return
+            except Exception as e:
+                error = f"Error: {str(e)}"
+        download.error = error
+        download.cancel()
+    
+    def _write_stream(self, download: Download, segment: List[int], chunks: Iterator[bytes],
+                      part_path: str, bounded: bool):
+        """Write chunks at the segment's next offset until it is complete or cancelled"""
+        with open(part_path, 'r+b') as f:
+            f.seek(segment[2])
+            for chunk in chunks:
+                if download._cancel.is_set():
+                    break
+                if bounded:
+                    chunk = chunk[:segment[1] + 1 - segment[2]]
+                f.write(chunk)
+                download._advance(segment, len(chunk))
+                if bounded and segment[2] > segment[1]:
+                    break
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    
+    def _load_state(self, state_path: str, download: Download) -> Optional[List[List[int]]]:
+        """Segments of an unfinished earlier download of the same file, if still valid"""
+        try:
+            with open(state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get('url') != download.url or state.get('total') != download.total
+                or state.get('validator') != download.validator):
+            return None
+        return state.get('segments') or None
+    
+    def _save_state(self, state_path: str, download: Download):
+        """Checkpoint segment progress atomically"""
+        with download._lock:
+            state = {
+                'url': download.url,
+                'total': download.total,
+                'validator': download.validator,
+                'segments': [list(segment) for segment in download.segments],
+            }
+        temp_path = state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
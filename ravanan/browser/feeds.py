@@ -0,0 +1,358 @@
+"""
+Feeds Module
+RSS/Atom subscriptions with conditional refresh and seen-item tracking
+
+Feeds are parsed with a pull parser fed straight from the network stream,
+so a large feed never becomes a full document tree in memory.
+
+Created by: Krishna D
+"""
+import html
+import json
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from .fetcher import WebFetcher
+from ..utils.paths import state_path
+
+# Pseudo-URL of the combined "new entries" view, so it can live in history
+FEEDS_URL = 'ravanan:feeds'
+
+ENTRY_TAGS = ('item', 'entry')
+FEED_TAGS = ('channel', 'feed')
+
+_FEED_ROOT_RE = re.compile(r'<(rss|feed|rdf:rdf)[\s>]', re.IGNORECASE)
+_FEED_LINK_RE = re.compile(
+    r'<link\b[^>]*\btype=["\']application/(?:rss|atom)\+xml["\'][^>]*>', re.IGNORECASE
+)
+_HREF_RE = re.compile(r'\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def looks_like_feed(content: str) -> bool:
+    """Check whether a response body is an RSS/Atom document rather than HTML"""
+    head = content[:2048]
+    return bool(_FEED_ROOT_RE.search(head)) and '<html' not in head.lower()
+
+
+def discover_feeds(source: str, base_url: str) -> List[str]:
+    """
+    Find feeds advertised by an HTML page (<link rel="alternate" type="application/rss+xml">)
+    
+    Args:
+        source: Page HTML
+        base_url: Page URL for resolving relative hrefs
+    
+    Returns:
+        Absolute feed URLs in page order
+    """
+    feeds = []
+    for tag in _FEED_LINK_RE.findall(source):
+        href = _HREF_RE.search(tag)
+        if href:
+            feeds.append(urljoin(base_url, html.unescape(href.group(1))))
+    return feeds
+
+
+def _plain_text(markup: str, limit: int = 240) -> str:
+    """Strip tags from an entry summary and shorten it"""
+    text = ' '.join(html.unescape(_TAG_RE.sub(' ', markup)).split())
+    return text if len(text) <= limit else text[:limit].rsplit(' ', 1)[0] + '…'
+
+
+class FeedEntry:
+    """One item of a feed"""
+    
+    __slots__ = ('id', 'title', 'link', 'published', 'summary')
+    
+    def __init__(self, id: str, title: str, link: str, published: str = "", summary: str = ""):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary
+
+
+def parse_feed(chunks: Iterable[Union[bytes, str]], base_url: str = "") -> Tuple[str, List[FeedEntry]]:
+    """
+    Parse RSS 2.0, RSS 1.0 or Atom incrementally
+    
+    Each entry is converted and its element cleared as soon as it closes.
+    
+    Args:
+        chunks: Document text or bytes, in pieces
+        base_url: Feed URL for resolving relative entry links
+    
+    Returns:
+        Tuple of (feed title, entries in document order)
+    
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML
+    """
+    from xml.etree.ElementTree import XMLPullParser
+    
+    parser = XMLPullParser(events=('start', 'end'))
+    path: List[str] = []
+    title = ""
+    entries: List[FeedEntry] = []
+    current: Optional[Dict[str, str]] = None
+    
+    def handle_events():
+        nonlocal title, current
+        for event, element in parser.read_events():
+            name = element.tag.rsplit('}', 1)[-1]
+            if event == 'start':
+                path.append(name)
+                if name in ENTRY_TAGS:
+                    current = {}
+                continue
+            
+            path.pop()
+            if current is not None and name in ENTRY_TAGS:
+                link = current.get('link', '')
+                if link and '://' not in link:
+                    link = urljoin(base_url, link)
+                entry_title = current.get('title') or link or "(untitled)"
+                entries.append(FeedEntry(
+                    current.get('id') or link or entry_title,
+                    entry_title,
+                    link,
+                    current.get('published', ''),
+                    _plain_text(current.get('summary', ''))
+                ))
+                current = None
+                element.clear()
+            elif current is not None and path and path[-1] in ENTRY_TAGS:
+                text = ''.join(element.itertext()).strip()
+                if name == 'title':
+                    current['title'] = ' '.join(text.split())
+                elif name == 'link':
+                    href = element.get('href')
+                    if href and element.get('rel', 'alternate') == 'alternate':
+                        current['link'] = href
+                    elif text:
+                        current.setdefault('link', text)
+                elif name in ('guid', 'id'):
+                    current['id'] = text
+                elif name in ('pubDate', 'published', 'updated', 'date'):
+                    current.setdefault('published', text)
+                elif name in ('description', 'summary', 'content', 'encoded'):
+                    current.setdefault('summary', text)
+            elif name == 'title' and path and path[-1] in FEED_TAGS and not title:
+                title = ' '.join((element.text or '').split())
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        handle_events()
+    parser.close()
+    handle_events()
+    return title, entries
+
+
+def feed_page(sections: List[Tuple[str, str, List[FeedEntry], str]]) -> Tuple[List[Tuple], List[Dict]]:
+    """
+    Lay out feed entries as page content, numbering entry links like page links
+    
+    Args:
+        sections: (feed title, feed URL, entries, note) per feed
+    
+    Returns:
+        Tuple of (text_content, links) in HTMLParser's format
+    """
+    content: List[Tuple] = []
+    links: List[Dict] = []
+    for title, url, entries, note in sections:
+        content.append(('heading', title or url, 2))
+        for entry in entries:
+            label = entry.title + (f"  ({entry.published})" if entry.published else "")
+            if entry.link:
+                links.append({'index': len(links) + 1, 'url': entry.link, 'text': entry.title})
+                content.append(('link', label, len(links)))
+            else:
+                content.append(('text', label, 0))
+            if entry.summary:
+                content.append(('text', f"    {entry.summary}", 0))
+        if note:
+            content.append(('text', note, 0))
+        content.append(('newline', '', 0))
+    return content, links
+
+
+def feed_view(content: str, url: str) -> Tuple[str, List[Dict], List[Tuple]]:
+    """
+    Render-ready view of a feed document opened as a page
+    
+    Args:
+        content: Feed XML
+        url: Feed URL
+    
+    Returns:
+        Tuple of (title, links, text_content)
+    """
+    title, entries = parse_feed([content], url)
+    text_content, links = feed_page([(
+        title, url, entries, f"{len(entries)} entries. Type 'feeds add' to subscribe."
+    )])
+    return title or url, links, text_content
+
+
+class FeedReader:
+    """Subscriptions, stored validators and seen entries"""
+    
+    MAX_SEEN = 1000  # Entry ids remembered per feed
+    MAX_NEW = 20  # New entries shown per feed per refresh
+    
+    def __init__(self, path: str = None, workers: int = 8, fetcher: WebFetcher = None):
+        """
+        Args:
+            path: State file (default: feeds.json in the state directory)
+            workers: Feeds refreshed concurrently
+            fetcher: Fetcher to use (default: a pooled one of its own)
+        """
+        self.path = path or state_path('feeds.json')
+        self.workers = workers
+        self.fetcher = fetcher or WebFetcher(pool_size=workers)
+        self.feeds: Dict[str, Dict] = {}
+        self.read_only = False  # Set when the state file exists but can't be read
+        self.load()
+    
+    def load(self):
+        """
+        Read subscriptions from disk
+        
+        An unreadable or damaged file leaves no subscriptions (with a
+        warning). A damaged one is kept as feeds.json.bad; one that can't be
+        read makes this reader read-only, so neither is overwritten by a save.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            if not isinstance(state, dict) or not isinstance(state.get('feeds', {}), dict):
+                raise ValueError("not a feeds file")
+        except OSError as e:
+            print(f"⚠️  Couldn't read {self.path} ({e.strerror or e}); "
+                  f"starting with no feeds, and changes won't be saved")
+            self.read_only = True
+            return
+        except ValueError as e:
+            print(f"⚠️  {self.path} is damaged ({e}); starting with no feeds")
+            try:
+                os.replace(self.path, self.path + '.bad')
+            except OSError:
+                pass
+            return
+        self.feeds = state.get('feeds', {})
+    
+    def save(self):
+        """Write subscriptions atomically (unless read_only)"""
+        if self.read_only:
+            return
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'feeds': self.feeds}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+    
+    def urls(self) -> List[str]:
+        """Subscribed feed URLs in subscription order"""
+        return list(self.feeds)
+    
+    def fetch(self, url: str, etag: str = None,
+              last_modified: str = None) -> Tuple[Optional[str], int, str, List[FeedEntry], Dict]:
+        """
+        Conditionally fetch and stream-parse one feed
+        
+        Returns:
+            Tuple of (error or None, status_code, title, entries, response_headers)
+        """
+        request_headers = {}
+        if etag:
+            request_headers['If-None-Match'] = etag
+        if last_modified:
+            request_headers['If-Modified-Since'] = last_modified
+        success, body, final_url, status_code, headers = self.fetcher.fetch_stream(url, request_headers or None)
+        if not success:
+            return body, status_code, "", [], headers
+        if status_code == 304:
+            return None, 304, "", [], headers
+        try:
+            title, entries = parse_feed(body, final_url)
+        except Exception as e:
+            return f"Not a valid feed: {str(e)}", status_code, "", [], headers
+        return None, status_code, title, entries, headers
+    
+    def subscribe(self, url: str) -> Tuple[bool, str]:
+        """
+        Add a feed; its current entries count as already seen
+        
+        Args:
+            url: Feed URL
+        
+        Returns:
+            Tuple of (success, feed title or error message)
+        """
+        url = self.fetcher.normalize_url(url)
+        error, status_code, title, entries, headers = self.fetch(url)
+        if error:
+            return False, error
+        self.feeds[url] = {
+            'title': title or url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'seen': [entry.id for entry in entries][:self.MAX_SEEN],
+            'checked': time.time(),
+        }
+        self.save()
+        return True, title or url
+    
+    def unsubscribe(self, url: str) -> bool:
+        """Remove a feed"""
+        if self.feeds.pop(url, None) is None:
+            return False
+        self.save()
+        return True
+    
+    def refresh(self) -> List[Tuple[str, str, List[FeedEntry], str]]:
+        """
+        Refresh every feed concurrently and collect unseen entries
+        
+        Returns:
+            (feed title, feed URL, new entries, note) for each feed with news or errors
+        """
+        urls = self.urls()
+        if not urls:
+            return []
+        from concurrent.futures import ThreadPoolExecutor  # Not at import time: it pulls in logging
+        
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as pool:
+            results = list(pool.map(
+                lambda url: self.fetch(url, self.feeds[url].get('etag'), self.feeds[url].get('last_modified')),
+                urls
+            ))
+        
+        sections = []
+        for url, (error, status_code, title, entries, headers) in zip(urls, results):
+            state = self.feeds[url]
+            state['checked'] = time.time()
+            if error:
+                sections.append((state['title'], url, [], f"❌ {error}"))
+                continue
+            if status_code == 304:
+                continue
+            state['etag'] = headers.get('ETag')
+            state['last_modified'] = headers.get('Last-Modified')
+            state['title'] = title or state['title']
+            
+            seen = set(state['seen'])
+            new = [entry for entry in entries if entry.id not in seen]
+            if not new:
+                continue
+            state['seen'] = ([entry.id for entry in new] + state['seen'])[:self.MAX_SEEN]
+            note = f"… and {len(new) - self.MAX_NEW} more" if len(new) > self.MAX_NEW else ""
+            sections.append((state['title'], url, new[:self.MAX_NEW], note))
+        self.save()
+        return sections
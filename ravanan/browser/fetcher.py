@@ -2,23 +2,255 @@
 HTTP Fetcher Module
 Handles fetching web pages with error handling and redirects
 """
-import requests
-from typing import Optional, Tuple
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
+from ..utils.dns import DNS_CACHE
+from ..utils.health import HOST_HEALTH, CircuitOpenError, HostHealth
+
+# Gateway answers that mean "try again", retried like network errors
+RETRY_STATUSES = (502, 503, 504)
+
+# application/* types that are text, not files to save
+TEXT_APPLICATION_TYPES = frozenset((
+    'application/json', 'application/xml', 'application/xhtml+xml', 'application/javascript',
+    'application/ecmascript', 'application/x-javascript',
+))
+
+# Called with every new requests Session; session tracing and replay mount their hooks here
+SESSION_HOOKS = []
+
+# Seconds a speculative connection may take to open
+PRECONNECT_TIMEOUT = 5.0
+
+
+def is_binary_type(mime: str) -> bool:
+    """Whether a bare, lowercase MIME type is a file to download rather than a page"""
+    if not mime or mime.startswith('text/') or mime.endswith(('+xml', '+json')):
+        return False
+    return mime not in TEXT_APPLICATION_TYPES
+
+
+def is_binary_response(headers: Dict) -> bool:
+    """Whether response headers describe a download (attachment or non-text type)"""
+    if headers.get('Content-Disposition', '').lower().startswith('attachment'):
+        return True
+    return is_binary_type(headers.get('Content-Type', '').split(';', 1)[0].strip().lower())
+
 
 class WebFetcher:
-    """Fetches web content via HTTP/HTTPS"""
+    """
+    Fetches web content via HTTP/HTTPS
+    
+    Every request goes through per-host health tracking: timeouts adapt to
+    the host's observed latency (`timeout` is the ceiling and the total
+    budget per call), network and gateway errors are retried with jittered
+    exponential backoff, a GET still waiting past the host's p95 is hedged
+    with a second copy, and hosts that keep failing are refused fast by a
+    circuit breaker.
+    """
     
-    def __init__(self, timeout: int = 10, user_agent: str = None):
+    def __init__(self, timeout: int = 10, user_agent: str = None, pool_size: int = None,
+                 shared_cache: bool = True, retries: int = 2, health: HostHealth = None):
         self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = 0.25
+        self.backoff_cap = 2.0
+        self.health = health or HOST_HEALTH
+        self._hedge_pool = None
+        # Called as on_binary(url, chunks, headers) for non-HTML responses to plain fetches
+        self.on_binary = None
+        self.pool_size = pool_size
+        self.use_shared_cache = shared_cache
+        self._shared_cache = None
         self.user_agent = user_agent or (
             "TermLynx/1.0 (Text-based Browser; +https://github.com/yourusername/termlynx)"
         )
-        self.session = requests.Session()
-        self.session.headers.update({
+        self._session = None
+        self._session_lock = threading.Lock()
+        # Speculative connections: opened, later carried a request, or couldn't be opened
+        self.preconnects = {'opened': 0, 'used': 0, 'failed': 0}
+        self._preconnect_lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """
+        HTTP session, created on first use
+        
+        Importing requests and building a Session costs more than the rest
+        of startup combined, so it is deferred until a page is fetched.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self):
+        """Build the requests Session used for all fetches"""
+        import requests
+        DNS_CACHE.install()
+        session = requests.Session()
+        session.headers.update({
             'User-Agent': self.user_agent
         })
+        if self.pool_size:
+            # Keep enough keep-alive connections per host for concurrent callers
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        for hook in SESSION_HOOKS:
+            hook(session)
+        return session
+    
+    @property
+    def shared_cache(self):
+        """
+        Client for the ravanan-cached daemon, or None if it is disabled
+        
+        The client itself reports the daemon as unavailable (and plain
+        fetches go direct) whenever it isn't running.
+        """
+        if self._shared_cache is None and self.use_shared_cache:
+            from .cached import CacheClient, default_address
+            address = default_address()
+            if address is None:
+                self.use_shared_cache = False
+                return None
+            self._shared_cache = CacheClient(address)
+        return self._shared_cache
+    
+    def close(self):
+        """Close pooled connections (a new session is created on next fetch)"""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _request(self, method: str, url: str, stream: bool = False, headers: Dict[str, str] = None,
+                 defer_body: Callable = None):
+        """
+        Send an idempotent request with adaptive timeout, retries, hedging and circuit breaking
+        
+        Args:
+            method: 'GET' or 'HEAD'
+            url: Absolute URL
+            stream: Leave the body unread (the caller must close the response)
+            headers: Extra request headers
+            defer_body: Predicate on the response; when true the body is left unread as with stream
+        
+        Returns:
+            requests Response (the last one, if every attempt got a gateway error)
+        
+        Raises:
+            CircuitOpenError: If the host is being refused
+            requests.exceptions.RequestException: If the last attempt failed
+        """
+        import requests
+        
+        host = urlparse(url).netloc
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        while True:
+            self.health.allow(host)
+            timeout = min(self.health.timeout_for(host, self.timeout), max(deadline - time.monotonic(), 0.5))
+            try:
+                hedge_delay = self.health.hedge_delay(host) if method == 'GET' else None
+                if hedge_delay is not None and hedge_delay < timeout:
+                    response = self._hedged(host, hedge_delay, method, url, timeout, headers)
+                else:
+                    response = self._send(method, url, timeout, headers)
+                if not stream and not (defer_body and defer_body(response)):
+                    response.content  # Read the body now, so read timeouts are retried too
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                self.health.record_failure(host)
+                if not self._backoff(host, attempt, deadline):
+                    raise
+            except BaseException:
+                # Not a sign of host health (e.g. a redirect loop, a bad URL, Ctrl-C)
+                self.health.release(host)
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.health.record_success(host, response.elapsed.total_seconds())
+                    return response
+                self.health.record_failure(host)
+                if not self._backoff(host, attempt, deadline):
+                    return response
+                response.close()
+            attempt += 1
+    
+    def _send(self, method: str, url: str, timeout: float, headers: Dict[str, str] = None):
+        """One request with the body left on the wire"""
+        return self.session.request(method, url, headers=headers, timeout=timeout,
+                                    allow_redirects=True, stream=True)
+    
+    def _backoff(self, host: str, attempt: int, deadline: float) -> bool:
+        """
+        Sleep before the next attempt, if one is allowed
+        
+        Returns:
+            False when retries, the time budget or the host's circuit say to give up
+        """
+        if attempt >= self.retries or self.health.is_open(host):
+            return False
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if time.monotonic() + delay >= deadline:
+            return False
+        self.health.record_retry(host)
+        time.sleep(delay)
+        return True
+    
+    def _hedged(self, host: str, delay: float, method: str, url: str, timeout: float,
+                headers: Dict[str, str] = None):
+        """
+        Send a request and, if no response has arrived after `delay`, a second copy
+        
+        The first response to arrive wins; the other is closed when it completes.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+        from concurrent.futures import TimeoutError as FutureTimeout
+        from concurrent.futures import wait
+        
+        if self._hedge_pool is None:
+            with self._session_lock:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(max_workers=2 * (self.pool_size or 4),
+                                                          thread_name_prefix='ravanan-hedge')
+        first = self._hedge_pool.submit(self._send, method, url, timeout, headers)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        second = self._hedge_pool.submit(self._send, method, url, timeout, headers)
+        
+        pending = {first, second}
+        error = None
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                elif winner is None:
+                    winner = future
+                else:
+                    future.result().close()
+        if winner is None:
+            self.health.record_hedge(host, won=False)
+            raise error
+        for future in pending:
+            future.add_done_callback(_close_response)
+        self.health.record_hedge(host, won=winner is second)
+        return winner.result()
     
     def fetch(self, url: str) -> Tuple[bool, str, str, int]:
         """
@@ -30,41 +262,236 @@ class WebFetcher:
         Returns:
             Tuple of (success, content/error_message, final_url, status_code)
         """
+        success, content, final_url, status_code, headers = self.fetch_with_headers(url)
+        return success, content, final_url, status_code
+    
+    def fetch_with_headers(self, url: str, request_headers: Dict[str, str] = None) -> Tuple[bool, str, str, int, Dict]:
+        """
+        Fetch a URL, sending extra request headers and returning response headers
+        
+        A 304 Not Modified answer to a conditional request counts as success
+        with empty content. When `on_binary` is set, a plain fetch that turns
+        out to be a file (see is_binary_response) is handed to it unread and
+        also returns success with empty content.
+        
+        Args:
+            url: The URL to fetch
+            request_headers: Extra headers (e.g. If-None-Match)
+            
+        Returns:
+            Tuple of (success, content/error_message, final_url, status_code, response_headers)
+        """
+        url = self.normalize_url(url)
+        if url.startswith('file:'):
+            from .local import fetch_local
+            return fetch_local(url)
+        
+        hand_off = self.on_binary if request_headers is None else None
+        
+        # Plain GETs go through the shared cache daemon when one is running
+        # (but not ones that look like files, so they can stream to disk)
+        if request_headers is None and self.shared_cache is not None and not (hand_off and self._looks_binary(url)):
+            shared = self.shared_cache.fetch(url)
+            if shared is not None:
+                return shared
+        
         try:
-            # Ensure URL has a scheme
-            if not urlparse(url).scheme:
-                url = 'https://' + url
+            binary = (lambda r: r.status_code == 200 and is_binary_response(r.headers)) if hand_off else None
+            response = self._request('GET', url, headers=request_headers, defer_body=binary)
+            headers = response.headers
             
-            response = self.session.get(
-                url,
-                timeout=self.timeout,
-                allow_redirects=True
-            )
+            if binary and binary(response):
+                hand_off(response.url, self._iter_body(response, 256 * 1024), headers)
+                return True, "", response.url, response.status_code, headers
             
             # Check if request was successful
             if response.status_code == 200:
-                return True, response.text, response.url, response.status_code
-            elif response.status_code == 404:
-                return False, "Error 404: Page not found", url, 404
-            elif response.status_code == 403:
-                return False, "Error 403: Access forbidden", url, 403
-            elif response.status_code == 500:
-                return False, "Error 500: Internal server error", url, 500
+                return True, response.text, response.url, response.status_code, headers
+            elif response.status_code == 304:
+                return True, "", response.url, 304, headers
             else:
-                return False, f"Error {response.status_code}: {response.reason}", url, response.status_code
+                return False, self._status_error(response), url, response.status_code, headers
                 
-        except requests.exceptions.Timeout:
-            return False, f"Error: Request timed out after {self.timeout} seconds", url, 0
-        except requests.exceptions.ConnectionError:
-            return False, "Error: Could not connect to server. Check your internet connection.", url, 0
-        except requests.exceptions.TooManyRedirects:
-            return False, "Error: Too many redirects", url, 0
-        except requests.exceptions.InvalidURL:
-            return False, "Error: Invalid URL format", url, 0
-        except requests.exceptions.RequestException as e:
-            return False, f"Error: {str(e)}", url, 0
         except Exception as e:
-            return False, f"Unexpected error: {str(e)}", url, 0
+            return False, self._exception_error(e), url, 0, {}
+    
+    def _looks_binary(self, url: str) -> bool:
+        """Guess from the URL's extension whether it is a file download"""
+        import mimetypes
+        guessed, encoding = mimetypes.guess_type(urlparse(url).path)
+        return encoding is not None or (guessed is not None and is_binary_type(guessed))
+    
+    def _status_error(self, response) -> str:
+        """Error message for an unsuccessful HTTP status"""
+        messages = {
+            404: "Error 404: Page not found",
+            403: "Error 403: Access forbidden",
+            500: "Error 500: Internal server error",
+        }
+        return messages.get(response.status_code, f"Error {response.status_code}: {response.reason}")
+    
+    def _exception_error(self, error: Exception) -> str:
+        """Error message for an exception raised while fetching"""
+        import requests
+        
+        if isinstance(error, CircuitOpenError):
+            return f"Error: {error} (too many recent failures)"
+        if isinstance(error, requests.exceptions.Timeout):
+            return "Error: Request timed out"
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return "Error: Could not connect to server. Check your internet connection."
+        if isinstance(error, requests.exceptions.TooManyRedirects):
+            return "Error: Too many redirects"
+        if isinstance(error, requests.exceptions.InvalidURL):
+            return "Error: Invalid URL format"
+        if isinstance(error, requests.exceptions.RequestException):
+            return f"Error: {str(error)}"
+        return f"Unexpected error: {str(error)}"
+    
+    def fetch_conditional(self, url: str, etag: str = None,
+                          last_modified: str = None) -> Tuple[bool, str, str, int, Dict]:
+        """
+        Conditional GET using validators from a previous response
+        
+        Args:
+            url: The URL to fetch
+            etag: ETag from the previous response
+            last_modified: Last-Modified from the previous response
+            
+        Returns:
+            Same as fetch_with_headers; status_code 304 means unchanged
+        """
+        request_headers = {}
+        if etag:
+            request_headers['If-None-Match'] = etag
+        if last_modified:
+            request_headers['If-Modified-Since'] = last_modified
+        return self.fetch_with_headers(url, request_headers or None)
+    
+    def fetch_stream(self, url: str, request_headers: Dict[str, str] = None,
+                     chunk_size: int = 64 * 1024) -> Tuple[bool, Union[Iterator[bytes], str], str, int, Dict]:
+        """
+        Fetch a URL without buffering the body
+        
+        The body arrives as raw bytes in chunks as they are read from the
+        network; the connection is released once the iterator is exhausted
+        or closed. Network errors while iterating propagate to the caller.
+        
+        Args:
+            url: The URL to fetch
+            request_headers: Extra headers (e.g. If-None-Match, Range)
+            chunk_size: Bytes per chunk
+            
+        Returns:
+            Tuple of (success, chunk iterator/error_message, final_url, status_code, response_headers);
+            a 304 yields no chunks
+        """
+        if not urlparse(url).scheme:
+            url = 'https://' + url
+        
+        try:
+            response = self._request('GET', url, stream=True, headers=request_headers)
+        except Exception as e:
+            return False, self._exception_error(e), url, 0, {}
+        
+        if response.status_code in (200, 206):
+            return True, self._iter_body(response, chunk_size), response.url, response.status_code, response.headers
+        response.close()
+        if response.status_code == 304:
+            return True, iter(()), response.url, 304, response.headers
+        return False, self._status_error(response), url, response.status_code, response.headers
+    
+    def _iter_body(self, response, chunk_size: int) -> Iterator[bytes]:
+        """Yield a streamed response body, closing the response afterwards"""
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            response.close()
+    
+    def probe(self, url: str) -> Tuple[bool, str, str, int, Dict]:
+        """
+        Check that a URL resolves without downloading its body
+        
+        Sends HEAD first. Servers that reject or mishandle HEAD (any 4xx/5xx)
+        get a streamed GET whose body is never read.
+        
+        Args:
+            url: The URL to check
+        
+        Returns:
+            Tuple of (success, error_message, final_url, status_code, response_headers);
+            success means the final status is below 400
+        """
+        url = self.normalize_url(url)
+        if url.startswith('file:'):
+            from .local import url_to_path
+            if os.path.exists(url_to_path(url)):
+                return True, "", url, 200, {}
+            return False, "Error: File not found", url, 404, {}
+        
+        try:
+            response = self._request('HEAD', url)
+            response.close()
+            if response.status_code >= 400:
+                response = self._request('GET', url, stream=True)
+                response.close()
+        except Exception as e:
+            return False, self._exception_error(e), url, 0, {}
+        
+        if response.status_code >= 400:
+            return False, f"Error {response.status_code}: {response.reason}", response.url, response.status_code, response.headers
+        return True, "", response.url, response.status_code, response.headers
+    
+    def preconnect(self, origins: List[str]):
+        """
+        Open a keep-alive connection to each origin in the background
+        
+        Each origin's host is resolved (warming the DNS cache) and one
+        connection, TLS included for https, is left idle in the session's
+        pool, so the next request there skips the handshakes. Nothing is
+        requested. Origins with an idle connection already, behind a proxy
+        or refused by their circuit breaker are skipped.
+        
+        Args:
+            origins: 'scheme://host[:port]/' URLs, as from preconnect_origins()
+        """
+        for origin in origins:
+            threading.Thread(target=self._preconnect, args=(origin,),
+                             name='ravanan-preconnect', daemon=True).start()
+    
+    def _preconnect(self, origin: str):
+        """Open one pooled connection to origin (see preconnect)"""
+        import requests
+        
+        session = self.session
+        if self.health.is_open(urlparse(origin).netloc):
+            return
+        if session.trust_env and requests.utils.get_environ_proxies(origin):
+            return  # Requests there go through the proxy's pool
+        try:
+            pool = _connection_pool(session, origin)
+            if any(conn is not None for conn in list(pool.pool.queue)):
+                return  # Already connected (or preconnected)
+            conn = pool._get_conn()
+        except Exception:
+            return
+        try:
+            conn.timeout = min(self.timeout, PRECONNECT_TIMEOUT)
+            conn.connect()
+        except Exception:
+            conn.close()
+            pool._put_conn(conn)
+            self._count_preconnect('failed')
+            return
+        _watch_first_request(conn, lambda: self._count_preconnect('used'))
+        pool._put_conn(conn)
+        self._count_preconnect('opened')
+    
+    def _count_preconnect(self, outcome: str):
+        with self._preconnect_lock:
+            self.preconnects[outcome] += 1
     
     def normalize_url(self, url: str, base_url: str = None) -> str:
         """
@@ -79,9 +506,77 @@ class WebFetcher:
         """
         if base_url:
             url = urljoin(base_url, url)
+        elif not url.startswith('file:'):
+            from .local import is_local_target, path_to_url
+            if is_local_target(url):
+                return path_to_url(url)
         
         # Ensure scheme exists
         if not urlparse(url).scheme:
             url = 'https://' + url
             
         return url
+
+
+def _close_response(future):
+    """Done-callback that closes the losing response of a hedged request"""
+    if future.exception() is None:
+        future.result().close()
+
+
+def _connection_pool(session, url: str):
+    """
+    The urllib3 pool a request to url would use
+    
+    TLS settings are part of the pool key, so they are resolved the way
+    Session.request resolves them (environment CA bundles included).
+    """
+    import requests
+    adapter = session.get_adapter(url)
+    if hasattr(adapter, 'get_connection_with_tls_context'):  # requests 2.32+
+        settings = session.merge_environment_settings(url, {}, None, None, None)
+        request = requests.Request('GET', url).prepare()
+        return adapter.get_connection_with_tls_context(request, settings['verify'], {}, settings['cert'])
+    return adapter.get_connection(url)
+
+
+def _watch_first_request(conn, on_use: Callable):
+    """
+    Call on_use when a request is sent over conn's open socket
+    
+    urllib3 closes a pooled connection the server has dropped and
+    reconnects before sending, so that case doesn't count.
+    """
+    request = conn.request
+    
+    def first_request(*args, **kwargs):
+        del conn.request  # Back to the class's method
+        if conn.sock is not None:
+            on_use()
+        return request(*args, **kwargs)
+    
+    conn.request = first_request
+
+
+def preconnect_origins(links: List[Dict], page_url: str, limit: int) -> List[str]:
+    """
+    Origins most linked from a page, other than its own
+    
+    Args:
+        links: Navigator.current_links
+        page_url: URL of the page
+        limit: Most origins returned
+    
+    Returns:
+        'scheme://host[:port]/' URLs, most links first (ties in page order)
+    """
+    own = urlparse(page_url).netloc.lower()
+    counts = {}
+    for link in links:
+        parsed = urlparse(link['url'])
+        netloc = parsed.netloc.lower()
+        if parsed.scheme in ('http', 'https') and netloc and netloc != own:
+            origin = f"{parsed.scheme}://{netloc}/"
+            counts[origin] = counts.get(origin, 0) + 1
+    # Stable sort: equal counts keep first-seen order
+    return sorted(counts, key=lambda origin: -counts[origin])[:limit]
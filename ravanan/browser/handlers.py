@@ -0,0 +1,283 @@
+"""
+Content Handlers Module
+Chooses how a response is turned into page content based on its MIME type
+
+Every handler returns the same (title, links, text_content) triple as the
+HTML path, so navigation, search, save and rendering work unchanged.
+
+Created by: Krishna D
+"""
+import json
+from json.encoder import encode_basestring
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .feeds import feed_view, looks_like_feed
+from .parser import HTMLParser
+
+# Containers nested deeper than this are collapsed in JSON and XML views
+DEFAULT_DEPTH = 4
+
+PageView = Tuple[str, List[Dict], List[Tuple]]
+
+
+def _url_name(url: str) -> str:
+    """Last path segment of a URL, for titles of non-HTML documents"""
+    parts = urlsplit(url)
+    return parts.path.rstrip('/').rsplit('/', 1)[-1] or parts.netloc or url
+
+
+class ContentHandler:
+    """Base handler: subclasses set `name` and implement view()"""
+    
+    name = ''
+    # Whether the view depends only on the document (and may be shared via ravanan-cached)
+    cacheable = False
+    
+    def view(self, content: str, url: str, depth: int = DEFAULT_DEPTH) -> PageView:
+        """
+        Turn a response body into page content
+        
+        Args:
+            content: Response body
+            url: Final URL
+            depth: Nesting level beyond which structured views collapse
+        
+        Returns:
+            Tuple of (title, links, text_content)
+        """
+        raise NotImplementedError
+
+
+class HtmlHandler(ContentHandler):
+    """HTML through HTMLParser"""
+    
+    name = 'html'
+    cacheable = True
+    
+    def view(self, content: str, url: str, depth: int = DEFAULT_DEPTH) -> PageView:
+        parser = HTMLParser()
+        links, text_content = parser.parse(content, url)
+        return parser.get_page_title(), links, text_content
+
+
+class TextHandler(ContentHandler):
+    """
+    Plain text, passed through line by line
+    
+    Lines become 'plain' blocks, which the renderer writes out in batches
+    without markup, wrapping or highlighting. Only the markup parsing is
+    skipped: the whole body is still split into a block list before the
+    first line is shown, since search, save and the link table work on
+    the complete page.
+    """
+    
+    name = 'text'
+    
+    def view(self, content: str, url: str, depth: int = DEFAULT_DEPTH) -> PageView:
+        return _url_name(url), [], [('plain', line, 0) for line in content.splitlines()]
+
+
+class JsonHandler(ContentHandler):
+    """
+    Pretty-printed JSON with containers below `depth` collapsed
+    
+    json_lines() streams the text, but its lines are collected into the
+    page's block list (as for TextHandler) before anything is shown.
+    """
+    
+    name = 'json'
+    
+    def view(self, content: str, url: str, depth: int = DEFAULT_DEPTH) -> PageView:
+        try:
+            value = json.loads(content)
+        except ValueError:
+            return TEXT_HANDLER.view(content, url, depth)
+        links: List[Dict] = []
+        lines = [('plain', line, 0) for line in json_lines(value, depth, links)]
+        return f"{_url_name(url)} (JSON)", links, lines
+
+
+def _json_scalar(value) -> str:
+    """JSON text of a scalar, without going through json.dumps for the common cases"""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if isinstance(value, int):
+        return int.__repr__(value)
+    return json.dumps(value)
+
+
+def json_lines(value, max_depth: int, links: List[Dict]) -> Iterator[str]:
+    """
+    Yield pretty-printed JSON one line at a time
+    
+    Walks the value with an explicit stack, so neither the whole text nor
+    deep recursion is needed. Collapsed containers are shown as {…}/[…]
+    with their size. String values that are absolute URLs are appended to
+    links and tagged with their link number.
+    
+    Args:
+        value: Decoded JSON value
+        max_depth: Containers at this nesting level or deeper are collapsed
+        links: Receives {'index', 'url', 'text'} dicts for URL values
+    """
+    stack = [('value', None, value, 0, '')]
+    while stack:
+        kind, key, item, level, comma = stack.pop()
+        pad = '  ' * level
+        if kind == 'close':
+            yield pad + item + comma
+            continue
+        
+        prefix = pad + (encode_basestring(key) + ': ' if key is not None else '')
+        if isinstance(item, (dict, list)):
+            is_dict = isinstance(item, dict)
+            opening, closing = '{}' if is_dict else '[]'
+            if not item:
+                yield f"{prefix}{opening}{closing}{comma}"
+                continue
+            if level >= max_depth:
+                noun = 'key' if is_dict else 'item'
+                plural = '' if len(item) == 1 else 's'
+                yield f"{prefix}{opening}…{closing}{comma}  ({len(item)} {noun}{plural})"
+                continue
+            yield prefix + opening
+            stack.append(('close', None, closing, level, comma))
+            children = list(item.items()) if is_dict else [(None, child) for child in item]
+            last = len(children) - 1
+            for position in range(last, -1, -1):
+                child_key, child = children[position]
+                stack.append(('value', child_key, child, level + 1, '' if position == last else ','))
+        else:
+            line = prefix + _json_scalar(item) + comma
+            if isinstance(item, str) and item.startswith(('http://', 'https://')):
+                links.append({'index': len(links) + 1, 'url': item, 'text': key if key is not None else item})
+                line += f"  [{len(links)}]"
+            yield line
+
+
+class XmlHandler(ContentHandler):
+    """XML as an indented element tree with deep subtrees collapsed"""
+    
+    name = 'xml'
+    
+    def view(self, content: str, url: str, depth: int = DEFAULT_DEPTH) -> PageView:
+        from xml.etree.ElementTree import ParseError, fromstring
+        
+        try:
+            root = fromstring(content)
+        except (ParseError, ValueError):
+            return TEXT_HANDLER.view(content, url, depth)
+        lines = [('plain', line, 0) for line in xml_lines(root, depth)]
+        return f"{_url_name(url)} (XML)", [], lines
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def xml_lines(root, max_depth: int, text_limit: int = 200) -> Iterator[str]:
+    """
+    Yield an indented outline of an element tree
+    
+    Args:
+        root: Root element
+        max_depth: Elements at this nesting level or deeper show only a child count
+        text_limit: Maximum characters of element text shown
+    """
+    stack = [(root, 0)]
+    while stack:
+        element, level = stack.pop()
+        attributes = ''.join(f' {_local_name(name)}="{value}"' for name, value in element.attrib.items())
+        head = f"{'  ' * level}<{_local_name(element.tag)}{attributes}>"
+        children = list(element)
+        if children and level >= max_depth:
+            yield f"{head} … ({len(children)} {'child' if len(children) == 1 else 'children'})"
+            continue
+        text = ' '.join((element.text or '').split())
+        if len(text) > text_limit:
+            text = text[:text_limit] + '…'
+        yield f"{head} {text}" if text else head
+        for child in reversed(children):
+            stack.append((child, level + 1))
+
+
+class FeedHandler(ContentHandler):
+    """RSS/Atom as a list of entries"""
+    
+    name = 'feed'
+    
+    def view(self, content: str, url: str, depth: int = DEFAULT_DEPTH) -> PageView:
+        return feed_view(content, url)
+
+
+HTML_HANDLER = HtmlHandler()
+TEXT_HANDLER = TextHandler()
+JSON_HANDLER = JsonHandler()
+XML_HANDLER = XmlHandler()
+FEED_HANDLER = FeedHandler()
+
+# MIME type -> handler; register_handler() adds entries
+HANDLERS: Dict[str, ContentHandler] = {}
+
+
+def register_handler(handler: ContentHandler, *mime_types: str):
+    """
+    Use a handler for the given MIME types
+    
+    Args:
+        handler: Handler instance
+        mime_types: Lowercase MIME types without parameters
+    """
+    for mime_type in mime_types:
+        HANDLERS[mime_type] = handler
+
+
+register_handler(HTML_HANDLER, 'text/html', 'application/xhtml+xml')
+register_handler(TEXT_HANDLER, 'text/plain', 'text/markdown', 'text/csv', 'text/css',
+                 'text/javascript', 'application/javascript')
+register_handler(JSON_HANDLER, 'application/json', 'text/json')
+register_handler(XML_HANDLER, 'application/xml', 'text/xml')
+register_handler(FEED_HANDLER, 'application/rss+xml', 'application/atom+xml', 'application/rdf+xml')
+
+
+def mime_type(content_type: Optional[str]) -> str:
+    """Bare lowercase MIME type from a Content-Type header value"""
+    return (content_type or '').split(';', 1)[0].strip().lower()
+
+
+def handler_for(content_type: Optional[str], content: str) -> ContentHandler:
+    """
+    Pick the handler for a response
+    
+    Exact MIME matches win, then +json/+xml suffixes and other text/*
+    types. Unknown or missing types are treated as HTML, as before, and
+    anything HTML- or XML-typed that is really a feed goes to the feed view.
+    
+    Args:
+        content_type: Content-Type header value (may be None)
+        content: Response body, for sniffing
+    
+    Returns:
+        ContentHandler
+    """
+    mime = mime_type(content_type)
+    handler = HANDLERS.get(mime)
+    if handler is None:
+        if mime.endswith('+json'):
+            handler = JSON_HANDLER
+        elif mime.endswith('+xml'):
+            handler = XML_HANDLER
+        elif mime.startswith('text/'):
+            handler = TEXT_HANDLER
+        else:
+            handler = HTML_HANDLER
+    if handler in (HTML_HANDLER, XML_HANDLER) and looks_like_feed(content):
+        handler = FEED_HANDLER
+    return handler
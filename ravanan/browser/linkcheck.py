@@ -0,0 +1,318 @@
+"""
+Link Checker Module
+Verifies links on a page, or across a site, concurrently
+
+Created by: Krishna D
+"""
+import argparse
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from .fetcher import WebFetcher
+from .parser import HTMLParser
+from .crawler import CrawlScope
+from ..utils.cache import LRUCache
+from ..utils.ratelimit import HostLimiter
+from ..utils.urls import canonical_url, url_host
+
+
+class LinkResult:
+    """Outcome of checking one URL"""
+    
+    __slots__ = ('url', 'final_url', 'status_code', 'latency', 'error', 'content_type')
+    
+    def __init__(self, url: str, final_url: str, status_code: int, latency: float,
+                 error: Optional[str] = None, content_type: str = ""):
+        self.url = url
+        self.final_url = final_url
+        self.status_code = status_code
+        self.latency = latency
+        self.error = error
+        self.content_type = content_type
+    
+    @property
+    def broken(self) -> bool:
+        """Whether the link failed (network error or status >= 400)"""
+        return self.error is not None
+    
+    @property
+    def redirected(self) -> bool:
+        """Whether the link works but ends up at a different URL"""
+        return not self.broken and canonical_url(self.final_url) != canonical_url(self.url)
+
+
+class LinkReport:
+    """Results of a link check, grouped for display"""
+    
+    def __init__(self, slow_threshold: float):
+        self.slow_threshold = slow_threshold
+        self.results: Dict[str, LinkResult] = {}
+        self.sources: Dict[str, Set[str]] = {}
+        self.cached = 0
+        self.requests = 0
+        self.pages_scanned = 0
+        self.elapsed = 0.0
+    
+    def broken(self) -> List[LinkResult]:
+        """Links that failed, by URL"""
+        return sorted((r for r in self.results.values() if r.broken), key=lambda r: r.url)
+    
+    def redirected(self) -> List[LinkResult]:
+        """Working links that redirect elsewhere, by URL"""
+        return sorted((r for r in self.results.values() if r.redirected), key=lambda r: r.url)
+    
+    def slow(self) -> List[LinkResult]:
+        """Working links slower than the threshold, slowest first"""
+        return sorted(
+            (r for r in self.results.values() if not r.broken and r.latency >= self.slow_threshold),
+            key=lambda r: -r.latency
+        )
+    
+    def format_lines(self, limit: int = 50) -> List[str]:
+        """
+        Report as printable lines
+        
+        Args:
+            limit: Maximum entries listed per group
+        """
+        lines = [
+            f"Checked {len(self.results)} unique link(s) on {self.pages_scanned} page(s) "
+            f"in {self.elapsed:.1f}s ({self.requests} requests, {self.cached} from cache)"
+        ]
+        groups = [
+            ("❌ BROKEN", self.broken(), lambda r: r.error),
+            ("↪️  REDIRECTED", self.redirected(), lambda r: f"→ {r.final_url}"),
+            (f"🐢 SLOW (>= {self.slow_threshold:g}s)", self.slow(), lambda r: ""),
+        ]
+        for title, results, detail in groups:
+            if not results:
+                continue
+            lines.append("-" * 70)
+            lines.append(f"{title}: {len(results)}")
+            for result in results[:limit]:
+                lines.append(f"  {result.latency * 1000:7.0f} ms  {result.url}")
+                extra = detail(result)
+                if extra:
+                    lines.append(f"              {extra}")
+                if result.broken:
+                    found_on = sorted(self.sources.get(result.url, ()))
+                    if found_on:
+                        more = f" (+{len(found_on) - 1} more)" if len(found_on) > 1 else ""
+                        lines.append(f"              found on {found_on[0]}{more}")
+            if len(results) > limit:
+                lines.append(f"  ... {len(results) - limit} more")
+        if len(lines) == 1:
+            lines.append("✅ All links OK")
+        return lines
+
+
+class LinkChecker:
+    """
+    Concurrent link checker
+    
+    Every unique URL is checked once (HEAD, falling back to GET) with at
+    most `workers` requests in flight overall and `per_host` per host.
+    Results are cached per canonical URL, so re-running on the same page
+    or on pages that share navigation only re-checks expired entries.
+    """
+    
+    def __init__(self, workers: int = 16, per_host: int = 4, host_interval: float = 0.0,
+                 slow_threshold: float = 2.0, timeout: int = 10, cache: LRUCache = None,
+                 cache_ttl: float = 600):
+        """
+        Args:
+            workers: Concurrent requests overall
+            per_host: Concurrent requests per host
+            host_interval: Minimum seconds between request starts per host
+            slow_threshold: Seconds after which a working link counts as slow
+            timeout: Per-request timeout in seconds
+            cache: Result cache to share between runs (created if omitted)
+            cache_ttl: Seconds a cached result stays valid when creating the cache
+        """
+        self.workers = workers
+        self.slow_threshold = slow_threshold
+        self.fetcher = WebFetcher(timeout=timeout, pool_size=max(10, workers))
+        self.limiter = HostLimiter(per_host, host_interval)
+        self.cache = cache if cache is not None else LRUCache(10000, cache_ttl)
+    
+    def _probe(self, url: str) -> LinkResult:
+        """Check one URL (runs on a worker thread)"""
+        with self.limiter.limit(url_host(url)):
+            started = time.perf_counter()
+            success, error, final_url, status_code, headers = self.fetcher.probe(url)
+            latency = time.perf_counter() - started
+        return LinkResult(url, final_url, status_code, latency, None if success else error,
+                          headers.get('Content-Type', ''))
+    
+    def _scan(self, url: str) -> Tuple[LinkResult, List[str]]:
+        """Fetch an in-scope page, record it as a result and return its links"""
+        with self.limiter.limit(url_host(url)):
+            started = time.perf_counter()
+            success, content, final_url, status_code, headers = self.fetcher.fetch_with_headers(url)
+            latency = time.perf_counter() - started
+        content_type = headers.get('Content-Type', '')
+        result = LinkResult(url, final_url, status_code, latency, None if success else content, content_type)
+        if not success or 'html' not in content_type.lower():
+            return result, []
+        links, _ = HTMLParser().parse(content, final_url)
+        return result, [link['url'] for link in links]
+    
+    def run(self, page_url: str, links: Iterable[str], recursive: bool = False,
+            max_pages: int = 200, scope: CrawlScope = None,
+            progress: Callable[[LinkReport, int], None] = None,
+            progress_interval: float = 2.0) -> LinkReport:
+        """
+        Check links found on a page, optionally following the site
+        
+        Args:
+            page_url: Page the links came from
+            links: Absolute link URLs on that page
+            recursive: Also scan in-scope pages and check their links
+            max_pages: Pages scanned at most in recursive mode
+            scope: Which URLs count as part of the site (default: page's host)
+            progress: Called as progress(report, queued) while running
+            progress_interval: Seconds between progress calls
+        
+        Returns:
+            LinkReport
+        """
+        report = LinkReport(self.slow_threshold)
+        report.pages_scanned = 1
+        start_page = canonical_url(page_url)
+        scope = scope or CrawlScope([start_page])
+        scanned = {start_page}
+        queued: Set[str] = set()
+        by_host: 'OrderedDict[str, deque]' = OrderedDict()
+        
+        def needs_scan(url: str) -> bool:
+            return recursive and url not in scanned and len(scanned) < max_pages and scope.allows(url)
+        
+        def enqueue(url: str, source: str):
+            if urlsplit(url).scheme not in ('http', 'https'):
+                return
+            key = canonical_url(url)
+            report.sources.setdefault(key, set()).add(source)
+            if key in queued:
+                return
+            queued.add(key)
+            cached = None if needs_scan(key) else self.cache.get(key)
+            if cached is not None:
+                report.results[key] = cached
+                report.cached += 1
+                return
+            by_host.setdefault(url_host(key), deque()).append(key)
+        
+        def next_url() -> str:
+            # Round-robin across hosts so one busy host can't occupy every worker
+            host, urls = next(iter(by_host.items()))
+            url = urls.popleft()
+            del by_host[host]
+            if urls:
+                by_host[host] = urls
+            return url
+        
+        for link in links:
+            enqueue(link, start_page)
+        
+        started = time.monotonic()
+        last_progress = started
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while by_host or futures:
+                    while by_host and len(futures) < self.workers * 2:
+                        url = next_url()
+                        if needs_scan(url):
+                            scanned.add(url)
+                            futures[pool.submit(self._scan, url)] = url
+                        else:
+                            futures[pool.submit(self._probe, url)] = url
+                    
+                    done, _ = wait(futures, timeout=progress_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = futures.pop(future)
+                        report.requests += 1
+                        try:
+                            outcome = future.result()
+                        except Exception as e:
+                            outcome = LinkResult(url, url, 0, 0.0, f"Unexpected error: {str(e)}")
+                        if isinstance(outcome, tuple):
+                            result, found = outcome
+                            report.pages_scanned += 1
+                            for link in found:
+                                enqueue(link, url)
+                        else:
+                            result = outcome
+                        report.results[url] = result
+                        self.cache.put(url, result)
+                    
+                    now = time.monotonic()
+                    if progress and now - last_progress >= progress_interval:
+                        last_progress = now
+                        progress(report, sum(len(urls) for urls in by_host.values()) + len(futures))
+            except KeyboardInterrupt:
+                # Don't make the caller wait for queued checks
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        report.elapsed = time.monotonic() - started
+        return report
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point for `ravanan check-links`
+    
+    Args:
+        argv: Arguments after 'check-links'
+    
+    Returns:
+        Process exit status (1 if any link is broken)
+    """
+    parser = argparse.ArgumentParser(
+        prog='ravanan check-links',
+        description='Check every link on a page, or across a site, for errors, redirects and slow responses'
+    )
+    parser.add_argument('url', help='Page to check')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Follow links within the site')
+    parser.add_argument('--scope', choices=['host', 'prefix', 'domain'], default='host',
+                        help='Which pages to follow with --recursive (default: host)')
+    parser.add_argument('--max-pages', type=int, default=200, help='Pages scanned with --recursive (default: 200)')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent requests (default: 16)')
+    parser.add_argument('--per-host', type=int, default=4, help='Concurrent requests per host (default: 4)')
+    parser.add_argument('--host-interval', type=float, default=0.0,
+                        help='Minimum seconds between requests to one host')
+    parser.add_argument('--slow', type=float, default=2.0, help='Seconds after which a link is slow (default: 2)')
+    args = parser.parse_args(argv)
+    
+    checker = LinkChecker(args.workers, args.per_host, args.host_interval, args.slow)
+    page_url = canonical_url(checker.fetcher.normalize_url(args.url))
+    success, content, final_url, status_code = checker.fetcher.fetch(page_url)
+    if not success:
+        print(f"❌ {page_url}: {content}")
+        return 1
+    links, _ = HTMLParser().parse(content, final_url)
+    
+    def progress(report, queued):
+        print(f"🔗 {len(report.results)} checked, {queued} queued, {report.pages_scanned} page(s) scanned")
+    
+    report = checker.run(
+        final_url,
+        [link['url'] for link in links],
+        recursive=args.recursive,
+        max_pages=args.max_pages,
+        scope=CrawlScope([canonical_url(final_url)], args.scope),
+        progress=progress
+    )
+    checker.fetcher.close()
+    print("\n".join(report.format_lines()))
+    return 1 if report.broken() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Local Files Module
+Opens file:// URLs, plain paths and directories as pages
+
+Large files are memory-mapped and decoded straight from the mapping, so
+the only full-size copy in memory is the text handed to the parser.
+
+Created by: Krishna D
+"""
+import html
+import os
+import re
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+from .fetcher import is_binary_type
+
+# Files at least this large are read through mmap
+MMAP_THRESHOLD = 1024 * 1024
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+_BOMS = ((b'\xef\xbb\xbf', 'utf-8-sig'), (b'\xff\xfe', 'utf-16'), (b'\xfe\xff', 'utf-16'))
+
+
+def is_local_target(target: str) -> bool:
+    """
+    Whether user input names a local file rather than a web address
+    
+    file: URLs, absolute or ./ ../ ~ paths, Windows drive paths and any
+    scheme-less name that exists on disk count as local.
+    """
+    if target.startswith('file:'):
+        return True
+    if re.match(r'^[A-Za-z]:[\\/]', target):
+        return True
+    if '://' in target:
+        return False
+    if target.startswith(('/', './', '../', '~', '.\\', '..\\')) or target in ('.', '..'):
+        return True
+    return os.path.exists(target)
+
+
+def path_to_url(path: str) -> str:
+    """Absolute file:// URL for a path (directories end with '/')"""
+    path = os.path.abspath(os.path.expanduser(path))
+    url_path = path.replace(os.sep, '/')
+    if not url_path.startswith('/'):
+        url_path = '/' + url_path  # Windows drive
+    if os.path.isdir(path) and not url_path.endswith('/'):
+        url_path += '/'
+    return 'file://' + quote(url_path, safe="/:~!$&'()*+,;=@")
+
+
+def url_to_path(url: str) -> str:
+    """Filesystem path of a file:// URL"""
+    path = unquote(urlsplit(url).path)
+    if re.match(r'^/[A-Za-z]:', path):
+        path = path[1:]  # /C:/... on Windows
+    return os.path.normpath(path) if path else os.sep
+
+
+def sniff_encoding(head: bytes) -> str:
+    """Encoding from a byte-order mark or <meta charset>, defaulting to UTF-8"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _CHARSET_RE.search(head)
+    if match:
+        import codecs
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def decode_document(data) -> str:
+    """
+    Decode bytes or any buffer (e.g. an mmap) into text
+    
+    str() reads the buffer directly, so no intermediate bytes copy is made.
+    """
+    return str(memoryview(data), sniff_encoding(bytes(data[:4096])), 'replace')
+
+
+def read_text_file(path: str) -> str:
+    """
+    Read and decode a local file, memory-mapping large ones
+    
+    Args:
+        path: File path
+    
+    Returns:
+        Decoded text
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return decode_document(f.read())
+        import mmap
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_document(mapped)
+
+
+def local_content_type(path: str) -> Optional[str]:
+    """
+    MIME type of a local file from its extension, sniffing unknown ones
+    
+    Returns:
+        MIME type, or None for a file that looks binary
+    """
+    import mimetypes
+    
+    guessed, encoding = mimetypes.guess_type(path)
+    if encoding is None and guessed and not is_binary_type(guessed):
+        return guessed
+    if guessed or encoding:
+        return None
+    with open(path, 'rb') as f:
+        head = f.read(1024)
+    if b'\0' in head:
+        return None
+    return 'text/html' if head.lstrip().startswith(b'<') else 'text/plain'
+
+
+def directory_listing(path: str) -> str:
+    """
+    HTML index of a directory: parent, then subdirectories, then files
+    
+    Links are relative, so they resolve against the directory's URL.
+    
+    Args:
+        path: Directory path
+    """
+    entries = []
+    with os.scandir(path) as scan:
+        for entry in scan:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            entries.append((not is_dir, entry.name.lower(), entry.name + ('/' if is_dir else '')))
+    entries.sort()
+    
+    title = html.escape(f"Index of {path}")
+    lines = [f"<html><head><title>{title}</title></head><body><h1>{title}</h1><div>"]
+    if os.path.dirname(path.rstrip(os.sep)) != path.rstrip(os.sep):
+        lines.append('<a href="../">../</a><br>')
+    for _, _, name in entries:
+        lines.append(f'<a href="{html.escape(quote(name))}">{html.escape(name)}</a><br>')
+    lines.append(f"</div><p>{len(entries)} entries</p></body></html>")
+    return '\n'.join(lines)
+
+
+def fetch_local(url: str) -> Tuple[bool, str, str, int, Dict]:
+    """
+    Load a file:// URL the way WebFetcher loads a web page
+    
+    Args:
+        url: file:// URL
+    
+    Returns:
+        Tuple of (success, content/error_message, final_url, status_code, headers)
+    """
+    path = url_to_path(url)
+    try:
+        if os.path.isdir(path):
+            return True, directory_listing(path), path_to_url(path), 200, {'Content-Type': 'text/html'}
+        if not os.path.exists(path):
+            return False, f"Error: File not found: {path}", url, 404, {}
+        content_type = local_content_type(path)
+        if content_type is None:
+            return False, f"Error: Not a text document: {path}", url, 415, {}
+        return True, read_text_file(path), url, 200, {'Content-Type': content_type}
+    except OSError as e:
+        return False, f"Error: {e.strerror or str(e)}: {path}", url, 0, {}
@@ -0,0 +1,267 @@
+"""
+Low-Bandwidth Renderer Module
+Minimal terminal output for slow links (`ravanan --lowbw`)
+
+Compared with TextRenderer this never clears the screen, draws no boxes or
+tables, emits an escape sequence only where the style actually changes,
+and re-sends only the lines that differ from the previous page. Nothing
+here imports rich.
+
+Created by: Krishna D
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .renderer import _CONTROL_CHARS, TextRenderer
+from ..utils.memory import format_bytes
+
+# SGR parameters for the style words the renderer uses
+_SGR = {
+    'bold': '1', 'dim': '2', 'italic': '3', 'underline': '4',
+    'red': '31', 'green': '32', 'yellow': '33', 'blue': '34', 'magenta': '35', 'cyan': '36',
+}
+
+# Unchanged runs shorter than this are re-sent rather than replaced by a marker line
+MIN_SKIP = 4
+
+Run = Tuple[str, str]  # (text, style)
+Line = Tuple[Run, ...]
+
+
+class AnsiWriter:
+    """
+    Buffers (text, style) runs and writes them with the fewest escape sequences
+    
+    Adjacent runs in the same style, including runs on different lines, share
+    one escape sequence; unstyled text needs none at all.
+    """
+    
+    def __init__(self, stream, color: bool = True):
+        """
+        Args:
+            stream: Text stream to write to
+            color: Emit escape sequences (off for pipes and NO_COLOR)
+        """
+        self.stream = stream
+        self.color = color
+        self._style = ''
+        self._parts: List[str] = []
+    
+    def _transition(self, style: str) -> str:
+        codes = ';'.join(_SGR[word] for word in style.split() if word in _SGR)
+        if not codes:
+            return '\x1b[m'
+        return f"\x1b[0;{codes}m" if self._style else f"\x1b[{codes}m"
+    
+    def write(self, text: str, style: str = ''):
+        """Append text in a style (control characters are removed)"""
+        if not text:
+            return
+        if self.color and style != self._style:
+            self._parts.append(self._transition(style))
+            self._style = style
+        self._parts.append(text.translate(_CONTROL_CHARS))
+    
+    def line(self, runs: Line = ()):
+        """Append one line made of runs, then a newline"""
+        for text, style in runs:
+            self.write(text, style)
+        self._parts.append('\n')
+    
+    def flush(self):
+        """Reset the style and write everything buffered in one call"""
+        if self._style:
+            self._parts.append('\x1b[m')
+            self._style = ''
+        if self._parts:
+            self.stream.write(''.join(self._parts))
+            self._parts = []
+        self.stream.flush()
+
+
+def _line(text: str, style: str = '') -> Line:
+    return ((text, style),)
+
+
+def page_lines(title: str, content: List[Tuple], links: List[Dict], url: str) -> List[Line]:
+    """
+    Lay out a page as lines of (text, style) runs
+    
+    Args:
+        title: Page title
+        content: Parsed content list
+        links: List of links found on page
+        url: Current URL
+    
+    Returns:
+        Lines of the frame, without the trailing status line
+    """
+    lines = [_line(title, 'bold cyan'), _line(url, 'dim'), ()]
+    for item_type, text, level in content:
+        if item_type == 'heading':
+            lines.append(())
+            lines.append(_line(f"{'#' * level} {text}", 'bold'))
+        elif item_type == 'link':
+            lines.append(_line(f"[{level}] {text}", 'blue'))
+        elif item_type in ('paragraph', 'text', 'list_item'):
+            lines.append(_line(text))
+        elif item_type == 'blockquote':
+            lines.append(_line(f"> {text}", 'italic'))
+        elif item_type == 'pre':
+            lines.extend(_line(f"  {row}", 'green') for row in text.split('\n'))
+        elif item_type == 'plain':
+            lines.extend(_line(row) for row in text.split('\n'))
+        elif item_type == 'newline':
+            lines.append(())
+        elif item_type == 'chrome':
+            lines.append(_line(f"... {text}", 'dim'))
+        elif item_type == 'partial':
+            lines.append(_line(f"! Partial page: {text}", 'bold yellow'))
+    
+    if links:
+        lines.append(())
+        lines.append(_line(f"Links ({len(links)}):", 'bold'))
+        for link in links[:20]:
+            lines.append(((f"[{link['index']}] {link['text'][:60]} ", ''), (link['url'][:80], 'dim')))
+        if len(links) > 20:
+            lines.append(_line(f"... {len(links) - 20} more ('links' lists all)", 'dim'))
+    lines.append(_line("#:link b:back f:fwd r:reload /:search h:home ?:help q:quit", 'dim'))
+    return lines
+
+
+def frame_diff(previous: Optional[List[Line]], lines: List[Line]) -> Tuple[int, int]:
+    """
+    Lines shared with the previous frame at the start and at the end
+    
+    Returns:
+        Tuple of (common_prefix, common_suffix); they never overlap
+    """
+    if not previous:
+        return 0, 0
+    limit = min(len(previous), len(lines))
+    prefix = 0
+    while prefix < limit and previous[prefix] == lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and previous[-1 - suffix] == lines[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+class LowBandwidthRenderer(TextRenderer):
+    """TextRenderer for slow links: plain lines, merged styles, and only what changed"""
+    
+    def __init__(self):
+        super().__init__()
+        self.show_banner_on_first_page = False
+        self.writer = AnsiWriter(self.output, self.output.isatty() and 'NO_COLOR' not in os.environ)
+        self._frame: Optional[List[Line]] = None
+        self.lines_sent = (0, 0)  # (sent, total) for the last page
+    
+    def forget_frame(self):
+        """Send the next page in full (the previous one is no longer on screen)"""
+        self._frame = None
+    
+    def render_page(self, title: str, content: List[Tuple], links: List[Dict], url: str):
+        """
+        Render a page, re-sending only lines that differ from the previous page
+        
+        Unchanged runs at the start or end of the page are replaced by one
+        marker line; 'clear' redraws the page in full.
+        """
+        started = self.output.bytes_written
+        lines = page_lines(title, content, links, url)
+        unchanged = self._frame == lines
+        prefix, suffix = frame_diff(self._frame, lines)
+        if prefix < MIN_SKIP:
+            prefix = 0
+        if suffix < MIN_SKIP:
+            suffix = 0
+        self._frame = lines
+        
+        writer = self.writer
+        writer.line()
+        if unchanged:
+            writer.line(_line(f"= page unchanged ({len(lines)} lines; 'clear' redraws)", 'dim'))
+        else:
+            if prefix:
+                writer.line(_line(f"= {prefix} lines unchanged above", 'dim'))
+            for line in lines[prefix:len(lines) - suffix]:
+                writer.line(line)
+            if suffix:
+                writer.line(_line(f"= {suffix} lines unchanged below ('clear' redraws)", 'dim'))
+        writer.flush()
+        
+        sent = 0 if unchanged else len(lines) - prefix - suffix
+        self.lines_sent = (sent, len(lines))
+        self.page_bytes = self.output.bytes_written - started
+        writer.line(_line(f"[{format_bytes(self.page_bytes)}, {sent}/{len(lines)} lines]", 'dim'))
+        writer.flush()
+    
+    def output_summary(self) -> str:
+        sent, total = self.lines_sent
+        return f"{super().output_summary()} (low-bandwidth: {sent} of {total} lines sent)"
+    
+    def render_error(self, error_message: str):
+        """Render an error message"""
+        self.writer.line(_line(f"Error: {error_message}", 'bold red'))
+        self.writer.flush()
+    
+    def render_loading(self, url: str):
+        """Render loading message"""
+        self.writer.line(_line(f"Loading {url}...", 'dim'))
+        self.writer.flush()
+    
+    def render_source(self, lines: List[Tuple[int, str, int]], highlight: bool = True):
+        """Render a window of page source with line numbers (never highlighted)"""
+        if not lines:
+            return
+        number_width = len(str(lines[-1][0]))
+        for number, text, remaining in lines:
+            suffix = f" ... [+{remaining} bytes]" if remaining else ""
+            self.writer.line(((f"{number:>{number_width}} ", 'dim'), (text + suffix, '')))
+        self.writer.flush()
+    
+    def render_source_matches(self, pattern: str, matches: List[Tuple[int, str]], total: int):
+        """Render search hits inside the page source, with the matches in bold"""
+        import re
+        
+        writer = self.writer
+        if not matches:
+            writer.line(_line(f"No matches for '{pattern}' in page source", 'yellow'))
+            writer.flush()
+            return
+        shown = f" (showing first {len(matches)})" if total > len(matches) else ""
+        writer.line(_line(f"{total} match(es) for '{pattern}' in page source{shown}:", 'bold'))
+        number_width = len(str(matches[-1][0]))
+        for number, snippet in matches:
+            runs = [(f"{number:>{number_width}} ", 'dim')]
+            position = 0
+            for match in re.finditer(re.escape(pattern), snippet, re.IGNORECASE):
+                runs.append((snippet[position:match.start()], ''))
+                runs.append((match.group(), 'bold yellow'))
+                position = match.end()
+            runs.append((snippet[position:], ''))
+            writer.line(tuple(runs))
+        writer.flush()
+    
+    def render_block_diff(self, url: str, changes: List[Tuple[str, Tuple]], timestamp: str = ""):
+        """Render blocks inserted into or removed from a watched page"""
+        added = sum(1 for sign, _ in changes if sign == '+')
+        stamp = f"{timestamp} " if timestamp else ""
+        self.writer.line(_line(f"{stamp}{url} +{added} -{len(changes) - added} block(s)", 'bold'))
+        for sign, (item_type, text, level) in changes:
+            if item_type == 'link':
+                text = f"[{level}] {text}"
+            self.writer.line(_line(f"{sign} {text}", 'green' if sign == '+' else 'red'))
+        self.writer.flush()
+    
+    def render_search_results(self, query: str, results: List[str]):
+        """Render search results"""
+        if not results:
+            self.writer.line(_line(f"No results found for '{query}'", 'yellow'))
+        else:
+            self.writer.line(_line(f"Found {len(results)} result(s) for '{query}':", 'bold'))
+            for result in results[:10]:
+                self.writer.line(_line(f"- {result[:100]}"))
+        self.writer.flush()
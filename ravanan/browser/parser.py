@@ -2,19 +2,172 @@
 HTML Parser Module
 Extracts text and links from HTML content
 """
-from bs4 import BeautifulSoup, Comment
-from typing import List, Dict, Tuple
+import re
+import time
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 
+_backend = None
+
+# Reader-mode scoring: containers with less text than this are not candidates
+READER_MIN_CHARS = 200
+# ...and the winner must hold at least this share of the page's non-link text
+READER_MIN_SHARE = 0.25
+
+_POSITIVE_HINTS = re.compile(r'article|body|content|entry|main|post|story|text', re.IGNORECASE)
+_NEGATIVE_HINTS = re.compile(
+    r'banner|breadcrumb|comment|cookie|consent|footer|header|menu|modal|nav|popup|promo|'
+    r'related|share|sidebar|social|sponsor|subscribe|widget', re.IGNORECASE)
+_CHROME_TAGS = frozenset(('nav', 'aside', 'footer', 'header', 'form', 'menu'))
+
+
+class ParseLimits:
+    """
+    Resource governor for HTMLParser
+    
+    When a limit trips, parsing stops (or, for depth, skips the subtree)
+    and the page ends with a 'partial' block saying which limit was hit.
+    A limit of 0 or None disables it.
+    """
+    
+    def __init__(self, max_nodes: int = 250_000, max_depth: int = 1_000,
+                 max_tokens: int = 1_000_000, time_budget: float = 5.0):
+        """
+        Args:
+            max_nodes: Elements and text nodes visited
+            max_depth: Element nesting below <body>; deeper subtrees are skipped
+            max_tokens: Approximate words of extracted text
+            time_budget: Seconds spent walking the tree
+        """
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.max_tokens = max_tokens
+        self.time_budget = time_budget
+    
+    def is_default(self) -> bool:
+        """Whether these are the stock limits (see ParseLimits())"""
+        return vars(self) == vars(ParseLimits())
+    
+    def describe(self) -> str:
+        """One-line summary, e.g. for `limits`"""
+        return (f"nodes {self.max_nodes or 'unlimited'}, depth {self.max_depth or 'unlimited'}, "
+                f"tokens {self.max_tokens or 'unlimited'}, time {self.time_budget or 'unlimited'}s")
+
+
+# Used by every HTMLParser created without explicit limits
+DEFAULT_LIMITS = ParseLimits()
+
+
+def partial_reason(blocks: List[Tuple]) -> Optional[str]:
+    """
+    Why a parsed page was truncated
+    
+    Args:
+        blocks: Parsed content
+    
+    Returns:
+        The reason from a trailing 'partial' block, or None for a complete page
+    """
+    if blocks and blocks[-1][0] == 'partial':
+        return blocks[-1][1]
+    return None
+
+
+def reader_range(blocks: List[Tuple]) -> Optional[Tuple[int, int]]:
+    """
+    Where the main content sits in a parsed page
+    
+    Args:
+        blocks: Parsed content
+    
+    Returns:
+        (start, end) slice between the ('main', '', 0) and ('main', '', 1)
+        markers, or None if the parser found no main content
+    """
+    start = end = None
+    for index, (item_type, _, level) in enumerate(blocks):
+        if item_type == 'main':
+            if level == 0:
+                start = index + 1
+            else:
+                end = index
+                break
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def reader_view(blocks: List[Tuple]) -> Optional[List[Tuple]]:
+    """
+    Only the main content of a parsed page (reader mode)
+    
+    Returns:
+        Blocks of the main content, followed by the 'partial' block of a
+        truncated page, or None if the parser found no main content
+    """
+    found = reader_range(blocks)
+    if found is None:
+        return None
+    view = blocks[found[0]:found[1]]
+    if partial_reason(blocks):
+        view.append(blocks[-1])
+    return view
+
+
+def _container_weight(element) -> float:
+    """Reader-mode multiplier from an element's tag, role, class and id"""
+    tag = element.name
+    if tag in ('article', 'main') or element.get('role') == 'main':
+        return 1.5
+    if tag in _CHROME_TAGS:
+        return 0.2
+    names = ' '.join(element.get('class') or ()) + ' ' + (element.get('id') or '')
+    if names.strip():
+        if _NEGATIVE_HINTS.search(names):
+            return 0.3
+        if _POSITIVE_HINTS.search(names):
+            return 1.25
+    return 1.0
+
+
+def _get_backend():
+    """
+    Load the BeautifulSoup backend on first use
+    
+    bs4 pulls in a large import graph, so it is only loaded once a page
+    actually needs parsing.
+    
+    Returns:
+        Tuple of (BeautifulSoup, Comment)
+    """
+    global _backend
+    if _backend is None:
+        from bs4 import BeautifulSoup, Comment
+        _backend = (BeautifulSoup, Comment)
+    return _backend
+
+
 class HTMLParser:
     """Parses HTML and extracts readable content"""
     
-    def __init__(self):
+    def __init__(self, limits: ParseLimits = None):
+        """
+        Args:
+            limits: Resource limits (default: DEFAULT_LIMITS)
+        """
+        self.limits = limits or DEFAULT_LIMITS
         self.soup = None
         self.base_url = None
+        self.title = None
         self.links = []
         self.text_content = []
+        self.partial = None  # Reason the last parse was truncated
+        self.main_range = None  # (start, end) of the main content in text_content
+        self._tokens = 0
+        self._chars = 0
+        self._link_chars = 0
+        self._main_text = 0
     
     def parse(self, html_content: str, base_url: str) -> Tuple[List[Dict], List[str]]:
         """
@@ -26,15 +179,36 @@ class HTMLParser:
             
         Returns:
             Tuple of (links_list, text_content_lines)
+        
+        The parse tree is released before returning; the page title is
+        captured during the same pass that strips scripts and styles. If a
+        limit trips, the content extracted so far is returned followed by
+        a ('partial', reason, 0) block, and self.partial holds the reason.
+        
+        The same walk scores every container for reader mode; the main
+        content, if any, is enclosed in ('main', '', 0) and ('main', '', 1)
+        marker blocks (see reader_view()).
         """
+        BeautifulSoup, Comment = _get_backend()
         self.base_url = base_url
         self.soup = BeautifulSoup(html_content, 'html.parser')
+        self.title = None
         self.links = []
         self.text_content = []
+        self.partial = None
+        self.main_range = None
+        self._tokens = 0
+        self._chars = 0
+        self._link_chars = 0
+        self._main_text = 0
         
-        # Remove script and style elements
-        for script in self.soup(['script', 'style', 'noscript']):
-            script.decompose()
+        # Remove script and style elements, picking up the title on the way
+        for element in self.soup(['title', 'script', 'style', 'noscript']):
+            if element.name == 'title':
+                if self.title is None:
+                    self.title = element.get_text(strip=True)
+            else:
+                element.decompose()
         
         # Remove comments
         for comment in self.soup.find_all(string=lambda text: isinstance(text, Comment)):
@@ -48,16 +222,117 @@ class HTMLParser:
             # If no body, parse the entire document
             self._parse_element(self.soup)
         
+        if self.main_range:
+            start, end = self.main_range
+            page_text = self._chars - self._link_chars
+            # Not worth a reader view if the winner is most of the page or a small part of it
+            if self._main_text < READER_MIN_SHARE * page_text or end - start == len(self.text_content):
+                self.main_range = None
+        if self.main_range:
+            start, end = self.main_range
+            self.text_content.insert(end, ('main', '', 1))
+            self.text_content.insert(start, ('main', '', 0))
+            self.main_range = (start + 1, end + 1)
+        if self.partial:
+            self.text_content.append(('partial', self.partial, 0))
+        
+        # Drop the tree so only the extracted content outlives the parse
+        self.soup.decompose()
+        self.soup = None
+        
         return self.links, self.text_content
     
+    def _emit(self, item_type: str, text: str, level: int, link_chars: int = 0):
+        """
+        Append a content block, counting its words against the token limit
+        
+        Args:
+            item_type: Block type
+            text: Block text
+            level: Heading level, link number or depth
+            link_chars: Characters of text that are anchor text (for reader-mode link density)
+        """
+        self.text_content.append((item_type, text, level))
+        self._tokens += text.count(' ') + 1
+        self._chars += len(text)
+        self._link_chars += len(text) if item_type == 'link' else link_chars
+    
+    @staticmethod
+    def _text_and_links(element) -> Tuple[str, int]:
+        """
+        Stripped text of an element, like get_text(strip=True), in the same
+        walk counting how much of it is anchor text
+        
+        Returns:
+            Tuple of (text, link_chars)
+        """
+        parts = []
+        link_chars = 0
+        for node in element.descendants:
+            if isinstance(node, str):
+                text = node.strip()
+                if text:
+                    parts.append(text)
+                    if node.parent.name == 'a':
+                        link_chars += len(text)
+        return ''.join(parts), link_chars
+    
     def _parse_element(self, element, depth: int = 0):
-        """Recursively parse HTML elements"""
-        for child in element.children:
+        """
+        Parse HTML elements below `element` in document order
+        
+        Uses an explicit stack of child iterators instead of recursion, so
+        nesting depth is bounded by the governor rather than Python's
+        recursion limit.
+        
+        Each container's output is a contiguous run of blocks, so when its
+        iterator is exhausted the character counters give its text and link
+        text, and it is scored for reader mode without a second pass.
+        """
+        limits = self.limits
+        max_nodes = limits.max_nodes or float('inf')
+        max_depth = limits.max_depth or float('inf')
+        max_tokens = limits.max_tokens or float('inf')
+        deadline = time.monotonic() + limits.time_budget if limits.time_budget else None
+        
+        link_schemes = ('http', 'https', 'file') if self.base_url.startswith('file:') else ('http', 'https')
+        stack = [iter(element.children)]
+        # (element, first block, chars, link chars) for each container on the stack
+        frames = [(element, 0, 0, 0)]
+        best_score = 0.0
+        nodes = 0
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                container, first, chars, link_chars = frames.pop()
+                text = self._chars - chars
+                if text >= READER_MIN_CHARS and stack:
+                    links = self._link_chars - link_chars
+                    score = (text - links) * (1 - links / text) * _container_weight(container)
+                    # Children finish first, so a wrapper scoring the same keeps the inner element
+                    if score > best_score:
+                        best_score = score
+                        self.main_range = (first, len(self.text_content))
+                        self._main_text = text - links
+                continue
+            
+            nodes += 1
+            if nodes > max_nodes:
+                self.partial = f"node limit reached ({limits.max_nodes} nodes)"
+                return
+            if self._tokens > max_tokens:
+                self.partial = f"output limit reached ({limits.max_tokens} tokens)"
+                return
+            if deadline is not None and not nodes & 255 and time.monotonic() > deadline:
+                self.partial = f"time budget exhausted ({limits.time_budget}s)"
+                return
+            
             if isinstance(child, str):
                 # Text node
                 text = child.strip()
                 if text:
-                    self.text_content.append(('text', text, depth))
+                    self._emit('text', text, depth)
             elif child.name:
                 # Element node
                 tag = child.name.lower()
@@ -67,7 +342,7 @@ class HTMLParser:
                     text = child.get_text(strip=True)
                     if text:
                         level = int(tag[1])
-                        self.text_content.append(('heading', text, level))
+                        self._emit('heading', text, level)
                 
                 # Handle links
                 elif tag == 'a':
@@ -80,8 +355,8 @@ class HTMLParser:
                             # Resolve relative URLs
                             absolute_url = urljoin(self.base_url, href)
                             
-                            # Only include http/https links
-                            if urlparse(absolute_url).scheme in ['http', 'https']:
+                            # Only include http/https links (and file links on local pages)
+                            if urlparse(absolute_url).scheme in link_schemes:
                                 link_index = len(self.links) + 1
                                 self.links.append({
                                     'index': link_index,
@@ -90,18 +365,18 @@ class HTMLParser:
                                 })
                                 
                                 if text:
-                                    self.text_content.append(('link', text, link_index))
+                                    self._emit('link', text, link_index)
                 
                 # Handle paragraphs
                 elif tag == 'p':
-                    text = child.get_text(strip=True)
+                    text, link_chars = self._text_and_links(child)
                     if text:
-                        self.text_content.append(('paragraph', text, depth))
-                    self.text_content.append(('newline', '', 0))
+                        self._emit('paragraph', text, depth, link_chars)
+                    self._emit('newline', '', 0)
                 
                 # Handle line breaks
                 elif tag == 'br':
-                    self.text_content.append(('newline', '', 0))
+                    self._emit('newline', '', 0)
                 
                 # Handle lists
                 elif tag in ['ul', 'ol']:
@@ -109,62 +384,61 @@ class HTMLParser:
                 
                 # Handle list items
                 elif tag == 'li':
-                    text = child.get_text(strip=True)
+                    text, link_chars = self._text_and_links(child)
                     if text:
-                        self.text_content.append(('list_item', text, depth))
+                        self._emit('list_item', text, depth, link_chars)
                 
                 # Handle blockquotes
                 elif tag == 'blockquote':
-                    text = child.get_text(strip=True)
+                    text, link_chars = self._text_and_links(child)
                     if text:
-                        self.text_content.append(('blockquote', text, depth))
+                        self._emit('blockquote', text, depth, link_chars)
                 
                 # Handle preformatted text
                 elif tag == 'pre':
                     text = child.get_text()  # Don't strip for pre
                     if text:
-                        self.text_content.append(('pre', text, depth))
-                
-                # Handle divs and other containers
-                elif tag in ['div', 'section', 'article', 'main', 'header', 'footer', 'nav']:
-                    self._parse_element(child, depth)
+                        self._emit('pre', text, depth)
                 
                 # Handle tables (simplified)
                 elif tag == 'table':
                     self._parse_table(child, depth)
                 
-                # Recursively parse other elements
-                else:
-                    self._parse_element(child, depth)
+                # Descend into divs, other containers and inline elements
+                elif len(stack) < max_depth:
+                    stack.append(iter(child.children))
+                    frames.append((child, len(self.text_content), self._chars, self._link_chars))
+                
+                # Too deep: skip the subtree but keep going with its siblings
+                elif not self.partial:
+                    self.partial = f"nesting limit reached ({limits.max_depth} levels)"
     
     def _parse_list(self, element, list_type: str, depth: int):
         """Parse ordered or unordered lists"""
-        self.text_content.append(('newline', '', 0))
+        self._emit('newline', '', 0)
         for item in element.find_all('li', recursive=False):
-            text = item.get_text(strip=True)
+            text, link_chars = self._text_and_links(item)
             if text:
                 prefix = '  • ' if list_type == 'ul' else '  - '
-                self.text_content.append(('list_item', f"{prefix}{text}", depth))
-        self.text_content.append(('newline', '', 0))
+                self._emit('list_item', f"{prefix}{text}", depth, link_chars)
+        self._emit('newline', '', 0)
     
     def _parse_table(self, element, depth: int):
         """Parse tables (simplified rendering)"""
-        self.text_content.append(('newline', '', 0))
-        self.text_content.append(('text', '--- TABLE ---', depth))
+        self._emit('newline', '', 0)
+        self._emit('text', '--- TABLE ---', depth)
         
         for row in element.find_all('tr'):
             cells = row.find_all(['td', 'th'])
             if cells:
                 row_text = ' | '.join(cell.get_text(strip=True) for cell in cells)
-                self.text_content.append(('text', row_text, depth))
+                self._emit('text', row_text, depth)
         
-        self.text_content.append(('text', '--- END TABLE ---', depth))
-        self.text_content.append(('newline', '', 0))
+        self._emit('text', '--- END TABLE ---', depth)
+        self._emit('newline', '', 0)
     
     def get_page_title(self) -> str:
-        """Extract page title"""
-        if self.soup:
-            title_tag = self.soup.find('title')
-            if title_tag:
-                return title_tag.get_text(strip=True)
+        """Get the title captured by the last parse"""
+        if self.title is not None:
+            return self.title
         return "Untitled Page"
@@ -4,23 +4,61 @@ Renders parsed content in the terminal with formatting
 
 Created by: Krishna D
 """
-from rich.console import Console
-from rich.text import Text
-from rich.panel import Panel
-from rich.table import Table
-from rich import box
+import sys
 from typing import List, Dict, Tuple
 from ..utils.banner import RavananBanner
+from ..utils.memory import format_bytes
+
+# C0 control characters except tab and newline, removed from pass-through text
+_CONTROL_CHARS = dict.fromkeys(c for c in range(32) if c not in (9, 10))
+_CONTROL_CHARS[127] = None
+
+
+class CountingStream:
+    """Text stream wrapper that counts the bytes written through it (as UTF-8)"""
+    
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream: Stream to write to (default: sys.stdout at the time of each write)
+        """
+        self._stream = stream
+        self.bytes_written = 0
+    
+    @property
+    def stream(self):
+        return self._stream or sys.stdout
+    
+    def write(self, text: str) -> int:
+        self.bytes_written += len(text.encode('utf-8', 'replace'))
+        return self.stream.write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
 
 
 class TextRenderer:
     """Renders parsed HTML content in terminal"""
     
-    def __init__(self):
-        self.console = Console()
-        self.width = self.console.width
+    def __init__(self, console=None):
+        self._console = console
+        self.output = CountingStream()
+        self.page_bytes = 0  # Bytes the last render_page() wrote
         self.show_banner_on_first_page = True
     
+    @property
+    def console(self):
+        """Rich console, created on first render so startup never imports rich"""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(file=self.output)
+        return self._console
+    
+    @property
+    def width(self) -> int:
+        """Current console width in columns"""
+        return self.console.width
+    
     def render_page(self, title: str, content: List[Tuple], links: List[Dict], url: str):
         """
         Render a complete page with title, content, and links
@@ -31,6 +69,7 @@ class TextRenderer:
             links: List of links found on page
             url: Current URL
         """
+        started = self.output.bytes_written
         self.console.clear()
         
         # Show banner on first page load
@@ -50,6 +89,14 @@ class TextRenderer:
         
         # Render footer with controls
         self._render_footer()
+        self.page_bytes = self.output.bytes_written - started
+    
+    def forget_frame(self):
+        """Forget what is on screen, e.g. after the screen was cleared (used by the low-bandwidth renderer)"""
+    
+    def output_summary(self) -> str:
+        """Bytes written for the current page and for the whole session, for `info`"""
+        return f"{format_bytes(self.page_bytes)} for this page, {format_bytes(self.output.bytes_written)} this session"
     
     def _render_banner(self):
         """Render the Ravanan banner with colors"""
@@ -59,6 +106,10 @@ class TextRenderer:
     
     def _render_header(self, title: str, url: str):
         """Render page header with title and URL"""
+        from rich.text import Text
+        from rich.panel import Panel
+        from rich import box
+        
         header_text = Text()
         header_text.append(f"📄 {title}\n", style="bold cyan")
         header_text.append(f"🔗 {url}", style="dim blue")
@@ -74,7 +125,19 @@ class TextRenderer:
     
     def _render_content(self, content: List[Tuple]):
         """Render main page content"""
+        from rich.panel import Panel
+        from rich import box
+        
+        plain_lines = []  # Consecutive 'plain' blocks, written out in one go
         for item_type, text, level in content:
+            if item_type == 'plain':
+                # Text/JSON/XML lines: no markup, wrapping or highlighting
+                plain_lines.append(text)
+                continue
+            if plain_lines:
+                self._write_plain(plain_lines)
+                plain_lines = []
+            
             if item_type == 'heading':
                 # Render headings with different styles based on level
                 if level == 1:
@@ -113,9 +176,35 @@ class TextRenderer:
             elif item_type == 'newline':
                 # Render newlines
                 self.console.print()
+            
+            elif item_type == 'chrome':
+                # Site navigation collapsed by SiteChrome
+                self.console.print(f"⋯ {text}", style="dim", highlight=False)
+            
+            elif item_type == 'partial':
+                # The parser stopped early (see ParseLimits)
+                self.console.print(f"\n⚠️  Partial page: {text}", style="bold yellow", highlight=False)
+        
+        if plain_lines:
+            self._write_plain(plain_lines)
+    
+    def _write_plain(self, lines: List[str]):
+        """
+        Write pass-through lines straight to the console's file
+        
+        Skips Rich's per-line segment rendering, which dominates the cost of
+        large text and JSON documents. Control characters are stripped so a
+        document cannot send escape sequences to the terminal.
+        """
+        console = self.console
+        console.file.write('\n'.join(lines).translate(_CONTROL_CHARS) + '\n')
+        console.file.flush()
     
     def _render_links(self, links: List[Dict]):
         """Render links section at the bottom"""
+        from rich.table import Table
+        from rich import box
+        
         self.console.print("\n")
         
         # Create a table for links
@@ -147,6 +236,10 @@ class TextRenderer:
     
     def _render_footer(self):
         """Render footer with available commands"""
+        from rich.text import Text
+        from rich.panel import Panel
+        from rich import box
+        
         footer_text = Text()
         footer_text.append("🔱 Ravanan Commands: ", style="bold white")
         footer_text.append("[#]", style="cyan")
@@ -174,8 +267,15 @@ class TextRenderer:
         )
         self.console.print(panel)
     
+    def render_warning(self, message: str):
+        """Report a command that couldn't run (no page loaded, wrong usage)"""
+        print(f"\n⚠️  {message}\n")
+    
     def render_error(self, error_message: str):
         """Render an error message"""
+        from rich.panel import Panel
+        from rich import box
+        
         self.console.print()
         panel = Panel(
             f"❌ {error_message}",
@@ -191,8 +291,94 @@ class TextRenderer:
         """Render loading message"""
         self.console.print(f"\n⏳ Loading {url}...", style="bold yellow")
     
+    def render_source(self, lines: List[Tuple[int, str, int]], highlight: bool = True):
+        """
+        Render a window of page source with line numbers
+        
+        Only the lines passed in are highlighted; long lines soft-wrap.
+        
+        Args:
+            lines: Consecutive (line_number, text, remaining_bytes) tuples
+            highlight: Whether to apply HTML syntax highlighting
+        """
+        if not lines:
+            return
+        
+        code = '\n'.join(
+            text + (f" … [+{remaining} bytes]" if remaining else "")
+            for _, text, remaining in lines
+        )
+        if highlight:
+            from rich.syntax import Syntax
+            self.console.print(Syntax(
+                code,
+                'html',
+                theme='monokai',
+                line_numbers=True,
+                start_line=lines[0][0],
+                word_wrap=True
+            ))
+        else:
+            number_width = len(str(lines[-1][0]))
+            for (number, _, _), text in zip(lines, code.split('\n')):
+                self.console.print(f"{number:>{number_width}} | {text}", highlight=False, markup=False)
+    
+    def render_source_matches(self, pattern: str, matches: List[Tuple[int, str]], total: int):
+        """
+        Render search hits inside the page source
+        
+        Args:
+            pattern: Text that was searched for
+            matches: (line_number, snippet) pairs
+            total: Number of matches in the whole source
+        """
+        import re
+        from rich.text import Text
+        
+        self.console.print()
+        if not matches:
+            self.console.print(f"No matches for '{pattern}' in page source", style="yellow")
+            return
+        
+        shown = f" (showing first {len(matches)})" if total > len(matches) else ""
+        self.console.print(f"{total} match(es) for '{pattern}' in page source{shown}:", style="bold green")
+        number_width = len(str(matches[-1][0]))
+        for number, snippet in matches:
+            line = Text(f"{number:>{number_width}} | ", style="dim")
+            body = Text(snippet)
+            for match in re.finditer(re.escape(pattern), snippet, re.IGNORECASE):
+                body.stylize("bold black on yellow", match.start(), match.end())
+            line.append(body)
+            self.console.print(line)
+    
+    def render_block_diff(self, url: str, changes: List[Tuple[str, Tuple]], timestamp: str = ""):
+        """
+        Render blocks inserted into or removed from a watched page
+        
+        Args:
+            url: Page that changed
+            changes: ('+' or '-', (type, text, level)) pairs in page order
+            timestamp: Time of the check, shown before the URL
+        """
+        from rich.text import Text
+        
+        added = sum(1 for sign, _ in changes if sign == '+')
+        header = Text(f"\n{timestamp} " if timestamp else "\n", style="dim")
+        header.append(f"🔔 {url}", style="bold cyan")
+        header.append(f"  +{added} -{len(changes) - added} block(s)", style="dim")
+        self.console.print(header)
+        
+        for sign, (item_type, text, level) in changes:
+            if item_type == 'link':
+                text = f"[{level}] {text}"
+            style = "green" if sign == '+' else "red"
+            self.console.print(Text(f"{sign} {text}", style=style))
+    
     def render_search_results(self, query: str, results: List[str]):
         """Render search results"""
+        from rich.panel import Panel
+        from rich import box
+        
         self.console.print()
         if results:
             panel = Panel(
@@ -0,0 +1,469 @@
+"""
+Session Replay Module
+Records interactive sessions (`ravanan --trace-session`) and replays them
+offline as a benchmark (`ravanan replay-bench`)
+
+A trace is a JSON Lines file: a 'session' header, then 'command' and
+'response' entries in the order they happened. Responses are captured by
+a hook on every requests Session, so they include redirects, HEAD checks,
+feed polls and the pages behind each command. Replay serves the recorded
+responses from a localhost stand-in that every session is routed to, runs
+the commands through a fresh Ravanan with output going to a byte counter,
+and times each command end to end.
+
+Created by: Krishna D
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from . import fetcher
+from ..utils.memory import format_bytes, peak_rss
+
+TRACE_VERSION = 1
+
+# Bodies larger than this, and binary ones, are recorded as a length only
+MAX_BODY = 8 * 1024 * 1024
+
+# Response headers worth replaying (bodies are stored decoded, so no Content-Encoding)
+KEPT_HEADERS = (
+    'Content-Type', 'Content-Disposition', 'Location', 'ETag', 'Last-Modified', 'Cache-Control',
+    'Expires', 'Retry-After', 'Accept-Ranges', 'Content-Range',
+)
+
+
+class SessionRecorder:
+    """
+    Writes a session trace as it happens
+    
+    Usage:
+        recorder = SessionRecorder('out.jsonl', lowbw=False, reader=False)
+        recorder.install()          # before any page is fetched
+        ...
+        recorder.command('3', 0.21)  # after each command
+        recorder.close()
+    """
+    
+    def __init__(self, path: str, **settings):
+        """
+        Args:
+            path: Trace file to write (replaced if it exists)
+            settings: Browser options replay should use (home, lowbw, reader)
+        """
+        self.path = path
+        self.commands = 0
+        self.responses = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({'type': 'session', 'version': TRACE_VERSION, 'started': time.time(), **settings})
+    
+    def _write(self, entry: Dict):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    
+    def install(self):
+        """Record the responses of every requests Session created from now on"""
+        fetcher.SESSION_HOOKS.append(self._hook_session)
+    
+    def _hook_session(self, session):
+        session.hooks['response'].append(self._record_response)
+    
+    def _record_response(self, response, *args, **kwargs):
+        """requests response hook: runs for every response, redirects included"""
+        headers = response.headers
+        method = response.request.method
+        entry = {
+            'type': 'response', 'method': method, 'url': response.url, 'status': response.status_code,
+            'headers': {name: headers[name] for name in KEPT_HEADERS if name in headers},
+        }
+        length = headers.get('Content-Length', '')
+        if method != 'HEAD' and response.status_code not in (204, 304):
+            if fetcher.is_binary_response(headers) or (length.isdigit() and int(length) > MAX_BODY):
+                # Never buffer downloads; replay sends filler of the same length
+                entry['length'] = int(length) if length.isdigit() else 0
+            else:
+                body = response.content
+                if len(body) > MAX_BODY:
+                    entry['length'] = len(body)
+                else:
+                    entry['body'] = base64.b64encode(body).decode('ascii')
+        self.responses += 1
+        self._write(entry)
+    
+    def command(self, command: str, seconds: float):
+        """Record a command once it has finished"""
+        self.commands += 1
+        self._write({'type': 'command', 'command': command, 'seconds': round(seconds, 6)})
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+    
+    def close(self):
+        """Finish the trace file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._hook_session in fetcher.SESSION_HOOKS:
+            fetcher.SESSION_HOOKS.remove(self._hook_session)
+
+
+def load_trace(path: str) -> Tuple[Dict, List[Dict], List[Dict]]:
+    """
+    Read a trace file
+    
+    Returns:
+        Tuple of (session settings, command entries, response entries)
+    
+    Raises:
+        ValueError: If the file is not a session trace
+    """
+    settings, commands, responses = None, [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A session killed mid-write leaves a truncated last line
+                break
+            kind = entry.get('type')
+            if kind == 'session':
+                settings = entry
+            elif kind == 'command':
+                commands.append(entry)
+            elif kind == 'response':
+                responses.append(entry)
+    if settings is None:
+        raise ValueError(f"{path} is not a session trace")
+    if settings.get('version') != TRACE_VERSION:
+        raise ValueError(f"{path} has trace version {settings.get('version')}, expected {TRACE_VERSION}")
+    return settings, commands, responses
+
+
+class ResponseTable:
+    """
+    Recorded responses by (method, URL), served in recorded order
+    
+    A URL fetched several times (reloads, feed polls) gets its recorded
+    answers in turn and the last one from then on. HEAD requests without a
+    recorded answer get the headers of the GET one.
+    """
+    
+    def __init__(self, responses: List[Dict]):
+        self._answers: Dict[Tuple[str, str], List[Tuple[int, List, bytes]]] = {}
+        for entry in responses:
+            if 'body' in entry:
+                body = base64.b64decode(entry['body'])
+            else:
+                body = b'\0' * min(entry.get('length', 0), MAX_BODY)
+            answer = (entry['status'], sorted(entry.get('headers', {}).items()), body)
+            answers = self._answers.setdefault((entry['method'], entry['url']), [])
+            # Hedged requests record the same answer twice in a row
+            if not answers or answers[-1] != answer:
+                answers.append(answer)
+        self._served: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.misses = 0
+    
+    def reset(self):
+        """Start serving every URL from its first recorded answer again"""
+        with self._lock:
+            self._served.clear()
+            self.misses = 0
+    
+    def answer(self, method: str, url: str) -> Optional[Tuple[int, List, bytes]]:
+        """Next recorded (status, headers, body) for a request, or None if it wasn't recorded"""
+        key = (method, url)
+        if key not in self._answers and method == 'HEAD':
+            key = ('GET', url)
+        with self._lock:
+            answers = self._answers.get(key)
+            if not answers:
+                self.misses += 1
+                return None
+            position = self._served.get(key, 0)
+            self._served[key] = position + 1
+            return answers[min(position, len(answers) - 1)]
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Answers /<quoted original URL> from the server's ResponseTable"""
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    
+    def _answer(self, send_body: bool):
+        answer = self.server.table.answer(self.command, unquote(self.path[1:]))
+        if answer is None:
+            status, headers, body = 404, [('Content-Type', 'text/plain')], b'Not in the session trace'
+        else:
+            status, headers, body = answer
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+    
+    def do_GET(self):
+        self._answer(send_body=True)
+    
+    def do_HEAD(self):
+        self._answer(send_body=False)
+    
+    def log_message(self, format, *args):
+        """Keep benchmark output clean"""
+
+
+def _stand_in_adapter(base_url: str, pool_size: int = 32):
+    """HTTPAdapter that sends every request to the stand-in and restores the original URL"""
+    from requests.adapters import HTTPAdapter
+    
+    class StandInAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            original = request.url
+            request.url = f"{base_url}/{quote(original, safe='')}"
+            kwargs['proxies'] = {}
+            try:
+                response = super().send(request, **kwargs)
+            finally:
+                request.url = original
+            response.url = original
+            return response
+    
+    return StandInAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+
+class _NullStream:
+    """Write-only text sink standing in for the terminal; counts the UTF-8 bytes written"""
+    
+    encoding = 'utf-8'
+    
+    def __init__(self):
+        self.bytes_written = 0
+    
+    def write(self, text: str) -> int:
+        self.bytes_written += len(text.encode('utf-8', 'replace'))
+        return len(text)
+    
+    def flush(self):
+        pass
+    
+    def isatty(self) -> bool:
+        return True
+    
+    def fileno(self) -> int:
+        return 1
+
+
+def _run_session(settings: Dict, commands: List[str], output: _NullStream) -> List[Dict]:
+    """Run commands through a fresh browser; one {seconds, bytes, peak_rss, error} per command"""
+    from ..main import Ravanan
+    
+    browser = Ravanan(home_url=settings.get('home') or "https://example.com",
+                      lowbw=bool(settings.get('lowbw')), reader=bool(settings.get('reader')))
+    browser.preconnect_hosts = 0  # Would reach the recorded hosts, not the stand-in server
+    results = []
+    for command in commands:
+        written = output.bytes_written
+        error = None
+        started = time.perf_counter()
+        try:
+            browser.handle_command(command)
+        except SystemExit:
+            pass  # quit
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - started
+        results.append({
+            'seconds': seconds, 'bytes': output.bytes_written - written,
+            'peak_rss': peak_rss(), 'error': error,
+        })
+    if browser.downloader is not None:
+        browser.downloader.shutdown()
+    browser.fetcher.close()
+    return results
+
+
+def replay(path: str, repeat: int = 3, columns: int = 100) -> Dict:
+    """
+    Replay a session trace offline and time every command
+    
+    Runs are isolated from the user's setup: the shared cache daemon is
+    off, and history, bookmarks and downloads go to a temporary directory.
+    Output is rendered as for a `columns`-wide colour terminal and discarded.
+    
+    Args:
+        path: Trace file from --trace-session
+        repeat: Times to replay the whole session
+        columns: Terminal width to render for
+    
+    Returns:
+        Result document: per-command median and per-run seconds, bytes
+        written, peak RSS after the first run of each command, plus
+        totals and the number of requests missing from the trace
+    """
+    import tempfile
+    
+    settings, command_entries, responses = load_trace(path)
+    commands = [entry['command'] for entry in command_entries]
+    table = ResponseTable(responses)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+    httpd.daemon_threads = True
+    httpd.table = table
+    server = threading.Thread(target=httpd.serve_forever, daemon=True)
+    server.start()
+    
+    host, port = httpd.server_address[:2]
+    adapter = _stand_in_adapter(f"http://{host}:{port}")
+    
+    def route(session):
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    
+    saved_env = dict(os.environ)
+    saved_stdout, saved_stdin = sys.stdout, sys.stdin
+    saved_fd = None
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='ravanan-replay-') as scratch:
+            os.environ.update({
+                'RAVANAN_CACHED': 'off', 'RAVANAN_HOME': scratch, 'RAVANAN_DOWNLOADS': scratch,
+                'COLUMNS': str(columns), 'LINES': '40', 'FORCE_COLOR': '1', 'TERM': 'xterm-256color',
+            })
+            os.environ.pop('NO_COLOR', None)
+            fetcher.SESSION_HOOKS.append(route)
+            # Commands that shell out (clear) write to the real terminal otherwise
+            sys.stdout.flush()
+            saved_fd = os.dup(1)
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, 1)
+            os.close(devnull)
+            sys.stdout = output = _NullStream()
+            sys.stdin = open(os.devnull)  # Pagers stop at once instead of waiting for a key
+            for _ in range(max(1, repeat)):
+                table.reset()
+                runs.append(_run_session(settings, commands, output))
+    finally:
+        fetcher.SESSION_HOOKS[:] = [hook for hook in fetcher.SESSION_HOOKS if hook is not route]
+        if sys.stdin is not saved_stdin:
+            sys.stdin.close()
+        sys.stdout, sys.stdin = saved_stdout, saved_stdin
+        if saved_fd is not None:
+            os.dup2(saved_fd, 1)
+            os.close(saved_fd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        httpd.shutdown()
+        httpd.server_close()
+    
+    rows = []
+    for n, entry in enumerate(command_entries):
+        seconds = [run[n]['seconds'] for run in runs]
+        rows.append({
+            'command': entry['command'],
+            'recorded_ms': round(entry.get('seconds', 0) * 1000, 3),
+            'median_ms': round(statistics.median(seconds) * 1000, 3),
+            'runs_ms': [round(s * 1000, 3) for s in seconds],
+            'bytes': runs[0][n]['bytes'],
+            'peak_rss': runs[0][n]['peak_rss'],
+            'error': runs[0][n]['error'],
+        })
+    return {
+        'trace': os.path.abspath(path),
+        'repeat': len(runs),
+        'commands': rows,
+        'total_ms': round(sum(row['median_ms'] for row in rows), 3),
+        'peak_rss': peak_rss(),
+        'misses': table.misses,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+    }
+
+
+def compare_replays(baseline: Dict, current: Dict, threshold: float) -> List[Tuple[int, str, float, float]]:
+    """
+    Commands more than `threshold` percent slower than in a baseline replay of the same trace
+    
+    Returns:
+        (position, command, baseline_ms, current_ms) tuples
+    """
+    regressions = []
+    for n, (before, after) in enumerate(zip(baseline['commands'], current['commands'])):
+        if before['command'] != after['command'] or before['median_ms'] <= 0:
+            continue
+        if (after['median_ms'] - before['median_ms']) / before['median_ms'] * 100 > threshold:
+            regressions.append((n + 1, after['command'], before['median_ms'], after['median_ms']))
+    return regressions
+
+
+def _format_rss(size: Optional[int]) -> str:
+    return format_bytes(size) if size is not None else "n/a"
+
+
+def print_report(result: Dict, regressions: List[Tuple] = ()):
+    """Print a replay result as a table"""
+    flagged = {n for n, *_ in regressions}
+    print("=" * 60)
+    print(f"Replay of {result['trace']} ({result['repeat']} run(s), median shown)")
+    print("=" * 60)
+    print(f"{'#':>3} {'command':<28} {'recorded':>9} {'replay':>9} {'output':>8} {'peak RSS':>9}")
+    for n, row in enumerate(result['commands'], 1):
+        command = row['command'] if len(row['command']) <= 28 else row['command'][:27] + '…'
+        flag = '  ❌' if n in flagged else ''
+        print(f"{n:>3} {command:<28} {row['recorded_ms']:>7.1f}ms {row['median_ms']:>7.1f}ms "
+              f"{format_bytes(row['bytes']):>8} {_format_rss(row['peak_rss']):>9}{flag}")
+        if row['error']:
+            print(f"    error: {row['error']}")
+    print("-" * 60)
+    print(f"Total: {result['total_ms']:.1f}ms   Peak RSS: {_format_rss(result['peak_rss'])}")
+    if result['misses']:
+        print(f"⚠️  {result['misses']} request(s) were not in the trace and got 404s")
+
+
+def main(argv=None) -> int:
+    """Command-line entry point for `ravanan replay-bench`"""
+    parser = argparse.ArgumentParser(
+        prog='ravanan replay-bench',
+        description="Replay a session recorded with --trace-session offline and time each command",
+    )
+    parser.add_argument('trace', help='Trace file written by ravanan --trace-session')
+    parser.add_argument('--repeat', type=int, default=3, help='Replays of the session (default: 3)')
+    parser.add_argument('--columns', type=int, default=100, help='Terminal width to render for (default: 100)')
+    parser.add_argument('--output', '-o', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Earlier --output file of the same trace to compare with')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Allowed slowdown per command in percent (default: 10)')
+    args = parser.parse_args(argv)
+    
+    try:
+        result = replay(args.trace, repeat=args.repeat, columns=args.columns)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_replays(json.load(f), result, args.threshold)
+    print_report(result, regressions)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+    if regressions:
+        print(f"\n{len(regressions)} command(s) slower by more than {args.threshold:.0f}%")
+        return 1
+    return 0
@@ -0,0 +1,416 @@
+"""
+Extraction Server Module
+`ravanan serve`: Ravanan's text extraction over local HTTP
+
+Endpoints:
+    GET  /extract?url=URL[&format=json|text][&fresh=1]
+    POST /extract[?format=json|text]   body: {"urls": [...]} or one URL per line
+    GET  /metrics                       Prometheus text format
+
+One Browser is shared by every request, so all clients share its
+keep-alive connection pool and page cache. Documents are parsed in worker
+processes, and at most `max_concurrent` extract requests run at once;
+the rest wait briefly and are then refused with 503.
+
+Created by: Krishna D
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..api import Browser, Page
+from ..utils.export import format_page_text
+from ..utils.health import HOST_HEALTH
+
+MAX_BODY = 1024 * 1024
+FORMATS = ('json', 'text')
+
+
+def page_result(page: Page) -> Dict:
+    """JSON result for one page: Page.to_dict() plus its plain text"""
+    result = page.to_dict()
+    result['text'] = page.text
+    return result
+
+
+def page_text(page: Page) -> str:
+    """Plain-text result for one page (the `save` format, or the error)"""
+    if not page.ok:
+        return f"URL: {page.url}\nError: {page.error}\n"
+    return format_page_text(page.title, page.final_url, page.blocks, page.links)
+
+
+class ExtractService:
+    """
+    Request handling and metrics for `ravanan serve`, independent of the HTTP layer
+    """
+    
+    def __init__(self, browser: Browser, max_concurrent: int = 16, queue_wait: float = 2.0,
+                 max_batch: int = 100, fetch_workers: int = 8, allow_files: bool = False):
+        """
+        Args:
+            browser: Shared browser (connection pool, page cache, parse workers)
+            max_concurrent: Extract requests processed at once
+            queue_wait: Seconds a request waits for a slot before 503
+            max_batch: Most URLs accepted in one batch request
+            fetch_workers: Concurrent fetches within one batch request
+            allow_files: Serve file:// URLs and local paths (off: any local client could read files)
+        """
+        self.browser = browser
+        self.max_concurrent = max_concurrent
+        self.queue_wait = queue_wait
+        self.max_batch = max_batch
+        self.fetch_workers = fetch_workers
+        self.allow_files = allow_files
+        self.started = time.time()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._requests: Dict[Tuple[str, int], int] = {}
+        self._rejected = 0
+        self._pages = {'ok': 0, 'error': 0}
+        self._seconds_sum = 0.0
+        self._seconds_count = 0
+    
+    def acquire(self) -> bool:
+        """Take an extract slot, waiting up to queue_wait; False if the server is saturated"""
+        if not self._slots.acquire(timeout=self.queue_wait):
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+    
+    def release(self):
+        """Give back an extract slot"""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+    
+    def record(self, path: str, status: int, seconds: float):
+        """Count a finished HTTP request"""
+        with self._lock:
+            key = (path, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if path == '/extract':
+                self._seconds_sum += seconds
+                self._seconds_count += 1
+    
+    def check_url(self, url: str) -> Optional[str]:
+        """Error message if a URL must not be fetched for a client, else None"""
+        if not url:
+            return "Empty URL"
+        scheme = urlsplit(self.browser.fetcher.normalize_url(url)).scheme
+        if scheme in ('http', 'https') or (scheme == 'file' and self.allow_files):
+            return None
+        if scheme == 'file':
+            return "Local files are not served (start with --allow-files)"
+        return f"Unsupported URL scheme: {scheme}"
+    
+    def extract(self, urls: List[str], use_cache: bool = True) -> List[Page]:
+        """
+        Load pages, concurrently for a batch
+        
+        Args:
+            urls: URLs already passed through check_url()
+            use_cache: Serve fresh cached copies
+        
+        Returns:
+            Pages in the order of urls
+        """
+        if len(urls) == 1:
+            pages = [self.browser.get(urls[0], use_cache)]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(urls))) as pool:
+                pages = list(pool.map(lambda url: self.browser.get(url, use_cache), urls))
+        with self._lock:
+            for page in pages:
+                self._pages['ok' if page.ok else 'error'] += 1
+        return pages
+    
+    def metrics(self) -> str:
+        """Current metrics in the Prometheus text exposition format"""
+        lines = []
+        
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, float]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {value:g}")
+        
+        with self._lock:
+            requests = sorted(self._requests.items())
+            rejected = self._rejected
+            in_flight = self._in_flight
+            pages = dict(self._pages)
+            seconds_sum, seconds_count = self._seconds_sum, self._seconds_count
+        cache = self.browser.cache
+        hosts = HOST_HEALTH.snapshot()
+        
+        metric('ravanan_uptime_seconds', 'gauge', 'Seconds since the server started',
+               [('', time.time() - self.started)])
+        metric('ravanan_http_requests_total', 'counter', 'HTTP requests by path and status',
+               [(f'{{path="{path}",status="{status}"}}', count) for (path, status), count in requests])
+        metric('ravanan_extract_rejected_total', 'counter', 'Extract requests refused with 503 at the concurrency limit',
+               [('', rejected)])
+        metric('ravanan_extract_in_flight', 'gauge', 'Extract requests being processed',
+               [('', in_flight)])
+        metric('ravanan_extract_concurrency_limit', 'gauge', 'Extract requests processed at once',
+               [('', self.max_concurrent)])
+        metric('ravanan_extract_seconds', 'summary', 'Time to answer extract requests',
+               [('_sum', seconds_sum), ('_count', seconds_count)])
+        metric('ravanan_pages_total', 'counter', 'Pages extracted by result',
+               [(f'{{result="{result}"}}', count) for result, count in sorted(pages.items())])
+        if cache is not None:
+            metric('ravanan_page_cache_hits_total', 'counter', 'Pages served from the page cache', [('', cache.hits)])
+            metric('ravanan_page_cache_misses_total', 'counter', 'Pages fetched and parsed', [('', cache.misses)])
+            metric('ravanan_page_cache_entries', 'gauge', 'Pages in the page cache', [('', len(cache))])
+        metric('ravanan_parse_workers', 'gauge', 'Parse worker processes (0 = parsing in request threads)',
+               [('', self.browser.parse_workers)])
+        metric('ravanan_hosts_circuit_open', 'gauge', 'Hosts currently refused by their circuit breaker',
+               [('', sum(1 for row in hosts if row['state'] == 'open'))])
+        return '\n'.join(lines) + '\n'
+    
+    def summary(self) -> str:
+        """One-line summary printed on shutdown"""
+        with self._lock:
+            served = sum(count for (path, _), count in self._requests.items() if path == '/extract')
+            pages = self._pages['ok'] + self._pages['error']
+            errors = self._pages['error']
+            rejected = self._rejected
+        cache = self.browser.cache
+        hit_rate = ""
+        if cache is not None and cache.hits + cache.misses:
+            hit_rate = f", {cache.hits / (cache.hits + cache.misses):.0%} cache hits"
+        return (f"Served {served} extract requests: {pages} pages ({errors} failed){hit_rate}, "
+                f"{rejected} refused at the concurrency limit")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP front end; keep-alive, since every response carries a Content-Length"""
+    
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ravanan-serve'
+    
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+    
+    def _send(self, status: int, body: str, content_type: str, headers: Dict[str, str] = None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+        return status
+    
+    def _send_json(self, status: int, value, headers: Dict[str, str] = None):
+        return self._send(status, json.dumps(value, ensure_ascii=False), 'application/json', headers)
+    
+    def _error(self, status: int, message: str, headers: Dict[str, str] = None):
+        return self._send_json(status, {'error': message}, headers)
+    
+    def do_GET(self):
+        self._dispatch('GET')
+    
+    def do_HEAD(self):
+        self._dispatch('GET')
+    
+    def do_POST(self):
+        self._dispatch('POST')
+    
+    def _dispatch(self, method: str):
+        service = self.server.service
+        started = time.perf_counter()
+        parts = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip('/') or '/'
+        
+        if path == '/metrics' and method == 'GET':
+            status = self._send(200, service.metrics(), 'text/plain; version=0.0.4')
+        elif path == '/extract':
+            status = self._extract(method, query)
+        else:
+            status = self._error(404, "Endpoints: GET /extract?url=URL, POST /extract, GET /metrics")
+            path = 'other'
+        service.record(path, status, time.perf_counter() - started)
+    
+    def _read_urls(self) -> Tuple[Optional[List[str]], Optional[str], Optional[str]]:
+        """
+        URLs from a batch request body
+        
+        Returns:
+            Tuple of (urls, format from the body, error message)
+        """
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            return None, None, "Chunked request bodies are not supported; send Content-Length"
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            return None, None, "Invalid Content-Length"
+        if length > MAX_BODY:
+            return None, None, f"Request body larger than {MAX_BODY} bytes"
+        body = self.rfile.read(length).decode('utf-8', 'replace')
+        
+        if 'json' in self.headers.get('Content-Type', '') or body.lstrip().startswith(('{', '[')):
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                return None, None, f"Invalid JSON: {e}"
+            body_format = None
+            if isinstance(data, dict):
+                body_format = data.get('format')
+                data = data.get('urls')
+            if not isinstance(data, list) or not all(isinstance(url, str) for url in data):
+                return None, None, 'Expected {"urls": ["...", ...]} or a list of URLs'
+            return [url.strip() for url in data], body_format, None
+        return [line.strip() for line in body.splitlines() if line.strip()], None, None
+    
+    def _extract(self, method: str, query: Dict[str, str]) -> int:
+        service = self.server.service
+        output = query.get('format', 'json')
+        if method == 'GET':
+            if not query.get('url'):
+                return self._error(400, "Missing ?url= parameter")
+            urls = [query['url'].strip()]
+        else:
+            urls, body_format, error = self._read_urls()
+            if error:
+                return self._error(400, error)
+            output = body_format or output
+            if not urls:
+                return self._error(400, "No URLs given")
+            if len(urls) > service.max_batch:
+                return self._error(413, f"At most {service.max_batch} URLs per request")
+        if output not in FORMATS:
+            return self._error(400, f"Unknown format {output!r} (use json or text)")
+        for url in urls:
+            error = service.check_url(url)
+            if error:
+                return self._error(400, f"{error}: {url}")
+        
+        if not service.acquire():
+            return self._error(503, "Server busy; retry shortly", {'Retry-After': '1'})
+        try:
+            pages = service.extract(urls, use_cache=query.get('fresh') not in ('1', 'true', 'yes'))
+        finally:
+            service.release()
+        
+        if method == 'GET':
+            page = pages[0]
+            status = 200 if page.ok else 502
+            if output == 'text':
+                return self._send(status, page_text(page), 'text/plain')
+            return self._send_json(status, page_result(page))
+        if output == 'text':
+            return self._send(200, '\n'.join(page_text(page) for page in pages), 'text/plain')
+        return self._send_json(200, {'pages': [page_result(page) for page in pages]})
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+def serve(service: ExtractService, address: Tuple[str, int], access_log: bool = False,
+          on_ready=None):
+    """
+    Run the extraction server until interrupted
+    
+    Args:
+        service: Request handling and metrics
+        address: (host, port) to listen on
+        access_log: Log every request to stderr
+        on_ready: Called with the bound (host, port) once listening
+    """
+    server = _HTTPServer(address, _Handler)
+    server.service = service
+    server.access_log = access_log
+    if on_ready:
+        on_ready(server.server_address[:2])
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point for `ravanan serve`
+    
+    Args:
+        argv: Command-line arguments
+    
+    Returns:
+        Process exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog='ravanan serve',
+        description='Serve Ravanan text extraction over local HTTP (GET/POST /extract, GET /metrics)'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080, 0 picks a free one)')
+    parser.add_argument('--parse-workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for parsing (default: CPU count, 0 parses in request threads)')
+    parser.add_argument('--max-concurrent', type=int, default=16,
+                        help='Extract requests processed at once; more wait, then get 503 (default: 16)')
+    parser.add_argument('--fetch-workers', type=int, default=8, help='Concurrent fetches per batch request (default: 8)')
+    parser.add_argument('--max-batch', type=int, default=100, help='Most URLs per batch request (default: 100)')
+    parser.add_argument('--cache-size', type=int, default=512, help='Parsed pages kept in memory (default: 512)')
+    parser.add_argument('--cache-ttl', type=float, default=300, help='Seconds a cached page stays fresh (default: 300)')
+    parser.add_argument('--timeout', type=int, default=10, help='Fetch timeout in seconds (default: 10)')
+    parser.add_argument('--allow-files', action='store_true', help='Also extract file:// URLs and local paths')
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stderr')
+    args = parser.parse_args(argv)
+    
+    # max_workers sizes the keep-alive pool: one connection per request the
+    # server may run at once
+    browser = Browser(
+        timeout=args.timeout,
+        max_workers=max(args.max_concurrent, args.fetch_workers),
+        cache_size=args.cache_size,
+        cache_ttl=args.cache_ttl,
+        parse_workers=max(0, args.parse_workers),
+    )
+    service = ExtractService(
+        browser,
+        max_concurrent=max(1, args.max_concurrent),
+        max_batch=max(1, args.max_batch),
+        fetch_workers=max(1, args.fetch_workers),
+        allow_files=args.allow_files,
+    )
+    
+    def ready(address):
+        print(f"🌐 ravanan serve listening on http://{address[0]}:{address[1]} "
+              f"({browser.parse_workers} parse workers, {service.max_concurrent} concurrent requests; Ctrl+C to stop)")
+        sys.stdout.flush()
+    
+    try:
+        serve(service, (args.host, args.port), args.access_log, ready)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        browser.close()
+    print(f"\n{service.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Page Source Module
+Keeps the raw source of the current page compressed in memory and provides
+an indexed, memory-mapped viewer for it
+"""
+import mmap
+import re
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+
+
+class PageSource:
+    """Raw page source stored as zlib-compressed bytes"""
+    
+    def __init__(self, html: str, level: int = 6):
+        """
+        Compress page source
+        
+        Args:
+            html: Decoded page source
+            level: zlib compression level (1 fastest - 9 smallest)
+        """
+        encoded = html.encode('utf-8', errors='surrogatepass')
+        self.length = len(html)
+        self.raw_size = len(encoded)
+        self.data = zlib.compress(encoded, level)
+    
+    @classmethod
+    def from_compressed(cls, data: bytes, length: int, raw_size: int) -> 'PageSource':
+        """
+        Rebuild a PageSource from its compressed bytes (e.g. from a session snapshot)
+        
+        Args:
+            data: The `data` of the original
+            length: Its length in characters
+            raw_size: Its uncompressed size in bytes
+        """
+        source = cls.__new__(cls)
+        source.data = data
+        source.length = length
+        source.raw_size = raw_size
+        return source
+    
+    @property
+    def compressed_size(self) -> int:
+        """Size of the compressed source in bytes"""
+        return len(self.data)
+    
+    def get_text(self) -> str:
+        """Decompress and decode the source"""
+        return zlib.decompress(self.data).decode('utf-8', errors='surrogatepass')
+    
+    def iter_chunks(self, chunk_size: int = 256 * 1024) -> Iterator[bytes]:
+        """
+        Decompress the source incrementally
+        
+        Args:
+            chunk_size: Maximum decompressed bytes per chunk
+            
+        Yields:
+            UTF-8 encoded chunks of the source
+        """
+        decompressor = zlib.decompressobj()
+        data = self.data
+        while data:
+            chunk = decompressor.decompress(data, chunk_size)
+            data = decompressor.unconsumed_tail
+            if chunk:
+                yield chunk
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+    
+    def __len__(self) -> int:
+        """Length of the source in characters"""
+        return self.length
+
+
+class SourceViewer:
+    """
+    Line-indexed view of a page source
+    
+    The source is decompressed once into an anonymous temporary file and
+    memory-mapped, and the byte offset of every line start is recorded.
+    Viewing any range, or searching, then touches only the bytes needed
+    instead of splitting the whole document into a list of lines.
+    """
+    
+    def __init__(self, source: PageSource):
+        self.source = source
+        self._file = tempfile.TemporaryFile()
+        for chunk in source.iter_chunks():
+            self._file.write(chunk)
+        self._file.flush()
+        self.size = self._file.tell()
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b''
+        self._offsets = self._build_index()
+    
+    def _build_index(self) -> array:
+        """Record the byte offset where each line starts"""
+        offsets = array('Q', [0])
+        find = self._map.find
+        position = find(b'\n')
+        while position != -1:
+            offsets.append(position + 1)
+            position = find(b'\n', position + 1)
+        # A trailing newline does not start another line
+        if len(offsets) > 1 and offsets[-1] == self.size:
+            offsets.pop()
+        return offsets
+    
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the source"""
+        return len(self._offsets)
+    
+    def _line_span(self, number: int) -> Tuple[int, int]:
+        """Byte range of a line (1-based), excluding the line ending"""
+        start = self._offsets[number - 1]
+        if number < len(self._offsets):
+            end = self._offsets[number] - 1
+        else:
+            end = self.size
+        if end > start and self._map[end - 1:end] == b'\r':
+            end -= 1
+        return start, end
+    
+    def get_line(self, number: int, max_chars: int = None) -> Tuple[str, int]:
+        """
+        Read one line
+        
+        Args:
+            number: Line number (1-based)
+            max_chars: Decode at most this many characters of the line
+            
+        Returns:
+            Tuple of (text, remaining_bytes) where remaining_bytes counts the
+            part of the line left out by max_chars
+        """
+        start, end = self._line_span(number)
+        stop = end if max_chars is None else min(end, start + max_chars * 4)
+        text = self._map[start:stop].decode('utf-8', errors='replace')
+        if max_chars is not None and len(text) > max_chars:
+            text = text[:max_chars]
+        shown = len(text.encode('utf-8', errors='replace'))
+        return text, max(0, end - start - shown)
+    
+    def get_lines(self, first: int, last: int, max_chars: int = None) -> List[Tuple[int, str, int]]:
+        """
+        Read a range of lines
+        
+        Args:
+            first: First line number (1-based, inclusive)
+            last: Last line number (inclusive, clamped to the source)
+            max_chars: Per-line character cap (see get_line)
+            
+        Returns:
+            List of (line_number, text, remaining_bytes)
+        """
+        first = max(1, first)
+        last = min(self.line_count, last)
+        return [(number,) + self.get_line(number, max_chars) for number in range(first, last + 1)]
+    
+    def grep(self, pattern: str, case_sensitive: bool = False, limit: int = 100,
+             context: int = 60) -> Tuple[List[Tuple[int, str]], int]:
+        """
+        Find a literal string in the source
+        
+        Args:
+            pattern: Text to look for
+            case_sensitive: Whether matching is case-sensitive
+            limit: Maximum matches to return
+            context: Characters of context on each side of a match
+            
+        Returns:
+            Tuple of (matches, total) where matches are (line_number, snippet)
+            and total counts every match in the source
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        regex = re.compile(re.escape(pattern.encode('utf-8')), flags)
+        matches = []
+        total = 0
+        for match in regex.finditer(self._map):
+            total += 1
+            if len(matches) >= limit:
+                continue
+            line = bisect_right(self._offsets, match.start())
+            line_start, line_end = self._line_span(line)
+            start = max(line_start, match.start() - context)
+            end = min(line_end, match.end() + context)
+            snippet = self._map[start:end].decode('utf-8', errors='replace')
+            if start > line_start:
+                snippet = '…' + snippet
+            if end < line_end:
+                snippet += '…'
+            matches.append((line, snippet))
+        return matches, total
+    
+    def close(self):
+        """Release the mapping and temporary file"""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
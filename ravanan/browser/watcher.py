@@ -0,0 +1,142 @@
+"""
+Watcher Module
+Polls pages with conditional requests and reports block-level changes
+
+Created by: Krishna D
+"""
+import hashlib
+import threading
+from difflib import SequenceMatcher
+from typing import Callable, List, Optional, Tuple
+
+from .fetcher import WebFetcher
+from .parser import HTMLParser
+from ..utils.scheduler import PollScheduler
+from ..utils.urls import url_host
+
+
+def diff_blocks(old: List[Tuple], new: List[Tuple]) -> List[Tuple[str, Tuple]]:
+    """
+    Compare two parsed pages block by block
+    
+    Args:
+        old: Previous text_content
+        new: Current text_content
+    
+    Returns:
+        List of ('+' or '-', block) for inserted and removed blocks, in page order
+    """
+    old_blocks = [block for block in old if block[0] != 'newline']
+    new_blocks = [block for block in new if block[0] != 'newline']
+    matcher = SequenceMatcher(None, old_blocks, new_blocks, autojunk=False)
+    
+    changes = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('delete', 'replace'):
+            changes.extend(('-', block) for block in old_blocks[i1:i2])
+        if tag in ('insert', 'replace'):
+            changes.extend(('+', block) for block in new_blocks[j1:j2])
+    return changes
+
+
+class PageWatch:
+    """State for one watched page"""
+    
+    def __init__(self, url: str, fetcher: WebFetcher):
+        self.url = url
+        self.fetcher = fetcher
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.blocks: Optional[List[Tuple]] = None
+        self.checks = 0
+        self.not_modified = 0
+        self.changes = 0
+    
+    def check(self) -> Tuple[str, List[Tuple[str, Tuple]]]:
+        """
+        Poll the page once
+        
+        Returns:
+            Tuple of (status, changes) where status is 'baseline', 'unchanged',
+            'changed' or an error message, and changes is the block diff
+        """
+        self.checks += 1
+        success, content, final_url, status_code, headers = self.fetcher.fetch_conditional(
+            self.url, self.etag, self.last_modified
+        )
+        if not success:
+            return content, []
+        
+        self.etag = headers.get('ETag') or self.etag
+        self.last_modified = headers.get('Last-Modified') or self.last_modified
+        if status_code == 304:
+            self.not_modified += 1
+            return 'unchanged', []
+        
+        # Servers without validators still send the full body; skip the parse
+        # when it is byte-for-byte the same as last time
+        digest = hashlib.sha1(content.encode('utf-8', errors='surrogatepass')).digest()
+        if digest == self.digest:
+            return 'unchanged', []
+        self.digest = digest
+        
+        links, blocks = HTMLParser().parse(content, final_url)
+        if self.blocks is None:
+            self.blocks = blocks
+            return 'baseline', []
+        
+        changes = diff_blocks(self.blocks, blocks)
+        self.blocks = blocks
+        if not changes:
+            return 'unchanged', []
+        self.changes += 1
+        return 'changed', changes
+
+
+class Watcher:
+    """Watches several pages on one shared scheduler"""
+    
+    def __init__(self, urls: List[str], interval: float,
+                 on_result: Callable[[PageWatch, str, List[Tuple[str, Tuple]]], None],
+                 per_host: int = 2, max_workers: int = 8, jitter: float = 0.1):
+        """
+        Args:
+            urls: Pages to watch
+            interval: Seconds between polls of each page
+            on_result: Called (watch, status, changes) after every poll
+            per_host: Concurrent polls allowed per host
+            max_workers: Concurrent polls overall
+            jitter: Fractional spread applied to intervals
+        """
+        self.fetcher = WebFetcher(pool_size=max_workers)
+        self.scheduler = PollScheduler(max_workers=max_workers, per_host=per_host, jitter=jitter)
+        self.on_result = on_result
+        self._lock = threading.Lock()
+        self.watches = []
+        for url in urls:
+            watch = PageWatch(self.fetcher.normalize_url(url), self.fetcher)
+            self.watches.append(watch)
+            self.scheduler.add(watch.url, self._make_job(watch), interval, host=url_host(watch.url))
+    
+    def _make_job(self, watch: PageWatch):
+        def job():
+            try:
+                status, changes = watch.check()
+            except Exception as e:
+                status, changes = f"Unexpected error: {str(e)}", []
+            # Serialize callbacks so reports from different pages don't interleave
+            with self._lock:
+                self.on_result(watch, status, changes)
+        return job
+    
+    def run(self):
+        """Poll until stop() is called or KeyboardInterrupt"""
+        try:
+            self.scheduler.run()
+        finally:
+            self.scheduler.stop()
+    
+    def stop(self):
+        """Stop polling"""
+        self.scheduler.stop()
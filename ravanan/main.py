@@ -12,42 +12,127 @@ Created by: Krishna D
 import sys
 import argparse
 import os
-from .browser.fetcher import WebFetcher
-from .browser.parser import HTMLParser
+import re
+import time
+import zlib
+from typing import Dict
+from .browser.fetcher import WebFetcher, is_binary_response, preconnect_origins
+from .browser.parser import DEFAULT_LIMITS, HTMLParser, ParseLimits, partial_reason, reader_range, reader_view
 from .browser.renderer import TextRenderer
 from .browser.navigator import Navigator
+from .browser.source import PageSource
+from .browser.feeds import FEEDS_URL, looks_like_feed
+from .browser.handlers import DEFAULT_DEPTH, handler_for, mime_type
+from .utils.boilerplate import SiteChrome, chrome_summary, collapse_chrome
+from .utils.dns import DNS_CACHE
+from .utils.export import format_page_text
+from .utils.memory import deep_getsizeof, format_bytes
+
+# Pseudo-URL of a document piped to `ravanan -`, so it can live in history
+STDIN_URL = 'ravanan:stdin'
 
 
 class Ravanan:
     """Main browser application"""
     
-    def __init__(self, home_url: str = "https://example.com"):
+    # Source viewer: lines per window, and wrapped rows a single line may fill
+    SOURCE_WINDOW = 50
+    SOURCE_WRAP_ROWS = 20
+    
+    # Session snapshots: least seconds between periodic saves, and the age
+    # past which a restored page is revalidated in the background
+    SNAPSHOT_INTERVAL = 30
+    SNAPSHOT_STALE = 60
+    
+    # Distinct hosts linked from a page that get a connection opened in advance
+    PRECONNECT_HOSTS = 4
+    
+    def __init__(self, home_url: str = "https://example.com", lowbw: bool = False, reader: bool = False,
+                 tracer=None, renderer=None, interactive: bool = True):
         self.fetcher = WebFetcher()
-        self.parser = HTMLParser()
-        self.renderer = TextRenderer()
+        if renderer is not None:
+            self.renderer = renderer
+        elif lowbw:
+            from .browser.lowbw import LowBandwidthRenderer
+            self.renderer = LowBandwidthRenderer()
+        else:
+            self.renderer = TextRenderer()
         self.navigator = Navigator()
         self.home_url = home_url
         self.current_title = ""
         self.current_content = []
-        self.current_html = ""  # Store raw HTML source
+        self.page_source = None  # Raw HTML source, compressed
+        self.source_viewer = None
+        self.source_position = 1
+        self.link_checker = None  # Created by check-links; keeps its result cache between runs
+        self.deep_searcher = None  # Created by the first deep search; keeps its page cache
+        self.feed_reader = None
+        self.feeds_view = None  # Last (content, links) shown by 'feeds'
+        self.content_handler = None  # ContentHandler that produced the current page
+        self.content_type = ""
+        self.view_depth = DEFAULT_DEPTH
+        self.downloader = None  # Created by the first download
+        self.stdin_document = None  # Text read by `ravanan -`
+        self.site_chrome = SiteChrome()
+        self.chrome_blocks = set()  # Indexes of current_content blocks repeated across the site
+        self.show_chrome = False
+        self.reader_mode = reader
+        self.parse_seconds = None  # Parse time of the current page (None if reused from the shared cache)
+        self.render_seconds = {}  # 'full' / 'reader' -> last render time of the current page
+        self.tracer = tracer  # SessionRecorder for --trace-session
+        self.interactive = interactive  # False for -c / --script: no screen clearing or prompts
+        self.page_validators = {}  # ETag / Last-Modified of the current page
+        self.page_fetched = None  # When the current page was loaded (time.time())
+        self.snapshots = interactive  # Save the session on exit and every SNAPSHOT_INTERVAL seconds
+        self._snapshot_saved = (0.0, None)  # (time.monotonic(), _snapshot_key()) of the last save
+        self.revalidation = None  # (url, outcome) of the background check of a restored page
+        self.preconnect_hosts = self.PRECONNECT_HOSTS if interactive else 0
+        self.fetcher.on_binary = self.hand_off_download
         self.running = True
     
-    def start(self, initial_url: str = None):
+    @property
+    def current_html(self) -> str:
+        """Raw HTML source of the current page, decompressed on access"""
+        if self.page_source is None:
+            return ""
+        return self.page_source.get_text()
+    
+    @current_html.setter
+    def current_html(self, html: str):
+        self.page_source = PageSource(html) if html else None
+    
+    def start(self, initial_url: str = None, restore: bool = False):
         """
         Start the browser
         
         Args:
             initial_url: URL to open on startup
+            restore: Resume the last session from its snapshot instead, if there is one
         """
         # Load initial page
         url = initial_url or self.home_url
-        self.load_page(url)
+        if restore and self.restore_session():
+            pass  # Resumed without touching the network
+        elif url == '-':
+            self.load_stdin()
+            # Commands come from the terminal once the piped document is read
+            try:
+                sys.stdin = open('CONIN$' if os.name == 'nt' else '/dev/tty')
+            except OSError:
+                return
+        elif self.tracer is not None:
+            self.handle_command(f"go {url}")  # Recorded, so a replay opens the same page
+        else:
+            self.load_page(url)
         
         # Main loop
         while self.running:
             try:
+                self.report_downloads()
+                self.report_revalidation()
                 command = input("\n> ").strip()
                 self.handle_command(command)
+                self.snapshot_if_due()
             except KeyboardInterrupt:
                 self.quit()
             except EOFError:
@@ -63,20 +148,61 @@ class Ravanan:
             url: URL to load
             add_to_history: Whether to add to history (False for back/forward)
         """
+        if url == FEEDS_URL:
+            return self.show_feeds(refresh=False, add_to_history=add_to_history)
+        if url == STDIN_URL:
+            return self.load_stdin(add_to_history)
+        
         # Show loading message
         self.renderer.render_loading(url)
         
         # Fetch page
-        success, content, final_url, status_code = self.fetcher.fetch(url)
+        success, content, final_url, status_code, headers = self.fetcher.fetch_with_headers(url)
         
         if not success:
             self.renderer.render_error(content)
             return False
+        if not content and is_binary_response(headers):
+            return False  # Handed to the downloader; the current page stays
+        
+        validators = {name: headers[name] for name in ('ETag', 'Last-Modified') if name in headers}
+        return self.show_document(content, final_url, headers.get('Content-Type'), add_to_history,
+                                  validators=validators)
+    
+    def show_document(self, content: str, url: str, content_type: str = None,
+                      add_to_history: bool = True, base_url: str = None, validators: Dict = None) -> bool:
+        """
+        Turn a document into the current page and display it
+        
+        Args:
+            content: Document text
+            url: URL it is shown (and kept in history) under
+            content_type: Content-Type header value, if any
+            add_to_history: Whether to add to history (False for back/forward)
+            base_url: URL relative links resolve against (default: url)
+            validators: ETag / Last-Modified response headers, kept for revalidation
+        """
+        final_url = url
         
-        # Parse HTML
+        # Turn the body into page content with the handler for its type;
+        # HTML views from the web may be reused from (and shared with) other
+        # processes, unless `limits` changed how pages are parsed here
         try:
-            links, text_content = self.parser.parse(content, final_url)
-            title = self.parser.get_page_title()
+            handler = handler_for(content_type, content)
+            web = final_url.startswith(('http://', 'https://'))
+            shareable = handler.cacheable and web and DEFAULT_LIMITS.is_default()
+            shared = self.fetcher.shared_cache if shareable else None
+            page = shared.get_page(final_url, content) if shared else None
+            self.parse_seconds = None
+            if page is None:
+                started = time.perf_counter()
+                page = handler.view(content, base_url or final_url, self.view_depth)
+                self.parse_seconds = time.perf_counter() - started
+                if shared:
+                    shared.put_page(final_url, content, *page)
+            title, links, text_content = page
+            self.content_handler = handler
+            self.content_type = mime_type(content_type)
             
             # Update navigator
             if add_to_history:
@@ -89,10 +215,19 @@ class Ravanan:
             # Store current page data
             self.current_title = title
             self.current_content = text_content
-            self.current_html = content  # Store raw HTML source
+            self.page_source = PageSource(content)  # Raw HTML source, kept compressed
+            self.page_validators = validators or {}
+            self.page_fetched = time.time()
+            if web and handler.name == 'html':
+                self.chrome_blocks = self.site_chrome.observe(final_url, text_content)
+            else:
+                self.chrome_blocks = set()
             
             # Render page
-            self.renderer.render_page(title, text_content, links, final_url)
+            self.render_seconds = {}
+            self.display_page(title, text_content, links, final_url)
+            if web and self.preconnect_hosts:
+                self.preconnect_links(final_url, links)
             
             return True
             
@@ -100,13 +235,392 @@ class Ravanan:
             self.renderer.render_error(f"Failed to parse page: {str(e)}")
             return False
     
+    def preconnect_links(self, url: str, links):
+        """
+        Open connections in the background to the hosts the page links to
+        most, so following a link to another site skips DNS, TCP and TLS setup
+        """
+        shared = self.fetcher.shared_cache
+        if shared is not None and shared.available:
+            return  # Links are fetched through the daemon, not this process's pool
+        self.fetcher.preconnect(preconnect_origins(links, url, self.preconnect_hosts))
+    
+    def display_page(self, title: str, content, links, url: str):
+        """
+        Render a page: its main content only in reader mode, otherwise in
+        full with blocks repeated across the site collapsed unless 'chrome'
+        shows them
+        
+        Args:
+            title: Page title
+            content: Parsed content list (the current page's, which chrome_blocks indexes)
+            links: Links on the page
+            url: Page URL
+        """
+        view = reader_view(content) if self.reader_mode else None
+        if view is not None:
+            mode = 'reader'
+            shown = {level for item_type, _, level in view if item_type == 'link'}
+            content = view
+            links = [link for link in links if link['index'] in shown]
+        else:
+            mode = 'full'
+            if self.chrome_blocks and not self.show_chrome:
+                content, hidden_links = collapse_chrome(content, self.chrome_blocks)
+                # Keep the link table for the page's own links; hidden ones still open by number
+                links = [link for link in links if link['index'] not in hidden_links]
+        started = time.perf_counter()
+        self.renderer.render_page(title, content, links, url)
+        self.render_seconds[mode] = time.perf_counter() - started
+    
+    def toggle_reader(self):
+        """Switch between reader view and the full page, redisplay, and report timings"""
+        self.reader_mode = not self.reader_mode
+        state = "on" if self.reader_mode else "off"
+        if not self.current_title:
+            print(f"\n📰 Reader view {state}\n")
+            return
+        self.display_page(self.current_title, self.current_content, self.navigator.current_links,
+                          self.navigator.reload())
+        print(f"\n📰 Reader view {state}: {self.reader_summary()}\n")
+    
+    def reader_summary(self) -> str:
+        """Main-content size plus parse and per-view render times of the current page"""
+        found = reader_range(self.current_content)
+        if found is None:
+            return "no main content found on this page (showing the full page)"
+        if self.parse_seconds is None:
+            parse = "parse: reused from the shared cache"
+        else:
+            parse = f"parse {self.parse_seconds * 1000:.1f} ms (one pass scores both views)"
+        renders = ", ".join(
+            f"{mode} {self.render_seconds[mode] * 1000:.1f} ms" if mode in self.render_seconds
+            else f"{mode} not shown yet"
+            for mode in ('reader', 'full')
+        )
+        blocks = sum(1 for _, text, _ in self.current_content if text)
+        main = sum(1 for _, text, _ in self.current_content[found[0]:found[1]] if text)
+        return f"main content {main} of {blocks} blocks | {parse} | render: {renders}"
+    
+    def toggle_chrome(self):
+        """Show or hide repeated site navigation, and redisplay the current page"""
+        self.show_chrome = not self.show_chrome
+        state = "shown" if self.show_chrome else "collapsed"
+        if not self.current_title:
+            print(f"\n🧭 Site chrome will be {state}\n")
+            return
+        self.display_page(self.current_title, self.current_content, self.navigator.current_links,
+                          self.navigator.reload())
+        if not self.chrome_blocks:
+            print(f"\n🧭 Site chrome {state}; none detected on this page yet "
+                  f"(needs {self.site_chrome.min_pages} other recent pages of the site)\n")
+    
+    def load_stdin(self, add_to_history: bool = True) -> bool:
+        """
+        Show the document piped to `ravanan -`
+        
+        It is read once and kept, so back/forward and reload work; relative
+        links resolve against the working directory.
+        """
+        from .browser.local import decode_document, path_to_url
+        
+        if self.stdin_document is None:
+            self.stdin_document = decode_document(sys.stdin.buffer.read())
+        return self.show_document(self.stdin_document, STDIN_URL, None, add_to_history,
+                                  base_url=path_to_url(os.getcwd()))
+    
+    def session_state(self) -> Dict:
+        """The session as plain values: history, current page (parsed and source) and link table"""
+        history = self.navigator.history
+        source = self.page_source
+        stdin = self.stdin_document
+        return {
+            'saved': time.time(),
+            'history': list(history.history),
+            'history_index': history.current_index,
+            'url': self.navigator.current_url,
+            'title': self.current_title,
+            'content': self.current_content,
+            'links': self.navigator.current_links,
+            'content_type': self.content_type,
+            'source': (source.data, source.length, source.raw_size) if source is not None else None,
+            'chrome_blocks': sorted(self.chrome_blocks),
+            'validators': self.page_validators,
+            'fetched': self.page_fetched,
+            'stdin': zlib.compress(stdin.encode('utf-8', 'surrogatepass')) if stdin is not None else None,
+        }
+    
+    def _snapshot_key(self):
+        """Changes whenever the state a snapshot holds does"""
+        history = self.navigator.history
+        return (self.navigator.current_url, id(self.current_content), history.current_index, len(history.history))
+    
+    def save_session(self):
+        """Write a session snapshot (interactive sessions with a page loaded only)"""
+        if not self.snapshots or not self.navigator.current_url:
+            return
+        from .utils.snapshot import snapshot_path, write_snapshot
+        try:
+            write_snapshot(snapshot_path(), self.session_state())
+        except (OSError, ValueError):
+            return  # A lost snapshot must never get in the way of browsing
+        self._snapshot_saved = (time.monotonic(), self._snapshot_key())
+    
+    def snapshot_if_due(self):
+        """Save the session if it changed and SNAPSHOT_INTERVAL has passed since the last save"""
+        saved_at, key = self._snapshot_saved
+        if key != self._snapshot_key() and time.monotonic() - saved_at >= self.SNAPSHOT_INTERVAL:
+            self.save_session()
+    
+    def restore_session(self) -> bool:
+        """
+        Bring back the last session from its snapshot, without network access
+        
+        History, the current page and its link table come back as they were;
+        a web page older than SNAPSHOT_STALE seconds is then revalidated in
+        the background.
+        
+        Returns:
+            True if a session was restored
+        """
+        from .utils.snapshot import format_age, read_snapshot, snapshot_path
+        
+        state = read_snapshot(snapshot_path())
+        if not state or not state.get('url'):
+            return False
+        try:
+            source = PageSource.from_compressed(*state['source']) if state['source'] else None
+            head = next(source.iter_chunks(4096), b'').decode('utf-8', 'ignore') if source else ""
+            handler = handler_for(state['content_type'], head) if source else None
+            stdin = state['stdin']
+            stdin = zlib.decompress(stdin).decode('utf-8', 'surrogatepass') if stdin else None
+            history_urls, history_index = list(state['history']), state['history_index']
+            url, links, title = state['url'], state['links'], state['title']
+            content = [tuple(block) for block in state['content']]  # Stored as lists
+            chrome_blocks = set(state['chrome_blocks'])
+        except (KeyError, TypeError, ValueError, zlib.error):
+            return False
+        
+        history = self.navigator.history
+        history.history, history.current_index = history_urls, history_index
+        self.navigator.current_url = url
+        self.navigator.current_links = links
+        self.current_title = title
+        self.current_content = content
+        self.page_source = source
+        self.content_handler = handler
+        self.content_type = state['content_type']
+        self.chrome_blocks = chrome_blocks
+        self.stdin_document = stdin
+        self.page_validators = state.get('validators') or {}
+        self.page_fetched = state.get('fetched')
+        self.parse_seconds = None
+        self.render_seconds = {}
+        self.display_page(title, content, links, url)
+        self._snapshot_saved = (time.monotonic(), self._snapshot_key())
+        
+        age = time.time() - state['saved']
+        print(f"\n♻️  Resumed your session from {format_age(age)} ago "
+              f"({len(history_urls)} page(s) in history; 'ravanan --no-restore' starts fresh)")
+        fetched = self.page_fetched
+        stale = fetched is None or time.time() - fetched > self.SNAPSHOT_STALE
+        if stale and url.startswith(('http://', 'https://')):
+            self.revalidate_in_background(url)
+        return True
+    
+    def revalidate_in_background(self, url: str):
+        """
+        Check the current page against its server on a background thread
+        
+        Sends a conditional GET when the page had an ETag or Last-Modified,
+        otherwise compares the body. The outcome is reported at the next
+        prompt (see report_revalidation); the page shown is left alone.
+        """
+        import threading
+        
+        source = self.page_source
+        headers = {}
+        if 'ETag' in self.page_validators:
+            headers['If-None-Match'] = self.page_validators['ETag']
+        if 'Last-Modified' in self.page_validators:
+            headers['If-Modified-Since'] = self.page_validators['Last-Modified']
+        
+        def check():
+            success, content, _, status_code, _ = self.fetcher.fetch_with_headers(url, request_headers=headers)
+            if not success:
+                outcome = 'unreachable'
+            elif status_code == 304 or (source is not None and content == source.get_text()):
+                outcome = 'unchanged'
+            else:
+                outcome = 'changed'
+            self.revalidation = (url, outcome)
+        
+        threading.Thread(target=check, name='revalidate', daemon=True).start()
+    
+    def report_revalidation(self):
+        """Print the outcome of the background check of a restored page, once"""
+        if self.revalidation is None:
+            return
+        url, outcome = self.revalidation
+        self.revalidation = None
+        if url != self.navigator.current_url:
+            return
+        if outcome == 'changed':
+            print("\n🔄 This page has changed since your last session; 'r' reloads it")
+        elif outcome == 'unreachable':
+            print("\n⚠️  Couldn't revalidate this page (offline?); showing the saved copy")
+        else:
+            self.page_fetched = time.time()
+    
+    def set_view_depth(self, args: str = ""):
+        """
+        Set how deep JSON and XML views expand, and redisplay the current one
+        
+        Args:
+            args: Depth as a number, or 'all'
+        """
+        arg = args.strip().lower()
+        if not arg:
+            print(f"\n🔽 View depth: {self.view_depth} (default {DEFAULT_DEPTH}). Usage: depth N | depth all\n")
+            return
+        if arg == 'all':
+            self.view_depth = 1 << 30
+        elif arg.isdigit():
+            self.view_depth = int(arg)
+        else:
+            self.renderer.render_error("Usage: depth N | depth all")
+            return
+        
+        handler = self.content_handler
+        if handler is None or handler.name not in ('json', 'xml') or self.page_source is None:
+            print(f"\n🔽 View depth set to {arg}; applies to JSON and XML pages\n")
+            return
+        url = self.navigator.reload()
+        title, links, text_content = handler.view(self.current_html, url, self.view_depth)
+        self.navigator.current_links = links
+        self.current_title = title
+        self.current_content = text_content
+        self.renderer.render_page(title, text_content, links, url)
+    
+    def get_downloader(self):
+        """Downloader for this session, created on first use"""
+        if self.downloader is None:
+            from .browser.downloader import Downloader
+            self.downloader = Downloader()
+        return self.downloader
+    
+    def hand_off_download(self, url: str, chunks, headers):
+        """WebFetcher.on_binary: save a non-page response to disk in the background"""
+        download = self.get_downloader().start(url, chunks=chunks, headers=headers)
+        kind = headers.get('Content-Type', 'file').split(';', 1)[0]
+        print(f"\n📥 Not a web page ({kind}); downloading in the background as #{download.number}.")
+        print("   Type 'downloads' for progress.\n")
+    
+    def download_command(self, args: str = ""):
+        """
+        Start or cancel a download
+        
+        Args:
+            args: "N [path]" or "URL [path]" to start, "cancel N" to stop
+        """
+        parts = args.split(None, 1)
+        if not parts:
+            self.renderer.render_error("Usage: download N [path] | download URL [path] | download cancel N")
+            return
+        if parts[0].lower() == 'cancel':
+            number = parts[1].strip() if len(parts) > 1 else ""
+            downloads = self.downloader.downloads if self.downloader else []
+            if not number.isdigit() or not 1 <= int(number) <= len(downloads):
+                self.renderer.render_error("Usage: download cancel N (see 'downloads')")
+                return
+            downloads[int(number) - 1].cancel()
+            print(f"\n⏹️  Cancelling download #{number}; run the same download again to resume\n")
+            return
+        
+        target = parts[0]
+        if target.isdigit():
+            url = self.navigator.get_link_by_index(int(target))
+            if not url:
+                self.renderer.render_error(f"Invalid link number: {target}")
+                return
+        else:
+            url = self.fetcher.normalize_url(target)
+        path = parts[1].strip() if len(parts) > 1 else None
+        download = self.get_downloader().start(url, path)
+        print(f"\n📥 Download #{download.number} started: {url}")
+        print("   Type 'downloads' for progress.\n")
+    
+    def show_downloads(self):
+        """List downloads of this session with progress and throughput"""
+        downloads = self.downloader.downloads if self.downloader else []
+        print("\n" + "=" * 70)
+        print("📥 DOWNLOADS")
+        print("=" * 70)
+        if not downloads:
+            print("No downloads yet. Use: download N [path]")
+        for download in downloads:
+            print(download.status_line())
+            if download.path and download.state == 'done':
+                print(f"      → {download.path}")
+        print("=" * 70 + "\n")
+    
+    def report_downloads(self):
+        """Print a line for each download that ended since the last prompt"""
+        if self.downloader is None:
+            return
+        for download in self.downloader.finished():
+            if download.state == 'done':
+                print(f"\n✅ Download #{download.number} finished: {download.path} "
+                      f"({format_bytes(download.done_bytes)}, {format_bytes(download.throughput)}/s)")
+            elif download.state == 'cancelled':
+                print(f"\n⏹️  Download #{download.number} stopped at {format_bytes(download.done_bytes)}")
+            else:
+                print(f"\n❌ Download #{download.number} failed: {download.error}")
+    
+    def set_parse_limits(self, args: str = ""):
+        """
+        Show or change the HTML parser's resource limits
+        
+        Args:
+            args: "nodes|depth|tokens|time VALUE" (0 = unlimited), "reset", or empty to show
+        """
+        parts = args.lower().split()
+        fields = {'nodes': 'max_nodes', 'depth': 'max_depth', 'tokens': 'max_tokens', 'time': 'time_budget'}
+        defaults = ParseLimits()
+        if parts == ['reset']:
+            for attribute in fields.values():
+                setattr(DEFAULT_LIMITS, attribute, getattr(defaults, attribute))
+        elif parts:
+            if len(parts) != 2 or parts[0] not in fields:
+                self.renderer.render_error("Usage: limits [nodes|depth|tokens|time VALUE] | limits reset")
+                return
+            try:
+                value = float(parts[1]) if parts[0] == 'time' else int(parts[1])
+            except ValueError:
+                self.renderer.render_error(f"Invalid value: {parts[1]}")
+                return
+            setattr(DEFAULT_LIMITS, fields[parts[0]], max(value, 0))
+        print(f"\n🛡️  Parse limits: {DEFAULT_LIMITS.describe()}")
+        print(f"   (defaults: {defaults.describe()}; applies to pages loaded from now on)\n")
+    
     def handle_command(self, command: str):
         """
-        Handle user commands
+        Handle user commands, recording them with their timing under --trace-session
         
         Args:
             command: User input command
         """
+        if self.tracer is None or not command:
+            self._handle_command(command)
+            return
+        started = time.perf_counter()
+        try:
+            self._handle_command(command)
+        finally:
+            self.tracer.command(command, time.perf_counter() - started)
+    
+    def _handle_command(self, command: str):
+        """Run one command"""
         if not command:
             return
         
@@ -160,30 +674,69 @@ class Ravanan:
         elif cmd_lower == 'stats':
             self.show_stats()
         
+        # Profile fetch/parse/render
+        elif cmd_lower == 'profile' or cmd_lower.startswith('profile '):
+            self.profile_page(command[7:].strip())
+        
+        # Downloads
+        elif cmd_lower == 'downloads':
+            self.show_downloads()
+        elif cmd_lower == 'download' or cmd_lower.startswith('download '):
+            self.download_command(command[9:].strip())
+        
+        # Parser resource limits
+        elif cmd_lower == 'limits' or cmd_lower.startswith('limits '):
+            self.set_parse_limits(command[6:].strip())
+        
+        # Expand/collapse JSON and XML views
+        elif cmd_lower == 'depth' or cmd_lower.startswith('depth '):
+            self.set_view_depth(command[5:].strip())
+        
+        # Feeds (feeds, feeds add [url], feeds list, feeds rm N)
+        elif cmd_lower == 'feeds' or cmd_lower.startswith('feeds '):
+            self.feeds_command(command[5:].strip())
+        
+        # Check links on the current page (or site)
+        elif cmd_lower == 'check-links' or cmd_lower.startswith('check-links '):
+            self.check_links(command[11:].strip())
+        
+        # Deep search
+        elif cmd_lower == 'deep' or cmd_lower.startswith('deep '):
+            self.deep_search(command[4:].strip())
+        
+        # Watch pages for changes
+        elif cmd_lower == 'watch' or cmd_lower.startswith('watch '):
+            self.watch_pages(command[5:].strip())
+        
         # Save page
         elif cmd_lower == 'save':
             self.save_page()
         
-        # Show page source
-        elif cmd_lower in ['src', 'source']:
-            self.show_source()
-        
-        # Show full page source
-        elif cmd_lower in ['src all', 'source all']:
-            self.show_source(show_all=True)
+        # Show page source (src, src all, src more, src N-M, src /text)
+        elif cmd_lower in ['src', 'source'] or cmd_lower.startswith(('src ', 'source ')):
+            self.show_source(command.split(None, 1)[1] if ' ' in command else "")
         
         # Clear screen
         elif cmd_lower == 'clear':
             self.clear_screen()
+            self.renderer.forget_frame()
             # Redisplay current page
             if self.current_title:
-                self.renderer.render_page(
+                self.display_page(
                     self.current_title, 
                     self.current_content, 
                     self.navigator.current_links, 
                     self.navigator.reload()
                 )
         
+        # Show or hide repeated site navigation
+        elif cmd_lower == 'chrome':
+            self.toggle_chrome()
+        
+        # Main content only / full page
+        elif cmd_lower == 'reader':
+            self.toggle_reader()
+        
         # Version
         elif cmd_lower == 'version':
             print(f"\n🔱 Ravanan Browser v1.0.0")
@@ -211,6 +764,10 @@ class Ravanan:
         elif command.startswith('http://') or command.startswith('https://'):
             self.load_page(command)
         
+        # Open a local file or directory ('/...' is search, so absolute paths need 'go' or file://)
+        elif command.startswith(('file:', './', '../', '~')) or command in ('.', '..'):
+            self.load_page(command)
+        
         # Go to link by number
         elif command.isdigit():
             link_index = int(command)
@@ -249,7 +806,9 @@ class Ravanan:
     def reload(self):
         """Reload current page"""
         url = self.navigator.reload()
-        if url:
+        if url == FEEDS_URL:
+            self.show_feeds(add_to_history=False)
+        elif url:
             self.load_page(url, add_to_history=False)
         else:
             self.renderer.render_error("No page to reload")
@@ -285,7 +844,12 @@ class Ravanan:
         results = []
         query_search = query if case_sensitive else query.lower()
         
-        for item_type, text, level in self.current_content:
+        skip = () if self.show_chrome else self.chrome_blocks
+        found = reader_range(self.current_content) if self.reader_mode else None
+        start, end = found or (0, len(self.current_content))
+        for index, (item_type, text, level) in enumerate(self.current_content):
+            if not start <= index < end or (found is None and index in skip):
+                continue
             text_search = text if case_sensitive else text.lower()
             if query_search in text_search:
                 results.append(text)
@@ -321,6 +885,7 @@ class Ravanan:
 ║  ───────────────────                                                 ║
 ║  /[query]     → Search in current page (e.g., /python)              ║
 ║  //[query]    → Case-sensitive search                                ║
+║  deep [host] /q → Search every linked page (host . = this site)      ║
 ║  links        → List all links on current page                       ║
 ║  find [n]     → Jump to nth search result                            ║
 ║                                                                      ║
@@ -329,6 +894,8 @@ class Ravanan:
 ║  info         → Show current page information                        ║
 ║  history      → Show browsing history                                ║
 ║  stats        → Show browser statistics                              ║
+║  profile [url] → Profile fetch/parse/render stages                   ║
+║    --profile-out P  also writes P.pstats and P.collapsed             ║
 ║  about        → About Ravanan browser                                ║
 ║                                                                      ║
 ║  💾 UTILITY COMMANDS                                                 ║
@@ -336,8 +903,22 @@ class Ravanan:
 ║  save         → Save current page as text file                       ║
 ║  src          → Show page HTML source (first 50 lines)               ║
 ║  source       → Show page HTML source (alias)                        ║
-║  src all      → Show complete HTML source code                       ║
+║  src all      → Page through the complete HTML source                ║
+║  src more     → Show the next 50 lines of source                     ║
+║  src N-M      → Show source lines N to M (e.g., src 1200-1300)       ║
+║  src /text    → Find text in the page source                         ║
+║  check-links  → Check links on page (--recursive: site)              ║
+║  feeds        → Refresh feeds and show new entries                   ║
+║  feeds add [u] → Subscribe (default: feed of this page)              ║
+║  feeds list   → List subscriptions (feeds rm N)                      ║
+║  depth N      → Expand JSON/XML views to level N (all)               ║
+║  limits       → Parser limits (nodes/depth/tokens/time N)            ║
+║  download N [p] → Save link N to disk in the background              ║
+║  downloads    → Show download progress (download cancel N)           ║
+║  watch URL [s] → Poll pages, print added/removed blocks              ║
 ║  clear        → Clear screen                                         ║
+║  chrome       → Show/hide nav and footer repeated across the site    ║
+║  reader       → Toggle reader view: main content only                ║
 ║  version      → Show version information                             ║
 ║  ?            → Show this help                                       ║
 ║  help         → Show this help (alternative)                         ║
@@ -416,7 +997,7 @@ class Ravanan:
         if url:
             print(f"\n📍 Current URL: {url}\n")
         else:
-            print("\n⚠️  No page loaded yet\n")
+            self.renderer.render_warning("No page loaded yet")
     
     def show_history(self):
         """Display browsing history"""
@@ -459,7 +1040,7 @@ class Ravanan:
     def show_page_info(self):
         """Display current page information"""
         if not self.current_title:
-            print("\n⚠️  No page loaded\n")
+            self.renderer.render_warning("No page loaded")
             return
         
         url = self.navigator.reload()
@@ -472,8 +1053,44 @@ class Ravanan:
         print(f"URL: {url}")
         print(f"Links found: {link_count}")
         print(f"Content elements: {len(self.current_content)}")
+        if self.content_handler is not None:
+            print(f"Handler: {self.content_handler.name} ({self.content_type or 'no Content-Type'})")
+        partial = partial_reason(self.current_content)
+        if partial:
+            print(f"Partial: yes, {partial}")
+        if self.chrome_blocks:
+            summary = chrome_summary(self.current_content, self.chrome_blocks)
+            print(f"Site chrome: {summary['blocks']} blocks, {summary['links']} links "
+                  f"({'shown' if self.show_chrome else 'collapsed'}; learned from "
+                  f"{self.site_chrome.host_pages(url)} recent pages of this site)")
+        if reader_range(self.current_content) is not None:
+            print(f"Reader: {self.reader_summary()} (view {'on' if self.reader_mode else 'off'})")
+        print(f"Output: {self.renderer.output_summary()}")
+        print("-" * 60)
+        print("Memory:")
+        for label, size in self.get_page_memory():
+            print(f"  {label:<22} {format_bytes(size)}")
         print("=" * 60 + "\n")
     
+    def get_page_memory(self):
+        """
+        Estimate the memory held by the current page
+        
+        Returns:
+            List of (label, bytes) pairs
+        """
+        usage = [
+            ("Content", deep_getsizeof(self.current_content)),
+            ("Links", deep_getsizeof(self.navigator.current_links)),
+        ]
+        if self.page_source is not None:
+            usage.append((
+                f"Source ({self.page_source.raw_size // 1024}KB raw)",
+                self.page_source.compressed_size
+            ))
+        usage.append(("Total", sum(size for _, size in usage)))
+        return usage
+    
     def show_stats(self):
         """Display browser statistics"""
         history_count = len(self.navigator.history.get_history_list())
@@ -487,6 +1104,350 @@ class Ravanan:
         print(f"Can go back: {'Yes' if self.navigator.can_go_back() else 'No'}")
         print(f"Can go forward: {'Yes' if self.navigator.can_go_forward() else 'No'}")
         print(f"Current page loaded: {'Yes' if self.current_title else 'No'}")
+        shared = self.fetcher.shared_cache
+        stats = shared.stats() if shared else None
+        if stats:
+            from .browser.cached import format_stats
+            print("-" * 60)
+            print("Shared cache (ravanan-cached):")
+            for line in format_stats(stats):
+                print(f"  {line}")
+        host_lines = self.fetcher.health.format_lines(self.fetcher.timeout)
+        if host_lines:
+            print("-" * 60)
+            print("Hosts (latency, adaptive timeout, circuit breaker):")
+            for line in host_lines:
+                print(f"  {line}")
+        dns = DNS_CACHE.stats()
+        preconnects = self.fetcher.preconnects
+        if dns['hits'] or dns['misses'] or preconnects['opened'] or preconnects['failed']:
+            print("-" * 60)
+            print(f"DNS cache: {dns['entries']} lookups kept, {dns['hits']} hits, {dns['misses']} misses")
+            print(f"Preconnects: {preconnects['opened']} opened, {preconnects['used']} used, "
+                  f"{preconnects['failed']} failed")
+        print("=" * 60 + "\n")
+    
+    def profile_page(self, args: str = ""):
+        """
+        Profile fetching, parsing and rendering of a page
+        
+        Args:
+            args: "[url] [--profile-out PREFIX]" (defaults to the current page)
+        """
+        import io
+        from rich.console import Console
+        from .utils.profiler import StageProfiler
+        
+        parts = args.split()
+        out_prefix = None
+        if '--profile-out' in parts:
+            flag_index = parts.index('--profile-out')
+            if flag_index + 1 >= len(parts):
+                self.renderer.render_error("Usage: profile [url] --profile-out PREFIX")
+                return
+            out_prefix = parts[flag_index + 1]
+            del parts[flag_index:flag_index + 2]
+        
+        url = parts[0] if parts else self.navigator.reload()
+        if not url:
+            self.renderer.render_error("No page to profile. Usage: profile URL")
+            return
+        
+        profiler = StageProfiler()
+        self.renderer.render_loading(url)
+        success, content, final_url, status_code = profiler.run('WebFetcher.fetch', self.fetcher.fetch, url)
+        if not success:
+            self.renderer.render_error(content)
+            return
+        
+        # Separate parser/renderer so profiling leaves the current page untouched;
+        # rendering goes to an off-screen console of the same width
+        parser = HTMLParser()
+        links, text_content = profiler.run('HTMLParser.parse', parser.parse, content, final_url)
+        title = profiler.run('get_page_title', parser.get_page_title)
+        console = Console(file=io.StringIO(), width=self.renderer.width, force_terminal=True)
+        renderer = TextRenderer(console=console)
+        renderer.show_banner_on_first_page = False
+        profiler.run('TextRenderer.render_page', renderer.render_page, title, text_content, links, final_url)
+        
+        print("\n" + "=" * 70)
+        print("⏱️  PAGE PROFILE")
+        print("=" * 70)
+        print(f"URL: {final_url}")
+        print(f"Size: {len(content)} characters | Links: {len(links)} | Content elements: {len(text_content)}")
+        print("-" * 70)
+        print(profiler.format_report())
+        
+        if out_prefix:
+            try:
+                written = profiler.dump(out_prefix)
+                print("-" * 70)
+                for path in written:
+                    print(f"Wrote {path}")
+            except OSError as e:
+                self.renderer.render_error(f"Failed to write profile: {str(e)}")
+        
+        print("=" * 70 + "\n")
+    
+    def feeds_command(self, args: str = ""):
+        """
+        Manage and read feed subscriptions
+        
+        Args:
+            args: '' (refresh and show new entries), 'add [url]', 'list' or 'rm N'
+        """
+        from .browser.feeds import FeedReader, discover_feeds
+        
+        if self.feed_reader is None:
+            self.feed_reader = FeedReader()
+        reader = self.feed_reader
+        parts = args.split(None, 1)
+        action = parts[0].lower() if parts else ''
+        
+        if not action:
+            self.show_feeds()
+        
+        elif action == 'add':
+            url = parts[1].strip() if len(parts) > 1 else self.navigator.reload()
+            if not url or url == FEEDS_URL:
+                self.renderer.render_warning("Usage: feeds add URL (or open a page or feed first)")
+                return
+            # An HTML page may advertise its feed instead of being one
+            if len(parts) == 1 and self.page_source is not None:
+                source = self.current_html
+                if not looks_like_feed(source):
+                    advertised = discover_feeds(source, url)
+                    if not advertised:
+                        self.renderer.render_warning("This page doesn't advertise a feed. Use: feeds add FEED_URL")
+                        return
+                    url = advertised[0]
+            print(f"\n⏳ Subscribing to {url}...")
+            success, detail = reader.subscribe(url)
+            if success:
+                print(f"✅ Subscribed to {detail} ({len(reader.urls())} feed(s))\n")
+            else:
+                self.renderer.render_error(detail)
+        
+        elif action == 'list':
+            print("\n" + "=" * 60)
+            print("📰 FEED SUBSCRIPTIONS")
+            print("=" * 60)
+            if not reader.urls():
+                print("No subscriptions yet. Use: feeds add URL")
+            for number, url in enumerate(reader.urls(), 1):
+                print(f"[{number}] {reader.feeds[url]['title']}")
+                print(f"    {url}")
+            print("=" * 60 + "\n")
+        
+        elif action in ('rm', 'remove') and len(parts) > 1 and parts[1].strip().isdigit():
+            urls = reader.urls()
+            number = int(parts[1])
+            if 1 <= number <= len(urls):
+                title = reader.feeds[urls[number - 1]]['title']
+                reader.unsubscribe(urls[number - 1])
+                print(f"\n🗑️  Unsubscribed from {title}\n")
+            else:
+                self.renderer.render_error(f"No feed number {number}. Type 'feeds list' to see them.")
+        
+        else:
+            self.renderer.render_error("Usage: feeds | feeds add [url] | feeds list | feeds rm N")
+    
+    def show_feeds(self, refresh: bool = True, add_to_history: bool = True):
+        """
+        Show new entries from all subscribed feeds as a page
+        
+        Entry links are numbered like page links, so entries open in the
+        normal page view and 'back' returns here.
+        
+        Args:
+            refresh: Fetch feeds (False re-shows the last results)
+            add_to_history: Whether to add the view to history
+        """
+        from .browser.feeds import FeedReader, feed_page
+        
+        if refresh or self.feeds_view is None:
+            if self.feed_reader is None:
+                self.feed_reader = FeedReader()
+            if not self.feed_reader.urls():
+                print("\n📰 No subscriptions yet. Use: feeds add URL\n")
+                return False
+            print(f"\n⏳ Refreshing {len(self.feed_reader.urls())} feed(s)...")
+            sections = self.feed_reader.refresh()
+            if not sections:
+                sections = [("No new entries", "", [], "Everything has been read.")]
+            self.feeds_view = feed_page(sections)
+        
+        content, links = self.feeds_view
+        if add_to_history:
+            self.navigator.set_current_page(FEEDS_URL, links)
+        else:
+            self.navigator.current_url = FEEDS_URL
+            self.navigator.current_links = links
+        self.current_title = "📰 Feeds"
+        self.current_content = content
+        self.chrome_blocks = set()
+        self.page_source = None
+        self.content_handler = None
+        self.content_type = ""
+        self.page_validators = {}
+        self.page_fetched = time.time()
+        self.display_page(self.current_title, content, links, FEEDS_URL)
+        return True
+    
+    def check_links(self, args: str = ""):
+        """
+        Verify every link on the current page concurrently
+        
+        Args:
+            args: '--recursive' (or '-r') to follow links within the site
+        """
+        from .browser.linkcheck import LinkChecker
+        
+        if not self.current_title:
+            self.renderer.render_warning("No page loaded")
+            return
+        recursive = args.lower() in ('-r', '--recursive')
+        if args and not recursive:
+            self.renderer.render_warning("Usage: check-links [--recursive]")
+            return
+        
+        if self.link_checker is None:
+            self.link_checker = LinkChecker()
+        
+        def progress(report, queued):
+            print(f"  🔗 {len(report.results)} checked, {queued} queued, {report.pages_scanned} page(s) scanned")
+        
+        url = self.navigator.reload()
+        links = [link['url'] for link in self.navigator.current_links]
+        print(f"\n🔗 Checking {len(links)} link(s){' across the site' if recursive else ''}... (Ctrl+C to stop)")
+        try:
+            report = self.link_checker.run(url, links, recursive=recursive, progress=progress)
+        except KeyboardInterrupt:
+            print("\n⏹️  Link check interrupted\n")
+            return
+        
+        print("\n" + "=" * 70)
+        print("🔗 LINK CHECK")
+        print("=" * 70)
+        for line in report.format_lines():
+            print(line)
+        print("=" * 70 + "\n")
+    
+    def deep_search(self, args: str = ""):
+        """
+        Search every page linked from the current one, reporting matches as pages arrive
+        
+        Args:
+            args: '[HOST] /query'; HOST keeps to one site ('.' = the current page's)
+        """
+        from urllib.parse import urlsplit
+        from .browser.deep import DEFAULT_BUDGET, DeepSearch, deep_targets
+        
+        host, _, query = args.partition('/')
+        host, query = host.strip().lower(), query.strip()
+        if not query:
+            self.renderer.render_warning("Usage: deep [HOST] /query  (HOST '.' = this site)")
+            return
+        if not self.current_title:
+            self.renderer.render_warning("No page loaded")
+            return
+        
+        url = self.navigator.reload()
+        if host == '.':
+            host = (urlsplit(url).hostname or '').lower()
+        targets = deep_targets(self.navigator.current_links, url, host or None)
+        if not targets:
+            self.renderer.render_warning(f"No linked pages{' on ' + host if host else ''} to search")
+            return
+        if self.deep_searcher is None:
+            self.deep_searcher = DeepSearch()
+        
+        def found(match):
+            print(f"  [{match.link_index}] {match.title[:60] or match.url} ({match.count} match(es))")
+            if match.snippets:
+                print(f"      {match.snippets[0]}")
+        
+        print(f"\n🔎 Searching {len(targets)} linked page(s) for '{query}' "
+              f"(up to {DEFAULT_BUDGET:.0f}s, Ctrl+C to stop)...")
+        try:
+            result = self.deep_searcher.run(targets, query, DEFAULT_BUDGET, on_match=found)
+        except KeyboardInterrupt:
+            print("\n⏹️  Deep search interrupted\n")
+            return
+        
+        matches = result['matches']
+        print("\n" + "=" * 70)
+        print(f"🔎 DEEP SEARCH: '{query}'")
+        print("=" * 70)
+        if not matches:
+            print("No linked page mentions it.")
+        for rank, match in enumerate(matches[:10], 1):
+            print(f"{rank:>2}. [{match.link_index}] {match.title[:55] or '(untitled)'} "
+                  f"- {match.count} match(es), score {match.score}")
+            print(f"    {match.url}")
+            for snippet in match.snippets:
+                print(f"      {snippet}")
+        if len(matches) > 10:
+            print(f"... {len(matches) - 10} more page(s) with fewer matches")
+        print("-" * 70)
+        notes = [f"{result['cached']} from cache"] if result['cached'] else []
+        if result['failed']:
+            notes.append(f"{result['failed']} failed")
+        if result['unfinished']:
+            notes.append(f"{result['unfinished']} not reached in the time budget")
+        print(f"Searched {result['searched']} of {len(targets)} page(s) in {result['seconds']:.1f}s"
+              + (f" ({', '.join(notes)})" if notes else ""))
+        if matches:
+            print("Type a link number to open a page.")
+        print("=" * 70 + "\n")
+    
+    def watch_pages(self, args: str = ""):
+        """
+        Poll pages and print blocks that were added or removed
+        
+        Args:
+            args: 'URL [URL...] [interval]' (defaults: current page, 60 seconds)
+        """
+        from .browser.watcher import Watcher
+        
+        urls = args.split()
+        interval = 60.0
+        if urls:
+            try:
+                interval = max(1.0, float(urls[-1]))
+                urls.pop()
+            except ValueError:
+                pass
+        if not urls:
+            if not self.current_title:
+                self.renderer.render_warning("No page loaded. Usage: watch URL [URL...] [interval]")
+                return
+            urls = [self.navigator.reload()]
+        
+        def report(watch, status, changes):
+            stamp = time.strftime('%H:%M:%S')
+            if status == 'changed':
+                self.renderer.render_block_diff(watch.url, changes, stamp)
+            elif status == 'baseline':
+                print(f"{stamp} 📌 {watch.url}: watching {len(watch.blocks)} blocks")
+            elif status != 'unchanged':
+                print(f"{stamp} ❌ {watch.url}: {status}")
+        
+        watcher = Watcher(urls, interval, report)
+        print(f"\n👀 Watching {len(urls)} page(s) every {interval:g}s. Press Ctrl+C to stop.\n")
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.fetcher.close()
+        
+        print("\n" + "=" * 60)
+        print("👀 WATCH SUMMARY")
+        print("=" * 60)
+        for watch in watcher.watches:
+            print(f"{watch.url}")
+            print(f"  checks: {watch.checks}, not modified (304): {watch.not_modified}, changes: {watch.changes}")
         print("=" * 60 + "\n")
     
     def save_page(self):
@@ -496,95 +1457,167 @@ class Ravanan:
             return
         
         # Generate filename from title
-        import re
         filename = re.sub(r'[^\w\s-]', '', self.current_title)
         filename = re.sub(r'[-\s]+', '_', filename)
         filename = f"{filename[:50]}.txt"
         
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {self.current_title}\n")
-                f.write(f"URL: {self.navigator.reload()}\n")
-                f.write(f"Saved: {__import__('datetime').datetime.now()}\n")
-                f.write("=" * 60 + "\n\n")
-                
-                for item_type, text, level in self.current_content:
-                    if item_type == 'heading':
-                        f.write(f"\n{'#' * level} {text}\n")
-                    elif item_type in ['text', 'paragraph', 'list_item']:
-                        f.write(f"{text}\n")
-                    elif item_type == 'newline':
-                        f.write("\n")
-                
-                f.write("\n" + "=" * 60 + "\n")
-                f.write(f"\nLinks ({len(self.navigator.current_links)}):\n")
-                for link in self.navigator.current_links:
-                    f.write(f"[{link['index']}] {link['text']}\n")
-                    f.write(f"    {link['url']}\n")
+                f.write(format_page_text(
+                    self.current_title,
+                    self.navigator.reload(),
+                    self.current_content,
+                    self.navigator.current_links
+                ))
             
             print(f"\n✅ Page saved to: {filename}\n")
         except Exception as e:
             self.renderer.render_error(f"Failed to save page: {str(e)}")
     
-    def show_source(self, show_all=False):
+    def show_source(self, args: str = ""):
         """Display the HTML source code of the current page
         
         Args:
-            show_all: Whether to show all lines or just a preview
+            args: What to show:
+                ''           first window of lines
+                'all'        every line, one window at a time
+                'more'       the window after the last one shown
+                'N' / 'N-M'  from line N / lines N to M
+                '/text'      lines containing text (case-insensitive)
         """
-        if not self.current_html:
+        if self.page_source is None:
             self.renderer.render_error("No page loaded to show source")
             return
         
+        viewer = self._get_source_viewer()
+        total_lines = viewer.line_count
+        arg = args.strip()
+        
+        if arg.startswith('/'):
+            pattern = arg[1:].strip()
+            if not pattern:
+                self.renderer.render_error("Usage: src /text")
+                return
+            matches, total = viewer.grep(pattern)
+            self.renderer.render_source_matches(pattern, matches, total)
+            print()
+            return
+        
+        range_match = re.fullmatch(r'(\d+)\s*(?:-\s*(\d+))?', arg)
+        if arg.lower() in ('', 'all'):
+            first = 1
+        elif arg.lower() in ('more', 'next', 'n'):
+            first = self.source_position
+        elif range_match:
+            first = int(range_match.group(1))
+        else:
+            self.renderer.render_error("Usage: src [all | more | N | N-M | /text]")
+            return
+        
+        if range_match and range_match.group(2):
+            last = int(range_match.group(2))
+        elif arg.lower() == 'all':
+            last = total_lines
+        else:
+            last = first + self.SOURCE_WINDOW - 1
+        last = min(last, total_lines)
+        
+        if first > total_lines or first > last:
+            self.renderer.render_error(f"No such lines. Source has {total_lines} lines.")
+            return
+        
         print("\n" + "=" * 70)
         print("📝 PAGE SOURCE CODE")
         print("=" * 70)
         print(f"URL: {self.navigator.reload()}")
-        print(f"Size: {len(self.current_html)} characters")
+        print(f"Size: {len(self.page_source)} characters | Total lines: {total_lines}")
+        print(f"Showing lines {first}-{last}")
         print("=" * 70)
         
-        # Show lines of source with line numbers
-        lines = self.current_html.split('\n')
-        total_lines = len(lines)
-        
-        if not show_all and total_lines > 50:
-            print(f"\nTotal lines: {total_lines}")
-            print("Showing first 50 lines... (Type 'src all' to see everything)")
-            print("-" * 70)
-            lines_to_show = lines[:50]
-        else:
-            print(f"\nTotal lines: {total_lines}")
-            if show_all:
-                print("Showing all lines...")
-            print("-" * 70)
-            lines_to_show = lines
-        
-        for i, line in enumerate(lines_to_show, 1):
-            # Truncate very long lines
-            if len(line) > 120:
-                line = line[:117] + "..."
-            print(f"{i:4d} | {line}")
-        
-        if not show_all and total_lines > 50:
-            print("-" * 70)
-            print(f"... {total_lines - 50} more lines ...")
+        # Only the visible window is read, truncated and highlighted
+        max_chars = self.renderer.width * self.SOURCE_WRAP_ROWS
+        interactive = self.interactive and sys.stdin.isatty()
+        start = first
+        while start <= last:
+            end = min(last, start + self.SOURCE_WINDOW - 1)
+            self.renderer.render_source(viewer.get_lines(start, end, max_chars))
+            start = end + 1
+            if start <= last and interactive:
+                answer = input(f"-- lines {end}/{last} -- [Enter] more, [q] stop: ")
+                if answer.strip().lower() == 'q':
+                    break
         
+        self.source_position = start if start <= total_lines else 1
+        print("-" * 70)
+        if start <= total_lines:
+            print(f"... {total_lines - start + 1} more lines ... (src more, src N-M, src /text)")
         print("=" * 70 + "\n")
     
+    def _get_source_viewer(self):
+        """Get the source viewer for the current page, indexing it on first use"""
+        from .browser.source import SourceViewer
+        
+        if self.source_viewer is None or self.source_viewer.source is not self.page_source:
+            if self.source_viewer is not None:
+                self.source_viewer.close()
+            self.source_viewer = SourceViewer(self.page_source)
+            self.source_position = 1
+        return self.source_viewer
+    
     def clear_screen(self):
         """Clear the terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self.interactive:
+            os.system('cls' if os.name == 'nt' else 'clear')
     
     def quit(self):
         """Quit the browser"""
-        print("\n👋 Thanks for using Ravanan! May you browse with the wisdom of 10 heads! 🔱\n")
-        print("   Created by Krishna D\n")
+        self.save_session()
+        if self.interactive:
+            print("\n👋 Thanks for using Ravanan! May you browse with the wisdom of 10 heads! 🔱\n")
+            print("   Created by Krishna D\n")
+        if self.downloader is not None:
+            self.downloader.shutdown()  # Unfinished downloads resume next time
+        if self.deep_searcher is not None:
+            self.deep_searcher.close()
+        if self.tracer is not None:
+            self.tracer.close()
         self.running = False
         sys.exit(0)
 
 
+# Subcommands run instead of the interactive browser: name -> (module, function)
+SUBCOMMANDS = {
+    'crawl': ('.browser.crawler', 'main'),
+    'check-links': ('.browser.linkcheck', 'main'),
+    'cached': ('.browser.cached', 'main'),
+    'serve': ('.browser.serve', 'main'),
+    'replay-bench': ('.browser.replay', 'main'),
+}
+
+
+def run_subcommand(name: str, argv):
+    """
+    Run a subcommand such as `ravanan crawl`
+    
+    Args:
+        name: Subcommand name (key of SUBCOMMANDS)
+        argv: Remaining command-line arguments
+        
+    Returns:
+        Process exit status
+    """
+    import importlib
+    
+    module_name, function_name = SUBCOMMANDS[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, function_name)(argv)
+
+
 def main():
     """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        sys.exit(run_subcommand(sys.argv[1], sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
         description="Ravanan - The 10-Headed Web Browser (Created by Krishna D)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -593,6 +1626,14 @@ Examples:
   python main.py
   python main.py https://example.com
   python main.py wikipedia.org
+  ravanan ./build/report.html
+  some-tool --html | ravanan -
+  ravanan crawl https://docs.python.org/3/library/ --scope prefix --depth 3
+  ravanan check-links https://docs.python.org/3/ --recursive
+  ravanan serve --port 8080
+  ravanan -c "go https://example.com; 1; save"
+  ravanan --script nightly-a.txt --script nightly-b.txt --jobs 2
+  ravanan --trace-session session.jsonl && ravanan replay-bench session.jsonl
 
 The 10 Heads of Ravanan represent:
   1. Smart Parsing  2. Fast Fetching   3. Beautiful Rendering
@@ -607,8 +1648,8 @@ Created by: Krishna D
     parser.add_argument(
         'url',
         nargs='?',
-        default='https://example.com',
-        help='URL to open on startup (default: https://example.com)'
+        help="URL, file or directory to open on startup, or '-' to read a document from stdin "
+             "(default: https://example.com)"
     )
     
     parser.add_argument(
@@ -617,6 +1658,69 @@ Created by: Krishna D
         help='Set home page URL (default: https://example.com)'
     )
     
+    parser.add_argument(
+        '--lowbw',
+        action='store_true',
+        help='Low-bandwidth output for slow links: no screen clearing or boxes, minimal '
+             'escape sequences, only changed lines re-sent'
+    )
+    
+    parser.add_argument(
+        '--reader',
+        action='store_true',
+        help="Start in reader view: only each page's main content ('reader' toggles)"
+    )
+    
+    parser.add_argument(
+        '-c',
+        dest='commands',
+        metavar='COMMANDS',
+        help="Run ';'-separated commands without a terminal and exit (status 1 if one fails)"
+    )
+    
+    parser.add_argument(
+        '--script',
+        dest='scripts',
+        action='append',
+        metavar='FILE',
+        help="Run the commands in FILE (one per line, '-' for stdin) without a terminal; "
+             "repeat for several independent scripts"
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Scripts to run at once, each in its own process (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--render',
+        nargs='?',
+        const='text',
+        choices=('text', 'json'),
+        help='In -c / --script runs, write each page shown as plain text (default) or JSON'
+    )
+    
+    parser.add_argument(
+        '--keep-going',
+        action='store_true',
+        help='In -c / --script runs, carry on after a failed command'
+    )
+    
+    parser.add_argument(
+        '--no-restore',
+        action='store_true',
+        help="Don't resume the last session when started without a URL"
+    )
+    
+    parser.add_argument(
+        '--trace-session',
+        metavar='FILE',
+        help="Record every command and the responses behind it to FILE (JSON Lines) for "
+             "'ravanan replay-bench'; the shared cache daemon is bypassed while recording"
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -624,9 +1728,38 @@ Created by: Krishna D
     )
     
     args = parser.parse_args()
+    batch = args.commands is not None or args.scripts
+    if args.commands is not None and args.scripts:
+        parser.error("-c and --script can't be combined")
+    if args.trace_session and args.scripts and len(args.scripts) > 1:
+        parser.error("--trace-session records a single session; give one script")
+    
+    tracer = None
+    if args.trace_session:
+        from .browser.replay import SessionRecorder
+        # Pages served by the daemon never reach the session hooks
+        os.environ['RAVANAN_CACHED'] = 'off'
+        try:
+            tracer = SessionRecorder(args.trace_session, home=args.home, lowbw=args.lowbw, reader=args.reader)
+        except OSError as e:
+            parser.error(f"cannot write {args.trace_session}: {e.strerror or e}")
+        tracer.install()
+    
+    if batch:
+        from .browser import batch as batch_mode
+        options = {'url': args.url, 'page_format': args.render, 'keep_going': args.keep_going,
+                   'home_url': args.home, 'reader': args.reader}
+        if tracer is not None:
+            options['tracer'] = tracer
+        if args.commands is not None:
+            sys.exit(batch_mode.run_commands(batch_mode.split_commands(args.commands), **options))
+        sys.exit(batch_mode.run_scripts(args.scripts, jobs=args.jobs, **options))
     
     # Display banner
-    print("""
+    if args.lowbw:
+        print("Ravanan v1.0.0 (low-bandwidth) - '?' for help, 'q' to quit")
+    else:
+        print("""
     ╔═══════════════════════════════════════════════════════════╗
     ║                                                           ║
     ║        ██████  █████ ██   ██ █████ ███   ██ █████ ███   ║
@@ -644,8 +1777,10 @@ Created by: Krishna D
     """)
     
     # Create and start browser
-    browser = Ravanan(home_url=args.home)
-    browser.start(initial_url=args.url)
+    browser = Ravanan(home_url=args.home, lowbw=args.lowbw, reader=args.reader, tracer=tracer)
+    # Without a URL, pick up where the last session left off (a traced session starts clean)
+    restore = args.url is None and not args.no_restore and tracer is None
+    browser.start(initial_url=args.url or 'https://example.com', restore=restore)
 
 
 if __name__ == "__main__":
@@ -6,8 +6,6 @@ Inspired by the mythological Ravana - the 10-headed scholar king
 Created by: Krishna D
 """
 import shutil
-from rich.console import Console
-from rich.text import Text
 
 
 class RavananBanner:
@@ -126,6 +124,8 @@ The 10-Headed Scholar King • Terminal Web Browser
         Returns:
             Rich Text object with colored banner
         """
+        from rich.text import Text
+        
         if width is None:
             try:
                 width = shutil.get_terminal_size().columns
@@ -180,6 +180,7 @@ The 10-Headed Scholar King • Terminal Web Browser
             colored: Whether to use colors (default True)
         """
         if colored:
+            from rich.console import Console
             console = Console()
             console.print(cls.get_colored_banner(width))
         else:
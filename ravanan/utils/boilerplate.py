@@ -0,0 +1,162 @@
+"""
+Boilerplate Module
+Learns each site's repeated header, nav and footer blocks from recent pages
+
+Every block is reduced to a hash of its type and normalized text, and each
+run of SHINGLE consecutive blocks to a shingle hash. Runs whose shingle
+appears on most of the host's other recent pages are site chrome. Working
+on runs rather than single blocks keeps a lone "Home" link or a repeated
+"Note:" inside an article from being mistaken for navigation.
+"""
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Set, Tuple
+from urllib.parse import urlsplit
+
+from .urls import canonical_url
+
+SHINGLE = 3
+
+
+def _block_key(item_type: str, text: str) -> int:
+    # Link numbers (the level) differ between pages, so only type and text count
+    return hash((item_type, ' '.join(text.lower().split())))
+
+
+def _shingles(blocks: List[Tuple]) -> Tuple[List[int], List[int]]:
+    """
+    Shingle hashes of a page
+    
+    Returns:
+        Tuple of (positions of the blocks with text, shingle hash of each
+        run of SHINGLE of them)
+    """
+    positions = [i for i, (_, text, _) in enumerate(blocks) if text]
+    keys = [_block_key(blocks[i][0], blocks[i][1]) for i in positions]
+    return positions, [hash(tuple(keys[j:j + SHINGLE])) for j in range(len(keys) - SHINGLE + 1)]
+
+
+class SiteChrome:
+    """
+    Per-host shingle sets of recently visited pages
+    
+    A run of blocks is chrome when its shingle is on at least `threshold`
+    of the host's other recent pages, and at least `min_pages` of them.
+    """
+    
+    def __init__(self, max_pages: int = 10, min_pages: int = 2, threshold: float = 0.5,
+                 max_hosts: int = 32):
+        """
+        Args:
+            max_pages: Recent pages remembered per host
+            min_pages: Other pages of the host needed before anything is chrome
+            threshold: Fraction of those pages a run must appear on
+            max_hosts: Hosts remembered (least recently visited are forgotten)
+        """
+        self.max_pages = max_pages
+        self.min_pages = min_pages
+        self.threshold = threshold
+        self.max_hosts = max_hosts
+        self._hosts: 'OrderedDict[str, OrderedDict[str, FrozenSet[int]]]' = OrderedDict()
+    
+    def _pages(self, host: str) -> 'OrderedDict[str, FrozenSet[int]]':
+        pages = self._hosts.pop(host, None)
+        if pages is None:
+            pages = OrderedDict()
+        self._hosts[host] = pages
+        while len(self._hosts) > self.max_hosts:
+            self._hosts.popitem(last=False)
+        return pages
+    
+    def observe(self, url: str, blocks: List[Tuple]) -> Set[int]:
+        """
+        Remember a page and find its chrome
+        
+        Args:
+            url: Page URL
+            blocks: Parsed content list
+        
+        Returns:
+            Indexes into blocks of the chrome blocks (newlines and markers between them included)
+        """
+        host = urlsplit(url).netloc.lower()
+        key = canonical_url(url)
+        positions, shingles = _shingles(blocks)
+        pages = self._pages(host)
+        others = [seen for page_key, seen in pages.items() if page_key != key]
+        
+        pages.pop(key, None)
+        pages[key] = frozenset(shingles)
+        while len(pages) > self.max_pages:
+            pages.popitem(last=False)
+        
+        if len(others) < self.min_pages:
+            return set()
+        needed = max(self.min_pages, int(self.threshold * len(others) + 0.999))
+        marked = [False] * len(positions)
+        for j, shingle in enumerate(shingles):
+            if sum(1 for seen in others if shingle in seen) >= needed:
+                marked[j:j + SHINGLE] = [True] * SHINGLE
+        if all(marked):
+            return set()  # The same document under another URL, not chrome
+        
+        chrome = set()
+        for n, position in enumerate(positions):
+            if marked[n]:
+                chrome.add(position)
+                # Newlines between two chrome blocks belong to the chrome
+                if n + 1 < len(positions) and marked[n + 1]:
+                    chrome.update(range(position + 1, positions[n + 1]))
+        return chrome
+    
+    def host_pages(self, url: str) -> int:
+        """Pages remembered for a URL's host"""
+        pages = self._hosts.get(urlsplit(url).netloc.lower())
+        return len(pages) if pages else 0
+
+
+def collapse_chrome(blocks: List[Tuple], chrome: Set[int]) -> Tuple[List[Tuple], Set[int]]:
+    """
+    Replace each run of chrome blocks with one ('chrome', summary, count) block
+    
+    Args:
+        blocks: Parsed content list
+        chrome: Indexes from SiteChrome.observe()
+    
+    Returns:
+        Tuple of (collapsed content list, numbers of the links hidden in chrome)
+    """
+    collapsed = []
+    hidden_links = set()
+    run = []  # Link numbers and block count of the current run
+    count = 0
+    for i, block in enumerate(blocks):
+        if i in chrome:
+            if block[1]:
+                count += 1
+            if block[0] == 'link':
+                run.append(block[2])
+            continue
+        if count:
+            collapsed.append(_chrome_block(count, run))
+            hidden_links.update(run)
+            run, count = [], 0
+        collapsed.append(block)
+    if count:
+        collapsed.append(_chrome_block(count, run))
+        hidden_links.update(run)
+    return collapsed, hidden_links
+
+
+def _chrome_block(count: int, links: List[int]) -> Tuple:
+    numbers = ""
+    if links:
+        numbers = f", links {links[0]}-{links[-1]}" if len(links) > 1 else f", link {links[0]}"
+    return ('chrome', f"{count} repeated site blocks hidden{numbers} (type 'chrome' to show)", count)
+
+
+def chrome_summary(blocks: List[Tuple], chrome: Set[int]) -> Dict[str, int]:
+    """Chrome block and hidden link counts, for `info`"""
+    return {
+        'blocks': sum(1 for i in chrome if blocks[i][1]),
+        'links': sum(1 for i in chrome if blocks[i][0] == 'link'),
+    }
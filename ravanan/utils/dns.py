@@ -0,0 +1,109 @@
+"""
+DNS Module
+Process-wide cache of host name lookups
+
+Every connection the browser opens (page fetches, hedged requests, deep
+search, link checks, downloads, preconnects) resolves its host through
+socket.getaddrinfo. Once installed, DNSCache answers repeat lookups from
+memory. The system resolver doesn't report record TTLs, so answers are
+kept for a fixed time, and failed lookups for a much shorter one.
+"""
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+
+def _is_address(host) -> bool:
+    """Whether host is a literal IP address (nothing to resolve)"""
+    if isinstance(host, bytes):
+        host = host.decode('ascii', 'replace')
+    host = host.strip('[]').split('%', 1)[0]
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+class DNSCache:
+    """
+    TTL cache in front of socket.getaddrinfo
+    
+    Entries are keyed by every getaddrinfo argument, so lookups for
+    different ports or address families don't mix. The least recently
+    used entry is dropped once max_entries is reached.
+    """
+    
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 10.0, max_entries: int = 512):
+        """
+        Args:
+            ttl: Seconds an answer is reused
+            negative_ttl: Seconds a failed lookup is reused (so a dead name isn't retried per link)
+            max_entries: Most lookups kept
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires, addresses or gaierror args)
+        self._lock = threading.Lock()
+        self._resolve = None  # The real getaddrinfo, once installed
+    
+    def install(self):
+        """Route socket.getaddrinfo through the cache (once per process)"""
+        with self._lock:
+            if self._resolve is None:
+                self._resolve = socket.getaddrinfo
+                socket.getaddrinfo = self.getaddrinfo
+    
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """socket.getaddrinfo, answered from the cache while an entry is fresh"""
+        resolve = self._resolve or socket.getaddrinfo
+        if not host or _is_address(host):
+            return resolve(host, port, family, type, proto, flags)
+        
+        key = (host.lower() if isinstance(host, str) else host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                failed, answer = entry[1]
+                if failed:
+                    raise socket.gaierror(*answer)
+                return list(answer)
+            self.misses += 1
+        
+        try:
+            answer = resolve(host, port, family, type, proto, flags)
+        except socket.gaierror as e:
+            self._store(key, now + self.negative_ttl, (True, e.args))
+            raise
+        self._store(key, now + self.ttl, (False, tuple(answer)))
+        return answer
+    
+    def _store(self, key, expires: float, value):
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Forget every lookup"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Counters: 'entries', 'hits' and 'misses'"""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+DNS_CACHE = DNSCache()
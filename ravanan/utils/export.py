@@ -0,0 +1,71 @@
+"""
+Export Module
+Serializes parsed pages to plain text and JSON
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+
+def format_page_text(title: str, url: str, content: List[Tuple], links: List[Dict],
+                     saved: datetime = None) -> str:
+    """
+    Format a parsed page as plain text (the `save` format)
+    
+    Args:
+        title: Page title
+        url: Page URL
+        content: Parsed content list
+        links: List of links found on page
+        saved: Timestamp to record (defaults to now)
+        
+    Returns:
+        Page text
+    """
+    lines = [
+        f"Title: {title}\n",
+        f"URL: {url}\n",
+        f"Saved: {saved or datetime.now()}\n",
+        "=" * 60 + "\n\n",
+    ]
+    
+    for item_type, text, level in content:
+        if item_type == 'heading':
+            lines.append(f"\n{'#' * level} {text}\n")
+        elif item_type in ['text', 'paragraph', 'list_item', 'plain']:
+            lines.append(f"{text}\n")
+        elif item_type == 'newline':
+            lines.append("\n")
+        elif item_type == 'partial':
+            lines.append(f"\n[Partial page: {text}]\n")
+    
+    lines.append("\n" + "=" * 60 + "\n")
+    lines.append(f"\nLinks ({len(links)}):\n")
+    for link in links:
+        lines.append(f"[{link['index']}] {link['text']}\n")
+        lines.append(f"    {link['url']}\n")
+    
+    return ''.join(lines)
+
+
+def page_to_dict(title: str, url: str, content: List[Tuple], links: List[Dict],
+                 saved: datetime = None) -> Dict:
+    """
+    Convert a parsed page to a JSON-serializable dict
+    
+    Args:
+        title: Page title
+        url: Page URL
+        content: Parsed content list
+        links: List of links found on page
+        saved: Timestamp to record (defaults to now)
+        
+    Returns:
+        Dict with title, url, saved, content ([type, text, level] lists) and links
+    """
+    return {
+        'title': title,
+        'url': url,
+        'saved': (saved or datetime.now()).isoformat(timespec='seconds'),
+        'content': [list(item) for item in content],
+        'links': links,
+    }
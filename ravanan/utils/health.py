@@ -0,0 +1,238 @@
+"""
+Host Health Module
+Per-host latency percentiles, adaptive timeouts and circuit breakers
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+    
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} is failing; circuit open for {retry_in:.0f} more seconds")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class HostState:
+    """Latency samples, breaker state and counters for one host"""
+    
+    __slots__ = ('samples', 'state', 'failures', 'opened_at', 'trial_in_flight',
+                 'requests', 'retries', 'hedges', 'hedges_won', 'rejected')
+    
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)
+        self.state = 'closed'
+        self.failures = 0  # Consecutive
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.rejected = 0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class HostHealth:
+    """
+    Tracks how each host has been responding, shared by every fetcher in the process
+    
+    Latency is time to response headers. Once a host has `min_samples`
+    samples its timeout shrinks to a multiple of its p99 and slow requests
+    become eligible for hedging past its p95. `failure_threshold`
+    consecutive failures open the host's circuit: requests then fail fast
+    for `cooldown` seconds, after which a single trial request decides
+    whether it closes again.
+    """
+    
+    def __init__(self, window: int = 50, min_samples: int = 10, timeout_multiplier: float = 4.0,
+                 min_timeout: float = 2.0, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Args:
+            window: Latency samples kept per host
+            min_samples: Samples needed before timeouts adapt and hedging starts
+            timeout_multiplier: Adaptive timeout as a multiple of p99 latency
+            min_timeout: Lower bound for adaptive timeouts (seconds)
+            failure_threshold: Consecutive failures that open a circuit
+            cooldown: Seconds a circuit stays open before a trial request
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+    
+    def _host(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self.window)
+        return state
+    
+    def _sorted_samples(self, host: str) -> Optional[List[float]]:
+        """Sorted latencies for a host, or None while there are too few"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or len(state.samples) < self.min_samples:
+                return None
+            return sorted(state.samples)
+    
+    def timeout_for(self, host: str, ceiling: float) -> float:
+        """
+        Timeout to use for the next request to a host
+        
+        Args:
+            host: Host (netloc) of the request
+            ceiling: The caller's configured timeout, never exceeded
+        
+        Returns:
+            Seconds
+        """
+        samples = self._sorted_samples(host)
+        if samples is None:
+            return ceiling
+        adaptive = percentile(samples, 0.99) * self.timeout_multiplier
+        return min(ceiling, max(self.min_timeout, adaptive))
+    
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Seconds after which a second request should be sent (the host's p95), or None"""
+        samples = self._sorted_samples(host)
+        return None if samples is None else percentile(samples, 0.95)
+    
+    def allow(self, host: str):
+        """
+        Admit a request to a host or fail fast
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial already running
+        """
+        with self._lock:
+            state = self._host(host)
+            state.requests += 1
+            if state.state == 'closed':
+                return
+            retry_in = state.opened_at + self.cooldown - time.monotonic()
+            if state.state == 'open' and retry_in <= 0:
+                state.state = 'half-open'
+            if state.state == 'half-open' and not state.trial_in_flight:
+                state.trial_in_flight = True
+                return
+            state.rejected += 1
+        raise CircuitOpenError(host, max(retry_in, 0.0))
+    
+    def is_open(self, host: str) -> bool:
+        """Whether requests to a host are currently being refused"""
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.state == 'open'
+    
+    def record_success(self, host: str, latency: Optional[float] = None):
+        """Record a response that shows the host is up (latency None adds no sample)"""
+        with self._lock:
+            state = self._host(host)
+            if latency is not None:
+                state.samples.append(latency)
+            state.failures = 0
+            state.state = 'closed'
+            state.trial_in_flight = False
+    
+    def release(self, host: str):
+        """End a request that says nothing about the host's health"""
+        with self._lock:
+            state = self._host(host)
+            state.trial_in_flight = False
+    
+    def record_failure(self, host: str):
+        """Record a timeout, connection error or gateway error"""
+        with self._lock:
+            state = self._host(host)
+            state.failures += 1
+            state.trial_in_flight = False
+            if state.state == 'half-open' or state.failures >= self.failure_threshold:
+                state.state = 'open'
+                state.opened_at = time.monotonic()
+    
+    def record_retry(self, host: str):
+        """Count a retried request"""
+        with self._lock:
+            self._host(host).retries += 1
+    
+    def record_hedge(self, host: str, won: bool):
+        """Count a hedged request and whether the second copy answered first"""
+        with self._lock:
+            state = self._host(host)
+            state.hedges += 1
+            state.hedges_won += won
+    
+    def snapshot(self) -> List[Dict]:
+        """
+        Current state of every host seen, busiest first
+        
+        Returns:
+            List of dicts with host, state, samples, p50, p95, failures,
+            requests, retries, hedges, hedges_won, rejected and retry_in
+        """
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for host, state in self._hosts.items():
+                samples = sorted(state.samples)
+                rows.append({
+                    'host': host,
+                    'state': state.state,
+                    'samples': len(samples),
+                    'p50': percentile(samples, 0.50) if samples else None,
+                    'p95': percentile(samples, 0.95) if samples else None,
+                    'failures': state.failures,
+                    'requests': state.requests,
+                    'retries': state.retries,
+                    'hedges': state.hedges,
+                    'hedges_won': state.hedges_won,
+                    'rejected': state.rejected,
+                    'retry_in': max(0.0, state.opened_at + self.cooldown - now) if state.state == 'open' else 0.0,
+                })
+        rows.sort(key=lambda row: row['requests'], reverse=True)
+        return rows
+    
+    def format_lines(self, ceiling: float, limit: int = 10) -> List[str]:
+        """
+        Human-readable per-host summary for `stats`
+        
+        Args:
+            ceiling: Configured timeout, shown until a host's timeout adapts
+            limit: Maximum hosts listed
+        """
+        lines = []
+        rows = self.snapshot()
+        for row in rows[:limit]:
+            state = row['state'].upper() if row['state'] != 'closed' else 'ok'
+            if row['state'] == 'open':
+                state += f" (retry in {row['retry_in']:.0f}s)"
+            if row['p50'] is None:
+                latency = "no samples"
+            else:
+                latency = f"p50 {row['p50'] * 1000:.0f} ms, p95 {row['p95'] * 1000:.0f} ms"
+            timeout = self.timeout_for(row['host'], ceiling)
+            lines.append(
+                f"{row['host']}: {state} | {latency} | timeout {timeout:.1f}s | "
+                f"{row['requests']} req, {row['retries']} retries, "
+                f"{row['hedges']} hedged ({row['hedges_won']} won), {row['rejected']} refused"
+            )
+        if len(rows) > limit:
+            lines.append(f"… and {len(rows) - limit} more hosts")
+        return lines
+
+
+# Shared by all fetchers, so every part of the browser learns from every request
+HOST_HEALTH = HostHealth()
@@ -0,0 +1,71 @@
+"""
+Memory Module
+Helpers for measuring and reporting the memory held by page state
+"""
+import sys
+
+
+def deep_getsizeof(obj, _seen: set = None) -> int:
+    """
+    Approximate the memory held by a container and everything in it
+    
+    Handles the shapes used for page state (lists, tuples and dicts of
+    strings and numbers); shared objects are counted once.
+    
+    Args:
+        obj: Object to measure
+        
+    Returns:
+        Size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_getsizeof(key, _seen) + deep_getsizeof(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_getsizeof(item, _seen)
+    return size
+
+
+def format_bytes(size: int) -> str:
+    """
+    Format a byte count for display
+    
+    Args:
+        size: Size in bytes (may be negative)
+        
+    Returns:
+        Human-readable size such as '512B' or '1.5MB'
+    """
+    sign = '-' if size < 0 else ''
+    size = abs(size)
+    if size < 1024:
+        return f"{sign}{size:.0f}B"
+    for unit in ('KB', 'MB'):
+        size /= 1024
+        if size < 1024:
+            return f"{sign}{size:.1f}{unit}"
+    return f"{sign}{size / 1024:.1f}GB"
+
+
+def peak_rss():
+    """
+    Peak resident set size of this process so far
+    
+    Returns:
+        Size in bytes, or None where the resource module is unavailable (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
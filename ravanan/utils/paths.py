@@ -0,0 +1,23 @@
+"""
+Paths Module
+Location of Ravanan's per-user state files
+"""
+import os
+
+
+def state_path(*parts: str) -> str:
+    """
+    Path of a file in Ravanan's state directory
+    
+    The directory is $RAVANAN_HOME, or ~/.ravanan, and is created on first use.
+    
+    Args:
+        parts: Path components below the state directory
+    
+    Returns:
+        Absolute path
+    """
+    base = os.environ.get('RAVANAN_HOME') or os.path.join(os.path.expanduser('~'), '.ravanan')
+    path = os.path.join(base, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
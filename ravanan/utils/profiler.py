@@ -0,0 +1,198 @@
+"""
+Profiler Module
+Times the fetch/parse/render stages with cProfile, tracemalloc and a stack sampler
+
+Created by: Krishna D
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+from .memory import format_bytes
+
+
+class StackSampler:
+    """Samples the call stack of one thread to build flame-graph data"""
+    
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._thread_id = None
+        self._base_frame = None
+        self._prefix = ""
+        self._stop = threading.Event()
+        self._worker = None
+    
+    def start(self, prefix: str):
+        """
+        Start sampling the calling thread
+        
+        Frames at or above the caller are left out of the stacks, so every
+        stack starts at the stage name followed by the profiled call.
+        
+        Args:
+            prefix: Root frame name for collected stacks (the stage name)
+        """
+        self._thread_id = threading.get_ident()
+        self._base_frame = sys._getframe(1)
+        self._prefix = prefix
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def stop(self):
+        """Stop sampling"""
+        self._stop.set()
+        if self._worker:
+            self._worker.join()
+            self._worker = None
+        self._base_frame = None
+    
+    def _run(self):
+        """Sampling loop"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and frame is not self._base_frame:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            names.append(self._prefix)
+            stack = ';'.join(reversed(names))
+            self.counts[stack] = self.counts.get(stack, 0) + 1
+    
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format (`frame;frame;frame count`)"""
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+class StageProfiler:
+    """Profiles named stages of page loading"""
+    
+    def __init__(self, sample_interval: float = 0.001):
+        self.stages: List[Dict] = []
+        self.sampler = StackSampler(sample_interval)
+    
+    def run(self, name: str, func: Callable, *args, **kwargs):
+        """
+        Run one stage under cProfile, tracemalloc and the stack sampler
+        
+        Args:
+            name: Stage name shown in the report
+            func: Callable to profile
+            *args, **kwargs: Passed to func
+        
+        Returns:
+            Whatever func returns
+        """
+        import cProfile
+        
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        
+        profile = cProfile.Profile()
+        self.sampler.start(name)
+        start = time.perf_counter()
+        try:
+            result = profile.runcall(func, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.sampler.stop()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+        
+        self.stages.append({
+            'name': name,
+            'seconds': elapsed,
+            'peak_bytes': max(0, peak - before),
+            'retained_bytes': current - before,
+            'profile': profile,
+        })
+        return result
+    
+    def hotspots(self, stage: Dict, limit: int = 5) -> List[Tuple[str, int, float, float]]:
+        """
+        Top functions of a stage by own time
+        
+        Args:
+            stage: Stage record from self.stages
+            limit: Number of functions to return
+        
+        Returns:
+            List of (function, calls, own_seconds, cumulative_seconds)
+        """
+        import pstats
+        
+        stats = pstats.Stats(stage['profile'])
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, callers) in stats.stats.items():
+            location = f"{os.path.basename(filename)}:{line}" if line else filename
+            rows.append((f"{func} ({location})", nc, tt, ct))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+    
+    def format_report(self, limit: int = 5) -> str:
+        """
+        Build a plain-text report of all stages
+        
+        Args:
+            limit: Hotspots to list per stage
+        
+        Returns:
+            Report text
+        """
+        total = sum(stage['seconds'] for stage in self.stages) or 1e-9
+        lines = [f"{'Stage':<28}{'Time':>11}{'Share':>8}{'Peak mem':>12}{'Retained':>12}"]
+        for stage in self.stages:
+            lines.append(
+                f"{stage['name']:<28}"
+                f"{stage['seconds'] * 1000:>9.1f}ms"
+                f"{stage['seconds'] / total * 100:>7.0f}%"
+                f"{format_bytes(stage['peak_bytes']):>12}"
+                f"{format_bytes(stage['retained_bytes']):>12}"
+            )
+        lines.append(f"{'Total':<28}{total * 1000:>9.1f}ms")
+        
+        for stage in self.stages:
+            lines.append("")
+            lines.append(f"Top hotspots in {stage['name']} (own time):")
+            for func, calls, own, cumulative in self.hotspots(stage, limit):
+                lines.append(f"  {own * 1000:>8.1f}ms {cumulative * 1000:>8.1f}ms cum {calls:>7} calls  {func}")
+        return '\n'.join(lines)
+    
+    def dump(self, prefix: str) -> List[str]:
+        """
+        Write combined pstats and collapsed stacks
+        
+        Args:
+            prefix: Output path prefix; writes PREFIX.pstats and PREFIX.collapsed
+        
+        Returns:
+            List of files written
+        """
+        import pstats
+        
+        written = []
+        if self.stages:
+            stats = pstats.Stats(self.stages[0]['profile'])
+            for stage in self.stages[1:]:
+                stats.add(stage['profile'])
+            pstats_path = f"{prefix}.pstats"
+            stats.dump_stats(pstats_path)
+            written.append(pstats_path)
+        
+        collapsed_path = f"{prefix}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            f.write(self.sampler.collapsed())
+        written.append(collapsed_path)
+        return written
+
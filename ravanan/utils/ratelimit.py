@@ -0,0 +1,64 @@
+"""
+Rate Limit Module
+Per-host concurrency caps and request spacing shared by worker threads
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class HostLimiter:
+    """
+    Limits how hard worker threads hit any single host
+    
+    At most `per_host` requests to one host are in flight at once, and
+    request starts to one host are at least `min_interval` seconds apart.
+    Different hosts never wait on each other.
+    """
+    
+    def __init__(self, per_host: int = 4, min_interval: float = 0.0):
+        """
+        Args:
+            per_host: Concurrent requests allowed per host
+            min_interval: Minimum seconds between request starts per host
+        """
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    def _slot(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.Semaphore(self.per_host)
+            return slot
+    
+    def _reserve_start(self, host: str) -> float:
+        """Claim the next start time for a host and return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_interval
+            return start - now
+    
+    @contextmanager
+    def limit(self, host: str):
+        """
+        Hold a request slot for a host
+        
+        Args:
+            host: Host name the request goes to
+        """
+        slot = self._slot(host)
+        slot.acquire()
+        try:
+            if self.min_interval > 0:
+                delay = self._reserve_start(host)
+                if delay > 0:
+                    time.sleep(delay)
+            yield
+        finally:
+            slot.release()
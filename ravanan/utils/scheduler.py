@@ -0,0 +1,124 @@
+"""
+Scheduler Module
+Runs periodic jobs on a shared worker pool with jitter and per-host limits
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+class PollScheduler:
+    """
+    Periodic job scheduler
+    
+    Each job runs every `interval` seconds, spread by +/- `jitter` so jobs
+    added together drift apart instead of firing in bursts. A job is never
+    run twice at the same time, and at most `per_host` jobs for one host run
+    concurrently; a due job whose host is busy is retried shortly after.
+    """
+    
+    def __init__(self, max_workers: int = 8, per_host: int = 2, jitter: float = 0.1,
+                 busy_retry: float = 0.5):
+        """
+        Args:
+            max_workers: Jobs that may run concurrently overall
+            per_host: Jobs that may run concurrently for one host
+            jitter: Fractional spread applied to every interval (0.1 = +/-10%)
+            busy_retry: Seconds to wait before retrying a job whose host is busy
+        """
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.jitter = jitter
+        self.busy_retry = busy_retry
+        self._queue = []
+        self._jobs: Dict[str, Dict] = {}
+        self._active_hosts: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._pool: Optional[ThreadPoolExecutor] = None
+    
+    def add(self, key: str, func: Callable[[], None], interval: float, host: str = '',
+            delay: float = None):
+        """
+        Register a periodic job
+        
+        Args:
+            key: Unique job name (re-adding a key replaces the job)
+            func: Called with no arguments each time the job is due
+            interval: Seconds between runs
+            host: Host the job talks to, for per-host limiting
+            delay: Seconds until the first run (default: a random fraction of
+                   the interval, so a batch of new jobs is staggered)
+        """
+        if delay is None:
+            delay = random.uniform(0, min(interval, 1.0))
+        with self._condition:
+            self._jobs[key] = {'func': func, 'interval': interval, 'host': host, 'running': False}
+            self._push(time.monotonic() + delay, key)
+            self._condition.notify()
+    
+    def remove(self, key: str):
+        """Unregister a job (a run in progress finishes normally)"""
+        with self._condition:
+            self._jobs.pop(key, None)
+    
+    def _push(self, due: float, key: str):
+        heapq.heappush(self._queue, (due, next(self._counter), key))
+    
+    def _next_interval(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+    
+    def run(self):
+        """Dispatch jobs until stop() is called (blocks the calling thread)"""
+        self._stopped.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while not self._stopped.is_set():
+                with self._condition:
+                    if not self._queue:
+                        self._condition.wait(0.5)
+                        continue
+                    due, _, key = self._queue[0]
+                    wait = due - time.monotonic()
+                    if wait > 0:
+                        self._condition.wait(min(wait, 0.5))
+                        continue
+                    heapq.heappop(self._queue)
+                    job = self._jobs.get(key)
+                    if job is None or job['running']:
+                        continue
+                    host = job['host']
+                    if host and self._active_hosts.get(host, 0) >= self.per_host:
+                        self._push(time.monotonic() + self.busy_retry, key)
+                        continue
+                    job['running'] = True
+                    if host:
+                        self._active_hosts[host] = self._active_hosts.get(host, 0) + 1
+                self._pool.submit(self._run_job, key, job)
+        finally:
+            self._pool.shutdown(wait=False)
+    
+    def _run_job(self, key: str, job: Dict):
+        """Run one job on a worker and schedule its next run"""
+        try:
+            job['func']()
+        finally:
+            with self._condition:
+                job['running'] = False
+                host = job['host']
+                if host:
+                    self._active_hosts[host] -= 1
+                if self._jobs.get(key) is job:
+                    self._push(time.monotonic() + self._next_interval(job['interval']), key)
+                self._condition.notify()
+    
+    def stop(self):
+        """Stop dispatching; run() returns shortly after"""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
@@ -0,0 +1,100 @@
+"""
+Snapshot Module
+Compact session snapshots, so a restart resumes without refetching
+
+A snapshot is a 4-byte magic, a format version byte, and a zlib-compressed
+JSON document of plain values (str, numbers, lists, dicts and bytes).
+Unlike marshal or pickle, JSON reads back the same on any Python and
+can't run code when a snapshot is damaged or tampered with. bytes values
+are stored base64-encoded; tuples come back as lists, so callers rebuild
+the ones they need.
+"""
+import base64
+import json
+import os
+import zlib
+from typing import Dict, Optional
+
+from .paths import state_path
+
+MAGIC = b'RVNS'
+SNAPSHOT_VERSION = 2  # 1 was marshal
+
+
+def _encode(value):
+    """json.dumps default: bytes as {'$b64': text}"""
+    if isinstance(value, bytes):
+        return {'$b64': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"{type(value).__name__} can't go in a snapshot")
+
+
+def _decode(obj: Dict):
+    """json.loads object_hook undoing _encode"""
+    if len(obj) == 1 and '$b64' in obj:
+        return base64.b64decode(obj['$b64'])
+    return obj
+
+
+def dump_snapshot(state: Dict) -> bytes:
+    """Encode session state"""
+    text = json.dumps(state, default=_encode, ensure_ascii=False, separators=(',', ':'))
+    return MAGIC + bytes((SNAPSHOT_VERSION,)) + zlib.compress(text.encode('utf-8', 'surrogatepass'), 6)
+
+
+def load_snapshot(data: bytes) -> Optional[Dict]:
+    """
+    Decode session state
+    
+    Returns:
+        State dict, or None if data isn't a snapshot of this version or is damaged
+    """
+    if data[:4] != MAGIC or data[4:5] != bytes((SNAPSHOT_VERSION,)):
+        return None
+    try:
+        state = json.loads(zlib.decompress(data[5:]).decode('utf-8', 'surrogatepass'), object_hook=_decode)
+    except (ValueError, TypeError, zlib.error):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def write_snapshot(path: str, state: Dict) -> int:
+    """
+    Write a snapshot atomically, so a crash mid-write leaves the previous one
+    
+    Returns:
+        Bytes written
+    """
+    data = dump_snapshot(state)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+
+def read_snapshot(path: str) -> Optional[Dict]:
+    """
+    Read a snapshot
+    
+    Returns:
+        State dict, or None if there is no usable snapshot
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return load_snapshot(data)
+
+
+def snapshot_path() -> str:
+    """Where the interactive browser keeps its session snapshot"""
+    return state_path('session.snapshot')
+
+
+def format_age(seconds: float) -> str:
+    """Snapshot age for display, e.g. '45s', '12m', '3h' or '2d'"""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit}"
+    return f"{max(0, seconds):.0f}s"
@@ -0,0 +1,51 @@
+"""
+URL Utilities Module
+Canonical URL forms used for de-duplication and scope checks
+"""
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent spellings compare equal
+    
+    Lowercases the scheme and host, drops default ports, fragments and
+    empty queries, and gives host-only URLs a '/' path.
+    
+    Args:
+        url: Absolute URL
+    
+    Returns:
+        Canonical URL string
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    
+    netloc = f"[{host}]" if ':' in host else host
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    
+    path = parts.path or '/'
+    return urlunsplit((scheme, netloc, path, parts.query, ''))
+
+
+def url_host(url: str) -> str:
+    """
+    Get the lowercase host of a URL
+    
+    Args:
+        url: Absolute URL
+    
+    Returns:
+        Host name, or '' if the URL has none
+    """
+    return (urlsplit(url).hostname or '').lower()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Batch Exit Status Check
+Verifies that `ravanan -c` and `ravanan --script` report failures
+
+Scripts and CI jobs rely on the exit status alone, so a command that
+can't run (no page loaded, wrong usage) must fail the run just like a
+fetch error. Each case runs Ravanan in a fresh interpreter, with a
+throwaway home directory and no network access needed, and compares its
+exit status with the expected one.
+
+Usage:
+    python scripts/check_batch.py
+
+Created by: Krishna D
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (arguments, expected exit status)
+CASES = (
+    (['-c', 'history'], 0),
+    (['-c', 'info'], 1),
+    (['-c', 'deep /anything'], 1),
+    (['-c', 'check-links'], 1),
+    (['-c', 'url; history'], 1),
+    (['-c', 'info; history', '--keep-going'], 1),
+    (['--script', 'no-such-script.txt'], 2),
+)
+
+
+def run(args, home: str) -> int:
+    """Run ravanan with args in a fresh interpreter and return its exit status"""
+    env = dict(os.environ, RAVANAN_HOME=home, RAVANAN_CACHED='off',
+               PYTHONPATH=os.pathsep.join(filter(None, (ROOT, os.environ.get('PYTHONPATH')))))
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys; sys.argv[0] = "ravanan"; from ravanan import main; main()'] + args,
+        cwd=home,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    return result.returncode
+
+
+def main():
+    """Run every case"""
+    failed = False
+    with tempfile.TemporaryDirectory() as home:
+        for args, expected in CASES:
+            status = run(args, home)
+            command = 'ravanan ' + ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in args)
+            if status == expected:
+                print(f"✅ {command} → {status}")
+            else:
+                print(f"❌ {command} → {status} (expected {expected})")
+                failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ Batch exit statuses OK")
+
+
+if __name__ == "__main__":
+    main()
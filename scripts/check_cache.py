@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shared Cache Check
+Verifies what ravanan-cached stores, for how long, and what it refuses
+
+Runs a throwaway origin server and a cache daemon (with --ttl 0, so only
+the responses' own freshness headers keep anything cached) on local
+sockets, fetches each case twice through a CacheClient, and counts how
+often the origin was asked.
+
+Usage:
+    python scripts/check_cache.py
+
+Created by: Krishna D
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ravanan.browser.cached import CacheClient, CacheDaemon, serve  # noqa: E402
+
+FILE_SIZE = 32 * 1024 * 1024
+
+# path -> (response headers, origin requests expected for two fetches)
+CASES = {
+    '/plain': ([], 2),
+    '/max-age': ([('Cache-Control', 'max-age=60')], 1),
+    '/s-maxage': ([('Cache-Control', 'max-age=0, s-maxage=60')], 1),
+    '/expires': ([('Expires', 'Thu, 01 Jan 2099 00:00:00 GMT')], 1),
+    '/expired': ([('Expires', 'Thu, 01 Jan 1998 00:00:00 GMT')], 2),
+    '/private': ([('Cache-Control', 'private, max-age=60')], 2),
+    '/no-store': ([('Cache-Control', 'no-store, max-age=60')], 2),
+    '/no-cache': ([('Cache-Control', 'no-cache, max-age=60')], 2),
+}
+
+
+class _Origin(BaseHTTPRequestHandler):
+    """Answers CASES paths with their headers, and /file with a file of FILE_SIZE bytes"""
+
+    protocol_version = 'HTTP/1.1'
+    hits = {}
+    file_bytes_sent = 0
+
+    def do_GET(self):
+        _Origin.hits[self.path] = _Origin.hits.get(self.path, 0) + 1
+        self.send_response(200)
+        if self.path == '/file':
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(FILE_SIZE))
+            self.end_headers()
+            chunk = b'\0' * 65536
+            try:
+                for _ in range(FILE_SIZE // len(chunk)):
+                    self.wfile.write(chunk)
+                    _Origin.file_bytes_sent += len(chunk)
+            except OSError:
+                pass  # The reader hung up
+            return
+        body = f"<html><title>{self.path}</title></html>".encode()
+        self.send_header('Content-Type', 'text/html')
+        for name, value in CASES.get(self.path, ([], 0))[0]:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    """Run every case"""
+    origin = ThreadingHTTPServer(('127.0.0.1', 0), _Origin)
+    threading.Thread(target=origin.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{origin.server_address[1]}"
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        address = os.path.join(directory, 'cached.sock')
+        ready = threading.Event()
+        threading.Thread(target=serve, args=(CacheDaemon(ttl=0), address, ready.set), daemon=True).start()
+        ready.wait(5)
+        client = CacheClient(address)
+
+        for path, (_, expected) in CASES.items():
+            client.fetch(base + path)
+            client.fetch(base + path)
+            hits = _Origin.hits.get(path, 0)
+            ok = hits == expected
+            failed = failed or not ok
+            print(f"{'✅' if ok else '❌'} {path}: origin asked {hits}x (expected {expected})")
+
+        reply, body = client.request({'op': 'fetch', 'url': base + '/file'})
+        time.sleep(0.2)
+        ok = reply.get('binary') and not body and client.fetch(base + '/file') is None
+        ok = ok and _Origin.file_bytes_sent < FILE_SIZE
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} /file: left to the client, "
+              f"{_Origin.file_bytes_sent // 1024} KB of {FILE_SIZE // 1024} KB sent to the daemon")
+
+        reply, body = client.request({'op': 'fetch', 'url': 'file:///etc/hostname'})
+        ok = 'error' in reply and not body
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} file:///etc/hostname: {reply.get('error', 'served!')}")
+
+    origin.shutdown()
+    if failed:
+        sys.exit(1)
+    print("✅ Shared cache OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Startup Budget Check
+Verifies that importing Ravanan stays cheap
+
+Ravanan is launched from scripts many times a day, so `ravanan --version`
+and the first prompt must not pay for requests, bs4 or rich. This script
+imports the package in a fresh interpreter with `-X importtime`, fails if
+any heavy dependency was loaded eagerly, and fails if the cumulative
+import time of the package exceeds the budget.
+
+Usage:
+    python scripts/check_startup.py
+    python scripts/check_startup.py --budget-ms 100 --runs 5
+
+Created by: Krishna D
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+# Modules that must only be imported on first use
+HEAVY_MODULES = ('requests', 'bs4', 'rich', 'urllib3', 'lxml')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module: str):
+    """
+    Import a module in a fresh interpreter and collect import timings
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        Tuple of (cumulative_us for module, set of imported module names)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    cumulative = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        # Top-level package entries carry the cumulative time of the package
+        if name == module.split('.')[0]:
+            cumulative = int(match.group(2))
+
+    return cumulative, imported
+
+
+def main():
+    """Run the startup budget check"""
+    parser = argparse.ArgumentParser(description="Check Ravanan import-time budget")
+    parser.add_argument('--module', default='ravanan.main', help='Module to import (default: ravanan.main)')
+    parser.add_argument('--budget-ms', type=float, default=100.0, help='Import time budget in ms (default: 100)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs to take the best of (default: 3)')
+    args = parser.parse_args()
+
+    best_us = None
+    imported = set()
+    for _ in range(max(1, args.runs)):
+        cumulative, imported = measure(args.module)
+        if best_us is None or cumulative < best_us:
+            best_us = cumulative
+
+    eager = sorted(
+        name for name in imported
+        if name.split('.')[0] in HEAVY_MODULES
+    )
+    best_ms = best_us / 1000.0
+
+    print(f"Import of {args.module}: {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if eager:
+        roots = sorted({name.split('.')[0] for name in eager})
+        print(f"❌ Heavy modules imported at startup: {', '.join(roots)}")
+        failed = True
+    if best_ms > args.budget_ms:
+        print(f"❌ Startup budget exceeded by {best_ms - args.budget_ms:.1f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ Startup budget OK")
+
+
+if __name__ == "__main__":
+    main()
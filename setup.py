@@ -47,7 +47,7 @@ setup(
     
     keywords="browser, terminal, cli, text-based, lynx, web, http, https, ravanan, ravana, 10-headed, tui, console, accessibility",
     
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     
     python_requires=">=3.8",
     
@@ -61,6 +61,7 @@ setup(
     entry_points={
         "console_scripts": [
             "ravanan=ravanan:main",
+            "ravanan-cached=ravanan.browser.cached:main",
         ],
     },
     